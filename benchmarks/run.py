@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for drawing and for the game loop, all on a `NullDisplay` so that
+they can be run anywhere. The hardware displays are benchmarked too, using the
+fake hardware from ``pixelgames.canvas.fakes``.
+
+Run with::
+
+    python3 benchmarks/run.py
+
+which compares against the stored baseline, if there is one, and exits
+non-zero if anything got slower by more than the threshold. Use ``--save`` to
+store the results as the new baseline. Baselines are only meaningful on the
+machine which they were made on.
+"""
+
+from   argparse import ArgumentParser
+from   typing   import Callable, Dict
+
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+# Find the code, wherever we're run from
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_HERE)
+sys.path.insert(0, os.path.join(_ROOT, 'games'))
+sys.path.insert(0, _ROOT)
+
+from   pixelgames.canvas import Canvas, NullDisplay, fakes
+from   PIL               import Image
+
+# ----------------------------------------------------------------------
+
+# The default baseline file
+BASELINE = os.path.join(_HERE, 'baseline.json')
+
+# The display size which the benchmarks draw on
+_SIZE = 64
+
+# ----------------------------------------------------------------------
+
+def _canvas(scale     : int  = 1,
+            antialias : bool = True) -> Canvas:
+    """
+    Make a canvas on a null display, where each canvas pixel is the given
+    number of display pixels across.
+    """
+    canvas = Canvas(NullDisplay(_SIZE, _SIZE),
+                    width =_SIZE // scale,
+                    height=_SIZE // scale)
+    canvas.set_antialias(antialias)
+    return canvas
+
+
+def _set_bench(path  : str,
+               scale : int):
+    """
+    Make a benchmark of 1000 calls to `Canvas.set` which take the given code
+    path, on a canvas with the given scale.
+    """
+    canvas = _canvas(scale, antialias=(path != 'snapped'))
+    size   = canvas.width
+    rng    = random.Random(1)
+    if path == 'direct':
+        # Whole pixels, only direct when there's no scaling
+        points = [(rng.randrange(size), rng.randrange(size), 1.0)
+                  for i in range(1000)]
+    elif path == 'subpixel':
+        points = [(rng.randrange(size), rng.randrange(size), 0.5 / scale)
+                  for i in range(1000)]
+    else:
+        points = [(rng.random() * size, rng.random() * size, 1.5)
+                  for i in range(1000)]
+
+    def bench():
+        draw = canvas.set
+        for (x, y, s) in points:
+            draw(x, y, 1.0, 0.5, 0.25, s)
+    return bench
+
+
+def _set_image_bench(size: int):
+    """
+    Make a benchmark of drawing an image of the given size with
+    `Canvas.set_image`.
+    """
+    canvas = _canvas()
+    rng    = random.Random(2)
+    image  = Image.new('RGB', (size, size))
+    image.putdata([(rng.randrange(256), rng.randrange(256), rng.randrange(256))
+                   for i in range(size * size)])
+
+    def bench():
+        canvas.set_image(image)
+    return bench
+
+
+def _set_points_bench():
+    """
+    Make a benchmark of drawing 1000 whole pixels in one batch with
+    `Canvas.set_points`, for comparing with ``set.direct.x1``.
+    """
+    canvas = _canvas()
+    rng    = random.Random(1)
+    xs     = [rng.randrange(_SIZE) for i in range(1000)]
+    ys     = [rng.randrange(_SIZE) for i in range(1000)]
+
+    def bench():
+        canvas.set_points(xs, ys, (1.0, 0.5, 0.25))
+    return bench
+
+
+def _entities_bench():
+    """
+    Make a benchmark of moving 500 entities and finding which of them touch.
+    """
+    from pixelgames.game.entities import Entities
+
+    entities = Entities()
+    rng      = random.Random(6)
+    for i in range(500):
+        entities.add(rng.random() * _SIZE, rng.random() * _SIZE,
+                     rng.random() * 20 - 10, rng.random() * 20 - 10)
+
+    def bench():
+        entities.integrate(0.01, bounds=(_SIZE, _SIZE))
+        entities.spatial_hash(2.0).pairs(2.0)
+    return bench
+
+
+def _collisions_bench():
+    """
+    Make a benchmark of finding which of 48 round sprites touch each other.
+    """
+    from pixelgames.game.collision import CollisionMask, collisions
+
+    rng       = random.Random(7)
+    mask      = CollisionMask([[(x - 7.5)**2 + (y - 7.5)**2 <= 56
+                                for y in range(16)]
+                               for x in range(16)])
+    masks     = [mask] * 48
+    positions = [(rng.random() * _SIZE, rng.random() * _SIZE)
+                 for i in range(len(masks))]
+
+    def bench():
+        collisions(masks, positions)
+    return bench
+
+
+def _pacman_bench():
+    """
+    Make a benchmark of a headless Pacman tick, with a frame drawn.
+    """
+    from pacman import Pacman
+
+    def new_game():
+        game = Pacman(NullDisplay(_SIZE, _SIZE), headless=True, seed=3)
+        game.step(0)
+        return game
+
+    # Set up before we're timed, so that only the ticks are. We keep it going,
+    # starting over whenever it's done, which is rare enough not to count.
+    game = [new_game()]
+    def bench():
+        if game[0].step(1):
+            game[0].quit()
+            game[0] = new_game()
+    return bench
+
+
+def _canvas_test_bench():
+    """
+    Make a benchmark of a frame of what ``examples/canvas_test.py`` does, which
+    is bouncing a few big pixels around a wrapping canvas.
+    """
+    canvas = Canvas(NullDisplay(_SIZE, _SIZE), xwrap=True, ywrap=True)
+    rng    = random.Random(4)
+    (w, h) = (canvas.width - 1, canvas.height - 1)
+    points = [[rng.randint(0, w), rng.randint(0, h),
+               0.3 + rng.random() * 0.2, 0.4 + rng.random() * 0.1,
+               rng.random(), rng.random(), rng.random()]
+              for i in range(3)]
+
+    def bench():
+        canvas.clear()
+        for point in points:
+            (x, y, vx, vy, r, g, b) = point
+            if x < 0 or x > w:
+                vx = -vx
+            if y < 0 or y > h:
+                vy = -vy
+            point[0] = x + vx
+            point[1] = y + vy
+            point[2] = vx
+            point[3] = vy
+            canvas.set(point[0], point[1], r, g, b, 5.0)
+        canvas.show()
+    return bench
+
+
+def _backend_bench(name: str):
+    """
+    Make a benchmark of pushing a frame through the given hardware display,
+    using the fake hardware with its simulated costs turned off, so that only
+    our side of things is timed.
+    """
+    from pixelgames.registry import create_display
+
+    fakes.install()
+    fakes.set_cost_scale(0)
+    canvas = Canvas(create_display(name), width=16, height=16)
+    rng    = random.Random(5)
+    for x in range(canvas.width):
+        for y in range(canvas.height):
+            canvas.set(x, y, rng.random(), rng.random(), rng.random())
+
+    def bench():
+        canvas.show()
+    return bench
+
+
+def benchmarks() -> Dict[str,Callable]:
+    """
+    Get all the benchmarks, by name. Each one is a function which does one
+    unit of work, for timing.
+    """
+    result = dict()
+    for scale in (1, 2, 4):
+        for path in Canvas.PATHS:
+            if path == 'direct' and scale != 1:
+                continue
+            result['set.%s.x%d' % (path, scale)] = \
+                lambda path=path, scale=scale: _set_bench(path, scale)
+    for size in (8, 16, 64, 128):
+        result['set_image.%d' % (size,)] = \
+            lambda size=size: _set_image_bench(size)
+    for name in ('rgbledmatrix', 'unicornhathd', 'st7789'):
+        result['backend.%s.frame' % (name,)] = \
+            lambda name=name: _backend_bench(name)
+    result['set_points.1000']   = _set_points_bench
+    result['entities.step']     = _entities_bench
+    result['collisions.48']     = _collisions_bench
+    result['pacman.tick']       = _pacman_bench
+    result['canvas_test.frame'] = _canvas_test_bench
+    return result
+
+# ----------------------------------------------------------------------
+
+def measure(bench    : Callable,
+            duration : float = 0.2,
+            repeat   : int   = 5) -> float:
+    """
+    Time the given benchmark.
+
+    :param bench:    The function to time.
+    :param duration: Roughly how long each timing run should be, in seconds.
+    :param repeat:   How many timing runs to do.
+
+    :return: The best time per call, in seconds.
+    """
+    # Warm up, and see how many calls we need for each run
+    start = time.perf_counter()
+    bench()
+    count = max(1, int(duration / max(1e-9, time.perf_counter() - start)))
+
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        for j in range(count):
+            bench()
+        elapsed = (time.perf_counter() - start) / count
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def compare(results   : Dict[str,float],
+            baseline  : Dict[str,float],
+            threshold : float) -> list:
+    """
+    Compare results against a baseline.
+
+    :return: The ``(name, ratio)`` of everything which got slower by more than
+             the threshold, where the ratio is the new time over the old.
+    """
+    regressions = []
+    for (name, elapsed) in sorted(results.items()):
+        before = baseline.get(name)
+        if before:
+            ratio = elapsed / before
+            if ratio > 1.0 + threshold:
+                regressions.append((name, ratio))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = ArgumentParser(description="Run the benchmarks.")
+    parser.add_argument('--baseline', default=BASELINE,
+                        help="The baseline file to compare against or save to.")
+    parser.add_argument('--save', action='store_true',
+                        help="Save the results as the new baseline.")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="The fraction slower which counts as a regression.")
+    parser.add_argument('--duration', type=float, default=0.2,
+                        help="Roughly how long each timing run is, in seconds.")
+    parser.add_argument('--filter', default=None,
+                        help="Only run benchmarks whose names contain this.")
+    args = parser.parse_args(argv)
+
+    # What we're comparing against
+    baseline = dict()
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)['results']
+
+    # Run them
+    results = dict()
+    for (name, make) in benchmarks().items():
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = elapsed = measure(make(), duration=args.duration)
+        before = baseline.get(name)
+        change = "" if not before else "  %+6.1f%%" % (100 * (elapsed / before - 1),)
+        print("%-24s %12.3fus%s" % (name, elapsed * 1e6, change))
+
+    if args.save:
+        with open(args.baseline, 'w') as fh:
+            json.dump({'machine' : platform.platform(),
+                       'python'  : platform.python_version(),
+                       'time'    : time.strftime('%Y-%m-%dT%H:%M:%S'),
+                       'results' : dict(baseline, **results)},
+                      fh, indent=2, sort_keys=True)
+            fh.write('\n')
+        print("Saved baseline to %s" % (args.baseline,))
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for (name, ratio) in regressions:
+        print("REGRESSION: %s is %0.2fx slower" % (name, ratio))
+    return 1 if regressions else 0
+
+# ----------------------------------------------------------------------
+
+if __name__ == '__main__':
+    sys.exit(main())
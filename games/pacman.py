@@ -1,17 +1,16 @@
 #!/usr/bin/env python3
 
-from   pixelgames.canvas               import Canvas, Display, NullDisplay
-from   pixelgames.canvas.pimoroni      import UnicornHatHD
-from   pixelgames.canvas.rgbledmatrix  import RGBLEDMatrix
-from   pixelgames.canvas.terminal      import Curses
+from   pixelgames.canvas               import Canvas, Display
 from   pixelgames.game                 import Game
 from   pixelgames.inputs.joysticks     import AtariJoystick
-from   random                          import randint
+from   pixelgames.inputs.keyboard      import CursesKeyboard, ScriptedKeyboard
+from   pixelgames.registry             import create_display, startup_report
 from   typing                          import Tuple
 
 import curses
 import logging
-import pygame
+import math
+import sys
 import time
 
 # ----------------------------------------------------------------------
@@ -76,6 +75,11 @@ class Pacman(Game):
     # How many seconds between ghost steps
     _GHOST_STEP_TIME = 0.3
 
+    # How many game updates (and so pacman steps) per second, and how many
+    # frames per second we draw
+    _UPDATE_RATE = 1 / 0.15
+    _FRAME_RATE  = 100
+
     # The locations where the pacman and ghosts start
     _PACMAN_STARTS = (
         (7, 13), (8, 13),
@@ -99,16 +103,27 @@ class Pacman(Game):
                          (  0,   0, 0.5),) # Ghost start exit
 
     def __init__(self,
-                 display : Display) -> None:
+                 display  : Display,
+                 keyboard           = None,
+                 headless : bool    = False,
+                 seed     : int     = None) -> None:
         """
         CTOR
 
-        :param display: The `Display` instance to use.
+        :param display:  The `Display` instance to use.
+        :param keyboard: The ``Keyboard`` to read keys from, if not the curses
+                         screen.
+        :param headless: Whether to run headless, for testing.
+        :param seed:     The seed for the ghosts' choices.
         """
         # Create using an appropriate canvas
         super(Pacman, self).__init__(
             Canvas(display, width=self._WIDTH, height=self._HEIGHT),
-            scr=getattr(display, 'curses_screen', None)
+            scr     =getattr(display, 'curses_screen', None),
+            fps     =self._FRAME_RATE,
+            ups     =self._UPDATE_RATE,
+            headless=headless,
+            seed    =seed
         )
 
         # Copy the grid in. We have to switch from row-major to column-major for
@@ -118,49 +133,68 @@ class Pacman(Game):
             for y in range(self._HEIGHT):
                 self._grid[x][y] = self._GRID[y][x]
 
-        # Frameworks
-        self._pygame = None
-        self._scr    = None
-
-        # State
+        # State. We remember where things were before they last moved, and
+        # when, so that we can draw them moving smoothly between the two.
         self._ghost_posns = None
+        self._ghost_prevs = None
         self._ghost_moves = None
         self._ghost_times = None
+        self._ghost_step  = None
         self._pacman_posn = None
+        self._pacman_prev = None
         self._score       = None
         self._eating_time = None
 
-        # Controls
+        # Controls. Any action is an index into the directions.
         self._joystick = None
+        self._keyboard = keyboard
+        self._action   = None
 
 
     def _init(self,
-              game : pygame,
+              game,
               scr) -> None:
         """
         Set up the game state.
         """
-        scr.nodelay(True)
-        curses.noecho()
+        if scr is not None:
+            scr.nodelay(True)
+            curses.noecho()
 
         self._pygame = game
         self._scr    = scr
 
         self._ghost_posns = [list(self._GHOST_STARTS[i % len(self._GHOST_STARTS)])
                              for i in range(len(self._GHOST_COLOURS))]
-        self._ghost_moves = [self._DIRECTIONS[randint(0, len(self._DIRECTIONS)-1)]
+        self._ghost_prevs = [list(posn) for posn in self._ghost_posns]
+        self._ghost_moves = [self._DIRECTIONS[self._random.randint(0, len(self._DIRECTIONS)-1)]
                              for i in range(len(self._ghost_posns))]
         self._ghost_times = [0 for i in range(len(self._ghost_posns))]
         self._pacman_posn = list(self._PACMAN_STARTS[0])
+        self._pacman_prev = list(self._pacman_posn)
         self._score       = 0
-        self._eating_time = 0
+        self._eating_time = -math.inf
 
-        # We might not have a joystick attached
-        try:
-            self._joystick = AtariJoystick(game)
-            LOG.debug("Got a joystick %s", self._joystick)
-        except ValueError:
-            pass
+        # The ghosts move at their own rate, starting straight away
+        step = self.scheduler.ticks(self._GHOST_STEP_TIME)
+        self._ghost_step = step * self.scheduler.interval
+        for i in range(len(self._ghost_posns)):
+            self.scheduler.call_every(step, self._move_ghost, i, delay=0)
+
+        # We might not have a joystick attached, and don't if we are headless
+        if game is not None:
+            try:
+                self._joystick = AtariJoystick(game)
+                LOG.debug("Got a joystick %s", self._joystick)
+                self.track_input(self._joystick)
+            except ValueError:
+                pass
+
+        # Keys come from the screen unless we were given somewhere else
+        if self._keyboard is None:
+            self._keyboard = CursesKeyboard(scr) if scr is not None else \
+                             ScriptedKeyboard(())
+        self.track_input(self._keyboard)
 
 
     def _update(self,
@@ -169,25 +203,17 @@ class Pacman(Game):
         """
         A tick of the clock.
         """
-        LOG.debug("Events %s", events)
-
-        # Draw the display
-        self._canvas.clear()
-
-        # The static parts of the grid. And count any pills at the same time
-        has_pill = False
-        for x in range(len(self._grid)):
-            for y in range(len(self._grid[x])):
-                try:
-                    e = self._grid[x][y]
-                    (r, g, b) = self._GRID_COLOURS[e]
-                    self._canvas.set(x, y, r, g, b)
-                    if e in (self._PILL, self._EATER):
-                        has_pill = True
-                except IndexError:
-                    pass
+        # Only build log messages if they're going somewhere
+        debug = LOG.isEnabledFor(logging.DEBUG)
+        if debug:
+            LOG.debug("Events %s", events)
 
         # No pills means that we're done
+        has_pill = False
+        for column in self._grid:
+            if self._PILL in column or self._EATER in column:
+                has_pill = True
+                break
         if not has_pill:
             return True
 
@@ -198,7 +224,8 @@ class Pacman(Game):
             # Defer to the joystick first
             (jx, jy) = self._joystick.get_direction()
             if jx != 0 or jy != 0:
-                LOG.debug("Joystick %d %d", xd, yd)
+                if debug:
+                    LOG.debug("Joystick %d %d", xd, yd)
                 if jx < 0:
                     xd = -1
                 elif jx > 0:
@@ -209,14 +236,17 @@ class Pacman(Game):
                     yd = -1
 
         # Always check the keyboard
-        key = 0
-        while key != -1:
-            key = self._scr.getch()
+        for key in self._keyboard.read():
             if key in self._CONTROLS:
                 (xd, yd) = self._CONTROLS[key]
 
+        # And a bot has the final say
+        if self._action is not None:
+            (xd, yd) = self._action
+
         # Where are we going, who knows...
-        LOG.debug("Direction %d %d", xd, yd)
+        if debug:
+            LOG.debug("Direction %d %d", xd, yd)
 
         # Move pacman?
         (px, py) = (self._pacman_posn[0] + xd,
@@ -229,6 +259,8 @@ class Pacman(Game):
             py += len(self._grid[0])
         elif py >= len(self._grid[0]):
             py -= len(self._grid[0])
+        self._pacman_prev[0] = self._pacman_posn[0]
+        self._pacman_prev[1] = self._pacman_posn[1]
         if self._grid[px][py] not in (self._WALL, self._EXIT):
             self._pacman_posn[0] = px
             self._pacman_posn[1] = py
@@ -243,67 +275,109 @@ class Pacman(Game):
         # Whether ghosts can be eaten
         eating = now - self._eating_time < self._GHOST_EAT_TIME
 
-        # Move the ghosts
-        for i in range(len(self._ghost_posns)):
-            # Too soon?
-            if now - self._ghost_times[i] < self._GHOST_STEP_TIME:
-                continue
-
-            # Try to move the ghost
-            while True:
-                # Current state
-                (px, py) = self._ghost_posns[i]
-                (dx, dy) = self._ghost_moves[i]
-
-                # First see if the ghost might want to change direction
-                # because of a junction
-                for d in self._DIRECTIONS:
-                    # See if it's a change and not a reversal
-                    if ((d[0] == dx and d[1] == dy) and
-                        (d[0] !=  0 and d[0] == -dx or
-                         d[1] !=  0 and d[1] == -dy)):
-                        continue
-
-                    # See if it will hit the wall
-                    nx = px + d[0]
-                    ny = py + d[1]
-                    if (nx < 0 or nx >= len(self._grid   ) or
-                        ny < 0 or ny >= len(self._grid[0]) or
-                        self._grid[nx][ny] == self._WALL):
-                        continue
-
-                    # See if we want to choose it
-                    if randint(0, 1):
-                        self._ghost_moves[i] = d
-                        (dx, dy)       = d
-                        break
-
-                # Now move the ghost
-                nx = px + dx
-                ny = py + dy
-                if nx < 0:
-                    nx += len(self._grid)
-                elif nx >= len(self._grid):
-                    nx -= len(self._grid)
-                elif ny < 0:
-                    ny += len(self._grid[0])
-                elif ny >= len(self._grid[0]):
-                    ny -= len(self._grid[0])
-                # See if it will hit to wall (or, if can be eaten, the exit
-                # since we don't want them to leave in that case).
-                if (self._grid[nx][ny] != self._WALL and
-                    (not eating or self._grid[nx][ny] != self._EXIT)):
-                    self._ghost_posns[i][0] = nx
-                    self._ghost_posns[i][1] = ny
-                    self._ghost_times[i]    = now
-                    break
-                else:
-                    self._ghost_moves[i] = self._DIRECTIONS[randint(0, len(self._DIRECTIONS)-1)]
-
         # Whatever was there is now wiped out
         self._grid[self._pacman_posn[0]][self._pacman_posn[1]] = self._EMPTY
 
-        # Draw pacman and the ghosts
+        # See if pacman met a ghost
+        for (i, (x, y)) in enumerate(self._ghost_posns):
+            if self._pacman_posn[0] == x and self._pacman_posn[1] == y:
+                if eating:
+                    # The ghost was eaten, put it back to the start
+                    self._score += 20
+                    self._ghost_posns[i][0] = self._GHOST_STARTS[i][0]
+                    self._ghost_posns[i][1] = self._GHOST_STARTS[i][1]
+                    self._ghost_prevs[i][0] = self._GHOST_STARTS[i][0]
+                    self._ghost_prevs[i][1] = self._GHOST_STARTS[i][1]
+                else:
+                    # Oh dear, the ghost ate pacman. We're done
+                    return True
+
+        # Not yet done
+        return False
+
+
+    def _move_ghost(self,
+                    now : float,
+                    i   : int) -> None:
+        """
+        Move a ghost on a step, when the scheduler says that it's time.
+        """
+        # Whether ghosts can be eaten
+        eating = now - self._eating_time < self._GHOST_EAT_TIME
+
+        # Try to move the ghost
+        while True:
+            # Current state
+            (px, py) = self._ghost_posns[i]
+            (dx, dy) = self._ghost_moves[i]
+
+            # First see if the ghost might want to change direction
+            # because of a junction
+            for d in self._DIRECTIONS:
+                # See if it's a change and not a reversal
+                if ((d[0] == dx and d[1] == dy) and
+                    (d[0] !=  0 and d[0] == -dx or
+                     d[1] !=  0 and d[1] == -dy)):
+                    continue
+
+                # See if it will hit the wall
+                nx = px + d[0]
+                ny = py + d[1]
+                if (nx < 0 or nx >= len(self._grid   ) or
+                    ny < 0 or ny >= len(self._grid[0]) or
+                    self._grid[nx][ny] == self._WALL):
+                    continue
+
+                # See if we want to choose it
+                if self._random.randint(0, 1):
+                    self._ghost_moves[i] = d
+                    (dx, dy)       = d
+                    break
+
+            # Now move the ghost
+            nx = px + dx
+            ny = py + dy
+            if nx < 0:
+                nx += len(self._grid)
+            elif nx >= len(self._grid):
+                nx -= len(self._grid)
+            elif ny < 0:
+                ny += len(self._grid[0])
+            elif ny >= len(self._grid[0]):
+                ny -= len(self._grid[0])
+            # See if it will hit to wall (or, if can be eaten, the exit
+            # since we don't want them to leave in that case).
+            if (self._grid[nx][ny] != self._WALL and
+                (not eating or self._grid[nx][ny] != self._EXIT)):
+                self._ghost_prevs[i][0] = px
+                self._ghost_prevs[i][1] = py
+                self._ghost_posns[i][0] = nx
+                self._ghost_posns[i][1] = ny
+                self._ghost_times[i]    = now
+                break
+            else:
+                self._ghost_moves[i] = self._DIRECTIONS[self._random.randint(0, len(self._DIRECTIONS)-1)]
+
+
+    def _render(self,
+                now   : float,
+                alpha : float) -> None:
+        """
+        Draw the game, with things moving smoothly between their cells.
+        """
+        self._canvas.clear()
+
+        # The static parts of the grid
+        for x in range(len(self._grid)):
+            for y in range(len(self._grid[x])):
+                (r, g, b) = self._GRID_COLOURS[self._grid[x][y]]
+                self._canvas.set(x, y, r, g, b)
+
+        # Whether ghosts can be eaten
+        eating = now - self._eating_time < self._GHOST_EAT_TIME
+
+        # Draw the ghosts. They step at their own rate so we figure out how far
+        # through their step they are from when they last moved.
         for i in range(len(self._ghost_posns)):
             # The colour of the ghosts will be eatable if we are eating, but
             # we flash we as get close to reverting to normal
@@ -313,29 +387,50 @@ class Pacman(Game):
                 (r, g, b) = self._GHOST_EAT_COLOUR
             else:
                 (r, g, b) = self._GHOST_COLOURS[i]
-            (x, y) = self._ghost_posns[i]
+            step = min(1.0, (now - self._ghost_times[i]) / self._ghost_step)
+            (x, y) = self._between(self._ghost_prevs[i], self._ghost_posns[i], step)
             self._canvas.set(x, y, r, g, b)
-        (x, y)    = self._pacman_posn
+
+        # And pacman, who moves every update
+        (x, y)    = self._between(self._pacman_prev, self._pacman_posn, alpha)
         (r, g, b) = self._PACMAN_COLOUR
         self._canvas.set(x, y, r, g, b)
 
         # And display it all
         self._canvas.show()
 
-        # See if pacman met a ghost
-        for (i, (x, y)) in enumerate(self._ghost_posns):
-            if self._pacman_posn[0] == x and self._pacman_posn[1] == y:
-                if eating:
-                    # The ghost was eaten, put it back to the start
-                    self._score += 20
-                    self._ghost_posns[i][0] = self._GHOST_STARTS[i][0]
-                    self._ghost_posns[i][1] = self._GHOST_STARTS[i][1]
-                else:
-                    # Oh dear, the ghost ate pacman. We're done
-                    return True
 
-        # Not yet done
-        return False
+    @property
+    def score(self) -> int:
+        return self._score or 0
+
+
+    def act(self, action: int) -> None:
+        """
+        Move in the direction with the given index into `_DIRECTIONS`, or
+        stay put if it is out of range.
+        """
+        if 0 <= action < len(self._DIRECTIONS):
+            self._action = self._DIRECTIONS[action]
+        else:
+            self._action = None
+
+
+    def _between(self,
+                 prev     : list,
+                 posn     : list,
+                 fraction : float) -> Tuple[float,float]:
+        """
+        Get the position the given fraction of the way from one cell to the
+        next. Moves which wrap around the edge of the grid just jump.
+        """
+        (px, py) = prev
+        (x,  y ) = posn
+        if abs(x - px) > 1 or abs(y - py) > 1:
+            return (x, y)
+        else:
+            return (px + (x - px) * fraction,
+                    py + (y - py) * fraction)
 
 
     def _quit(self) -> None:
@@ -346,15 +441,23 @@ class Pacman(Game):
             self._joystick.close()
         except:
             pass
+        try:
+            self._keyboard.close()
+        except:
+            pass
 
-        # What did you get?
-        print('You scored: {}\n'.format(self._score))
+        # What did you get? Nobody is watching a headless game.
+        if not self._headless:
+            print('You scored: {}\n'.format(self._score))
 
 # ----------------------------------------------------------------------
 
 if __name__ == '__main__':
     #LOG.setLevel('DEBUG')
-    display = Curses()
-    #display = NullDisplay(64, 64)
+    # The display may be given by name, e.g. "rgbledmatrix"
+    name    = sys.argv[1] if len(sys.argv) > 1 else 'curses'
+    display = create_display(name, 64, 64) if name == 'null' else \
+              create_display(name)
     game = Pacman(display)
     game.start()
+    LOG.info("Startup times:\n%s", startup_report())
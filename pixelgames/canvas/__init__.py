@@ -11,15 +11,152 @@ from   typing import Tuple
 import logging
 import math
 import numpy
+import time
 
 # ======================================================================
 
+# The orientations which we support, in degrees clockwise
+ORIENTATIONS = (0, 90, 180, 270)
+
+# ----------------------------------------------------------------------
+
+class Calibration():
+    """
+    The colour calibration for a display: its gamma, white balance and overall
+    brightness.
+
+    These are compiled into per-channel lookup tables up front so that applying
+    them to a frame is a single vectorised lookup, done when the `Canvas`
+    flushes to the display.
+    """
+    def __init__(self,
+                 gamma         : float                    = 1.0,
+                 white_balance : Tuple[float,float,float] = (1.0, 1.0, 1.0),
+                 brightness    : float                    = 1.0,
+                 levels        : int                      = 1024):
+        """
+        :param gamma:         The gamma exponent to apply. This may be a single
+                              value or one per RGB channel.
+        :param white_balance: The scaling factor of each of the RGB channels.
+        :param brightness:    The overall brightness scaling factor.
+        :param levels:        How many input levels the tables have. More than
+                              256 keeps detail in the darks when the gamma is
+                              greater than one.
+        """
+        if isinstance(gamma, (int, float)):
+            gamma = (gamma, gamma, gamma)
+        if len(gamma) != 3 or any(g <= 0 for g in gamma):
+            raise ValueError("Bad gamma: %s" % (gamma,))
+        if len(white_balance) != 3 or any(w < 0 for w in white_balance):
+            raise ValueError("Bad white balance: %s" % (white_balance,))
+        if brightness < 0:
+            raise ValueError("Bad brightness: %s" % (brightness,))
+        if not 2 <= levels <= 65536:
+            raise ValueError("Bad number of levels: %s" % (levels,))
+
+        self._gamma         = tuple(float(g) for g in gamma)
+        self._white_balance = tuple(float(w) for w in white_balance)
+        self._brightness    = float(brightness)
+        self._levels        = int(levels)
+
+        # Build the tables, one row per channel, mapping the input level to the
+        # output byte value
+        inputs = numpy.linspace(0.0, 1.0, self._levels)
+        self._lut = numpy.empty((3, self._levels), dtype=numpy.uint8)
+        for c in range(3):
+            values = (255.0 *
+                      self._brightness *
+                      self._white_balance[c] *
+                      inputs ** self._gamma[c])
+            self._lut[c] = numpy.clip(numpy.round(values), 0, 255)
+
+        # For indexing the tables by channel
+        self._channels = numpy.arange(3)
+
+
+    @property
+    def gamma(self) -> Tuple[float,float,float]:
+        """
+        The per-channel gamma exponents.
+        """
+        return self._gamma
+
+
+    @property
+    def white_balance(self) -> Tuple[float,float,float]:
+        """
+        The per-channel white balance factors.
+        """
+        return self._white_balance
+
+
+    @property
+    def brightness(self) -> float:
+        """
+        The overall brightness factor.
+        """
+        return self._brightness
+
+
+    def apply(self, frame: numpy.ndarray) -> numpy.ndarray:
+        """
+        Apply the calibration to a frame.
+
+        :param frame: The ``(width, height, 3)`` array of RGB values, with
+                      ranges from zero to one inclusive.
+
+        :return: The calibrated frame, as a ``uint8`` array of the same shape.
+        """
+        index = numpy.clip(frame, 0.0, 1.0) * (self._levels - 1) + 0.5
+        return self._lut[self._channels, index.astype(numpy.intp)]
+
+
 class Display(ABC):
     """
     The interface which all displays must implement.
 
     Display origin ``(0,0)`` is the top left.
     """
+    # By default we have no calibration
+    _calibration = None
+
+
+    @property
+    def refresh_rate(self) -> float:
+        """
+        How many times a second the display refreshes, if it is known and
+        fixed, else ``None``. There is no point in showing frames any faster
+        than this.
+        """
+        return None
+
+
+    @property
+    def vsync(self) -> bool:
+        """
+        Whether `show` blocks until the display next refreshes. If so then the
+        display paces the caller and there's no need to wait for it as well.
+        """
+        return False
+
+
+    @property
+    def calibration(self) -> Calibration:
+        """
+        The display's colour `Calibration`, if any.
+        """
+        return self._calibration
+
+
+    def set_calibration(self, calibration: Calibration) -> None:
+        """
+        Set the colour calibration of the display. This is applied to the whole
+        frame by the `Canvas` when it flushes to the display.
+
+        :param calibration: The `Calibration` to use, or ``None`` for none.
+        """
+        self._calibration = calibration
+
     @property
     def width(self) -> int:
         """
@@ -44,15 +181,19 @@ class Display(ABC):
         return (0, 0)
 
 
-    @abstractmethod
     def set_orientation(self, orientation: int) -> None:
         """
         Set the orientation of the display to one of ``0``, ``90``, ``180`` or
         ``270`` degrees.
 
-        :param
+        Orientation is handled by the `Canvas`, which rotates the whole frame
+        before handing it over with `set_frame`. As such displays need not do
+        anything here; use `Canvas.set_orientation` instead.
+
+        :param orientation: The orientation, in degrees clockwise.
         """
-        pass
+        if orientation not in ORIENTATIONS:
+            raise ValueError("Bad orientation: %s" % (orientation,))
 
 
     @abstractmethod
@@ -84,6 +225,24 @@ class Display(ABC):
         pass
 
 
+    def set_frame(self, frame: numpy.ndarray) -> None:
+        """
+        Set the contents of the whole display in one go. The frame is a
+        ``uint8`` array of shape ``(width, height, 3)``, indexed as
+        ``frame[x][y]``, holding RGB values in the range ``[0,255]``.
+
+        This is how the `Canvas` pushes its contents to the display. This
+        default implementation simply calls `set` for each pixel, displays
+        which can do better should override it.
+
+        :param frame: The RGB values of every pixel.
+        """
+        (width, height) = self.get_shape()
+        for (x, column) in enumerate(frame[:width, :height].tolist()):
+            for (y, (r, g, b)) in enumerate(column):
+                self.set(x, y, r / 255, g / 255, b / 255)
+
+
     @abstractmethod
     def show(self) -> None:
         """
@@ -113,10 +272,6 @@ class NullDisplay(Display):
         return (self._width, self._height)
 
 
-    def set_orientation(self, orientation: int) -> None:
-        pass
-
-
     def clear(self):
         pass
 
@@ -130,6 +285,10 @@ class NullDisplay(Display):
         pass
 
 
+    def set_frame(self, frame: numpy.ndarray) -> None:
+        pass
+
+
     def show(self):
         pass
 
@@ -142,39 +301,62 @@ class Canvas():
     A display for rendering on. This will scale according to the underlying
     `Display`.
     """
+    # The different code paths which set() can take, as used by the heatmap.
+    # The last is the cheap one used when antialiasing is turned off.
+    PATHS = ('direct', 'subpixel', 'fractional', 'snapped')
+
+
     def __init__(self,
-                 display : Display,
-                 width   : int     = None,
-                 height  : int     = None,
-                 xwrap   : bool    = False,
-                 ywrap   : bool    = False):
-        """
-        :param display: The display to render to.
-        ...
-        """
-        width  = display.width  if width  is None else width
-        height = display.height if height is None else height
-        if width <= 0:
+                 display     : Display,
+                 width       : int     = None,
+                 height      : int     = None,
+                 xwrap       : bool    = False,
+                 ywrap       : bool    = False,
+                 orientation : int     = 0):
+        """
+        :param display:     The display to render to.
+        :param width:       The canvas width, defaults to the display's.
+        :param height:      The canvas height, defaults to the display's.
+        :param xwrap:       Whether drawing wraps around in the X direction.
+        :param ywrap:       Whether drawing wraps around in the Y direction.
+        :param orientation: The orientation of the display, in degrees
+                            clockwise. See `set_orientation`.
+        """
+        if width is not None and width <= 0:
             raise ValueError("Bad width: %s" % width)
-        if height <= 0:
+        if height is not None and height <= 0:
             raise ValueError("Bad height: %s" % height)
 
         # The display details
-        self._x_sz    = width
-        self._y_sz    = height
         self._display = display
-        self._scale   = min(display.width  / width,
-                            display.height / height)
-
-        # The canvas is the RGB value of each _display_ pixel and what fraction of it has
-        # been painted
-        self._canvas  = numpy.zeros(shape=(display.width, display.height, 4),
-                                    dtype=numpy.float64)
+        self._req_sz  = (width, height)
 
         # Wrapping?
         self._xwrap = xwrap
         self._ywrap = ywrap
 
+        # Set up the geometry, and the canvas along with it
+        self._orientation = None
+        self.set_orientation(orientation)
+
+        # The post-processing effects, and how long each took last frame
+        self._clock        = time.perf_counter
+        self._effects      = []
+        self._effect_times = ()
+
+        # The heatmap instrumentation, off by default
+        self._heatmap      = None
+        self._last_heatmap = None
+
+        # Who to tell when we show a frame, and how long the last one took
+        self._show_listeners = []
+        self._timings        = (0.0, 0.0)
+
+        # The quality settings. By default we antialias and show every frame.
+        self._antialias        = True
+        self._present_interval = 1
+        self._present_count    = 0
+
 
     @property
     def width(self) -> int:
@@ -192,11 +374,328 @@ class Canvas():
         return self._y_sz
 
 
+    @property
+    def display(self) -> Display:
+        """
+        The display which we render to.
+        """
+        return self._display
+
+
+    def set_display(self, display: Display) -> None:
+        """
+        Render to a different display, like one which wraps the current one.
+        What has been drawn so far is kept.
+
+        :param display: The new display, which must be the same shape as the
+                        current one.
+        """
+        if display.get_shape() != self._display.get_shape():
+            raise ValueError("Bad display shape: %s != %s" %
+                             (display.get_shape(), self._display.get_shape()))
+        self._display = display
+
+
+    @property
+    def orientation(self) -> int:
+        """
+        The display orientation, in degrees clockwise.
+        """
+        return self._orientation
+
+
+    def set_orientation(self, orientation: int) -> None:
+        """
+        Set the orientation of the display to one of ``0``, ``90``, ``180`` or
+        ``270`` degrees clockwise.
+
+        The canvas is drawn in its logical orientation and the whole frame is
+        rotated when it is flushed by `show`, so this works for every display
+        and costs nothing per pixel. Changing the orientation clears the
+        canvas since its geometry may change.
+
+        :param orientation: The orientation, in degrees clockwise.
+        """
+        if orientation not in ORIENTATIONS:
+            raise ValueError("Bad orientation: %s" % (orientation,))
+        self._orientation = orientation
+
+        # The logical display shape, which is the physical one turned on its
+        # side for the quarter turns
+        (dw, dh) = self._display.get_shape()
+        if orientation in (90, 270):
+            (dw, dh) = (dh, dw)
+        self._width  = dw
+        self._height = dh
+
+        # And so the canvas size, and how it fits onto the display
+        (width, height) = self._req_sz
+        self._x_sz  = dw if width  is None else width
+        self._y_sz  = dh if height is None else height
+        self._scale = min(dw / self._x_sz,
+                          dh / self._y_sz)
+
+        # The canvas is the RGB value of each _display_ pixel and what fraction
+        # of it has been painted. This is in the logical orientation.
+        self._canvas = numpy.zeros(shape=(dw, dh, 4),
+                                   dtype=numpy.float64)
+
+        # A read-only view of its colours, for handing out
+        self._frame = self._canvas[:, :, :3]
+        self._frame.flags.writeable = False
+
+        # The heatmap needs to match the new geometry
+        if getattr(self, '_heatmap', None) is not None:
+            self.enable_heatmap()
+
+
+    @property
+    def frame(self) -> numpy.ndarray:
+        """
+        A read-only view of what has been drawn on the canvas so far. This is a
+        ``(width, height, 3)`` array, indexed as ``frame[x][y]``, of the RGB
+        values of each _display_ pixel in the canvas's orientation, before any
+        effects or calibration.
+
+        No copy is made so this is cheap to use every frame, but it will change
+        as the canvas is drawn on. Take a copy if you want to keep it. The view
+        is replaced if the orientation changes.
+        """
+        return self._frame
+
+
+    def get(self,
+            x: float,
+            y: float) -> Tuple[float,float,float]:
+        """
+        Get the colour which has been drawn at the given canvas coordinates.
+
+        :param x: The x coordinate.
+        :param y: The y coordinate.
+
+        :return: The ``(r, g, b)`` value, or ``None`` if the coordinates are off
+                 the canvas.
+        """
+        # Determine the display's coordinates. For big pixels we look at the
+        # middle of the square which set() would have drawn.
+        scale = self._scale
+        dx = x * scale
+        dy = y * scale
+        if scale > 1.0:
+            half = (scale - 1.0) / 2.0
+            if int(scale) & 1:
+                l_off = int(half)
+                r_off = scale - l_off
+            else:
+                r_off = int(half)
+                l_off = scale - r_off
+            dx += (r_off - l_off) / 2.0
+            dy += (r_off - l_off) / 2.0
+        dx = math.floor(dx)
+        dy = math.floor(dy)
+
+        # Wrap if need be
+        if self._xwrap:
+            dx %= self._width
+        if self._ywrap:
+            dy %= self._height
+        if 0 <= dx < self._width and 0 <= dy < self._height:
+            (r, g, b) = self._frame[dx, dy].tolist()
+            return (r, g, b)
+        else:
+            return None
+
+
+    def to_image(self) -> Image:
+        """
+        Get what has been drawn on the canvas as a PIL ``Image``, e.g. for
+        taking a screenshot. This is at the display's resolution and in the
+        canvas's orientation.
+
+        :return: A new RGB image.
+        """
+        frame = (numpy.clip(self._frame, 0.0, 1.0) * 255).astype(numpy.uint8)
+        return Image.fromarray(numpy.ascontiguousarray(frame.transpose(1, 0, 2)),
+                               'RGB')
+
+
+    def set_clock(self, clock) -> None:
+        """
+        Set the clock which effects are timed against. This should be the same
+        one as the game's, which is not always real time.
+
+        :param clock: The function which gives the time, in seconds.
+        """
+        self._clock = clock
+
+
+    @property
+    def effects(self) -> Tuple:
+        """
+        The post-processing effects, in the order in which they are applied.
+        """
+        return tuple(self._effects)
+
+
+    @property
+    def effect_timings(self) -> Tuple[Tuple[str,float]]:
+        """
+        How long each enabled post-processing effect took to apply in the last
+        `show`, as a tuple of ``(name, seconds)`` pairs.
+        """
+        return self._effect_times
+
+
+    def add_effect(self, effect) -> None:
+        """
+        Add a post-processing effect to the end of the chain. Effects are
+        applied to the whole frame, in order, when it is flushed by `show`.
+
+        :param effect: The ``pixelgames.canvas.effects.Effect`` to add.
+        """
+        self._effects.append(effect)
+
+
+    def remove_effect(self, effect) -> None:
+        """
+        Remove a post-processing effect from the chain.
+
+        :param effect: The effect to remove.
+        """
+        self._effects.remove(effect)
+
+
+    def enable_heatmap(self) -> None:
+        """
+        Turn on the heatmap instrumentation. This counts, for each display
+        pixel, how many times `set` blended into it, and by which of the
+        `PATHS`. The counts are gathered per frame, with `show` marking the end
+        of each one.
+
+        This wraps `set` so it costs nothing when it is turned off.
+        """
+        self._heatmap      = numpy.zeros((len(self.PATHS),
+                                          self._width,
+                                          self._height),
+                                         dtype=numpy.int64)
+        self._last_heatmap = self._heatmap.copy()
+        self._install_set()
+
+
+    def disable_heatmap(self) -> None:
+        """
+        Turn off the heatmap instrumentation.
+        """
+        self._heatmap      = None
+        self._last_heatmap = None
+        self._install_set()
+
+
+    @property
+    def heatmap(self) -> numpy.ndarray:
+        """
+        The heatmap counts for the last frame, or ``None`` if the heatmap is not
+        enabled. This is a ``(len(PATHS), width, height)`` array of the number
+        of times each display pixel was blended into by each code path in
+        `set`. Sum over the first axis for the total.
+        """
+        return self._last_heatmap
+
+
+    def heatmap_image(self) -> Image:
+        """
+        Render the total counts of the last frame's heatmap as an image, going
+        from black for untouched pixels, through red and yellow, to white for
+        the most touched ones.
+
+        :return: A new RGB image, at the display's resolution.
+        """
+        if self._last_heatmap is None:
+            raise ValueError("Heatmap is not enabled")
+
+        counts = self._last_heatmap.sum(axis=0).astype(numpy.float64)
+        counts /= max(1.0, counts.max())
+        frame = numpy.empty(counts.shape + (3,), dtype=numpy.uint8)
+        for c in range(3):
+            frame[:, :, c] = numpy.clip(3.0 * counts - c, 0.0, 1.0) * 255
+        return Image.fromarray(numpy.ascontiguousarray(frame.transpose(1, 0, 2)),
+                               'RGB')
+
+
+    @property
+    def antialias(self) -> bool:
+        """
+        Whether `set` draws antialiased pixels.
+        """
+        return self._antialias
+
+
+    def set_antialias(self, antialias: bool) -> None:
+        """
+        Set whether `set` draws antialiased pixels. If not then pixels are
+        snapped to the display's pixel grid, and drawn as solid squares without
+        any blending, which is a lot cheaper.
+
+        :param antialias: Whether to antialias.
+        """
+        self._antialias = bool(antialias)
+        self._install_set()
+
+
+    @property
+    def present_interval(self) -> int:
+        """
+        How many calls to `show` it takes to actually present a frame.
+        """
+        return self._present_interval
+
+
+    def set_present_interval(self, interval: int) -> None:
+        """
+        Only present every so many frames to the display, skipping the others,
+        for when the display is the bottleneck.
+
+        :param interval: Present one in this many frames.
+        """
+        if interval < 1:
+            raise ValueError("Bad present interval: %s" % (interval,))
+        self._present_interval = int(interval)
+
+
+    @property
+    def timings(self) -> Tuple[float,float]:
+        """
+        How long the last frame presented by `show` took, in seconds, as a
+        ``(raster, show)`` tuple. The first is the time spent preparing the
+        frame (effects, rotation, calibration and handing it to the display)
+        and the second the time spent in the display's own ``show``.
+        """
+        return self._timings
+
+
+    def add_show_listener(self, listener) -> None:
+        """
+        Add a function to be called, with no arguments, each time a frame has
+        been shown on the display.
+
+        :param listener: The function to call.
+        """
+        self._show_listeners.append(listener)
+
+
+    def remove_show_listener(self, listener) -> None:
+        """
+        Remove a function added by `add_show_listener`.
+
+        :param listener: The function to remove.
+        """
+        self._show_listeners.remove(listener)
+
+
     def clear(self):
         """
         Clear the canvas contents.
         """
-        self._display.clear()
         self._canvas[:,:,:] = 0.0
 
 
@@ -227,8 +726,8 @@ class Canvas():
         #logging.debug(f'x={x} y={y} r={r} g={g} b={b} s={s}')
 
         # Local handles on a few things which we use a lot
-        width  = self._display.width
-        height = self._display.height
+        width  = self._width
+        height = self._height
         canvas = self._canvas
         xwrap  = self._xwrap
         ywrap  = self._ywrap
@@ -259,7 +758,6 @@ class Canvas():
             pixel[1] = dg
             pixel[2] = db
             pixel[3] = 1.0
-            self._display.set(dx, dy, dr, dg, db)
 
         elif scale < 1.0     and \
              0 <= dx < width and \
@@ -310,9 +808,6 @@ class Canvas():
             pixel[2] = pb if pb < 1.0 else 1.0
             pixel[3] = pf if pf < 1.0 else 1.0
 
-            # And, finally, push those values to the display itself!
-            self._display.set(px, py, pr, pg, pb)
-
         else:
             # Okay, we're going to paint a fractional square which is centered
             # around dx,dy. We need to determine the integer pixels which we are
@@ -430,8 +925,234 @@ class Canvas():
                     pixel[2] = pb if pb < 1.0 else 1.0
                     pixel[3] = pf if pf < 1.0 else 1.0
 
-                    # And, finally, push those values to the display itself!
-                    self._display.set(px, py, pr, pg, pb)
+
+    def _install_set(self) -> None:
+        """
+        Put in place the version of `set` which we want, given the quality and
+        instrumentation settings. The usual one is the class's method, which
+        we leave as-is so that it costs nothing extra.
+        """
+        self.__dict__.pop('set', None)
+        if self._heatmap is not None:
+            self.set = self._heatmap_set
+        elif not self._antialias:
+            self.set = self._snapped_set
+
+
+    def _snapped_span(self,
+                      x: float,
+                      y: float,
+                      s: float) -> Tuple[object,object]:
+        """
+        Figure out which display pixels a snapped pixel covers.
+
+        :return: The X and Y ranges, as slices or index arrays, or ``None`` if
+                 nothing is covered.
+        """
+        # The size of the square and its position, in whole display pixels
+        scale = s * self._scale
+        if scale <= 0.0:
+            return None
+        size = max(1, int(round(scale)))
+        dx   = int(round(x * self._scale))
+        dy   = int(round(y * self._scale))
+
+        # These grow in the same directions as in set()
+        half = (size - 1) // 2
+        if size & 1:
+            l_off = half
+        else:
+            l_off = size - half
+        spans = []
+        for (d, length, wrap) in ((dx, self._width,  self._xwrap),
+                                  (dy, self._height, self._ywrap)):
+            lo = d - l_off
+            hi = lo + size
+            if 0 <= lo and hi <= length:
+                spans.append(slice(lo, hi))
+            elif wrap:
+                spans.append(numpy.arange(lo, hi) % length)
+            else:
+                lo = max(0, lo)
+                hi = min(length, hi)
+                if lo >= hi:
+                    return None
+                spans.append(slice(lo, hi))
+        return spans
+
+
+    def _snapped_set(self,
+                     x: float,
+                     y: float,
+                     r: float,
+                     g: float,
+                     b: float,
+                     s: float = 1.0) -> None:
+        """
+        The version of `set` which we use when antialiasing is off.
+        """
+        spans = self._snapped_span(x, y, s)
+        if spans is None:
+            return
+        (xs, ys) = spans
+        if not isinstance(xs, slice) and not isinstance(ys, slice):
+            (xs, ys) = numpy.ix_(xs, ys)
+        self._canvas[xs, ys] = (min(max(0.0, r), 1.0),
+                                min(max(0.0, g), 1.0),
+                                min(max(0.0, b), 1.0),
+                                1.0)
+
+
+    def _heatmap_set(self,
+                     x: float,
+                     y: float,
+                     r: float,
+                     g: float,
+                     b: float,
+                     s: float = 1.0) -> None:
+        """
+        The version of `set` which we use when the heatmap is enabled. This
+        figures out which display pixels `set` will blend into, in the same way
+        that it does, counts them, and then defers to it.
+        """
+        heatmap = self._heatmap
+        width   = self._width
+        height  = self._height
+        scale   = s * self._scale
+        dx      = x * self._scale
+        dy      = y * self._scale
+
+        if not self._antialias:
+            spans = self._snapped_span(x, y, s)
+            if spans is not None:
+                (xs, ys) = spans
+                if not isinstance(xs, slice) and not isinstance(ys, slice):
+                    (xs, ys) = numpy.ix_(xs, ys)
+                heatmap[3, xs, ys] += 1
+            self._snapped_set(x, y, r, g, b, s)
+            return
+
+        elif scale <= 0.0:
+            pass
+
+        elif scale == 1.0                    and \
+             int(dx) == dx and int(dy) == dy and \
+             0 <= dx < width   and \
+             0 <= dy < height:
+            heatmap[0, int(dx), int(dy)] += 1
+
+        elif scale < 1.0     and \
+             0 <= dx < width and \
+             0 <= dy < height:
+            heatmap[1, int(dx), int(dy)] += 1
+
+        else:
+            half = max(0.0, (scale - 1.0) / 2.0)
+            if int(scale) & 1:
+                l_off = int(half)
+                r_off = scale - l_off
+            else:
+                r_off = int(half)
+                l_off = scale - r_off
+            dxl = dx - l_off
+            dxr = dx + r_off
+            dyt = dy - l_off
+            dyb = dy + r_off
+            for px in range(int(dxl), int(dxr) + 1):
+                for py in range(int(dyt), int(dyb) + 1):
+                    if abs(min(dxr, px+1) - max(dxl, px)) * \
+                       abs(min(dyb, py+1) - max(dyt, py)) <= 0.0:
+                        continue
+                    if px < 0 or px >= width:
+                        if not self._xwrap:
+                            continue
+                        px %= width
+                    if py < 0 or py >= height:
+                        if not self._ywrap:
+                            continue
+                        py %= height
+                    heatmap[2, px, py] += 1
+
+        Canvas.set(self, x, y, r, g, b, s)
+
+
+    def set_points(self,
+                   xs,
+                   ys,
+                   colours,
+                   s = 1.0) -> None:
+        """
+        Draw a batch of points, as if by calling `set` for each of them, in
+        order. Runs of points which land exactly on a single display pixel, or
+        on a single snapped one when antialiasing is off, are drawn in one go;
+        anything else is handed to `set`. This is quickest when most points
+        are of the first sort.
+
+        :param xs:      The x coordinates.
+        :param ys:      The y coordinates.
+        :param colours: The ``(n, 3)`` RGB values, ``[0,1]``, or a single RGB
+                        value for all of them.
+        :param s:       The pixel scale value, either one for all of them or
+                        one for each.
+        """
+        xs      = numpy.asarray(xs, dtype=numpy.float64)
+        ys      = numpy.asarray(ys, dtype=numpy.float64)
+        count   = len(xs)
+        colours = numpy.clip(
+            numpy.broadcast_to(numpy.asarray(colours, dtype=numpy.float64),
+                               (count, 3)),
+            0.0, 1.0
+        )
+        sizes   = numpy.broadcast_to(numpy.asarray(s, dtype=numpy.float64),
+                                     (count,))
+        if count == 0:
+            return
+
+        # The heatmap needs to see every point, so it gets the slow way
+        if self._heatmap is not None:
+            for i in range(count):
+                self.set(xs[i], ys[i], *colours[i], sizes[i])
+            return
+
+        # Figure out which points cover exactly one display pixel, and which
+        # one that is. Points drawn that way which are off the canvas are
+        # dropped.
+        scale = sizes * self._scale
+        dx    = xs * self._scale
+        dy    = ys * self._scale
+        if self._antialias:
+            direct = ((scale == 1.0) &
+                      (dx == numpy.floor(dx)) & (dy == numpy.floor(dy)) &
+                      (0 <= dx) & (dx < self._width) &
+                      (0 <= dy) & (dy < self._height))
+            px     = numpy.where(direct, dx, 0).astype(numpy.intp)
+            py     = numpy.where(direct, dy, 0).astype(numpy.intp)
+            inside = direct
+        else:
+            direct = (0.0 < scale) & (numpy.round(scale) <= 1.0)
+            px     = numpy.round(numpy.where(direct, dx, 0)).astype(numpy.intp)
+            py     = numpy.round(numpy.where(direct, dy, 0)).astype(numpy.intp)
+            inside = direct.copy()
+            for (p, length, wrap) in ((px, self._width,  self._xwrap),
+                                      (py, self._height, self._ywrap)):
+                if wrap:
+                    p %= length
+                else:
+                    inside &= (0 <= p) & (p < length)
+
+        # Draw each run of those in one go, and anything else the usual way in
+        # between, so that later points still go on top of earlier ones.
+        # Points which scale to nothing are dropped by set() too.
+        start = 0
+        for i in numpy.append(numpy.flatnonzero(~direct), count):
+            if start < i:
+                keep = inside[start:i]
+                (rx, ry) = (px[start:i][keep], py[start:i][keep])
+                self._canvas[rx, ry, :3] = colours[start:i][keep]
+                self._canvas[rx, ry,  3] = 1.0
+            if i < count:
+                self.set(xs[i], ys[i], *colours[i], sizes[i])
+            start = i + 1
 
 
     def set_image(self,
@@ -442,7 +1163,7 @@ class Canvas():
         This isn't too fast right now.
         """
         # Get the relative dimensions
-        (dw, dh) = self._display.get_shape()
+        (dw, dh) = (self._width, self._height)
         (iw, ih) = image.size
         if iw <= 0 or ih <= 0:
             raise ValueError("Bad image dimensions: %d x %d" % (iw, ih))
@@ -481,7 +1202,63 @@ class Canvas():
         """
         Flush any `set` calls to the display.
         """
+        # Are we skipping this one?
+        self._present_count += 1
+        if self._present_count < self._present_interval:
+            self.__end_frame()
+            return
+        self._present_count = 0
+        start = time.perf_counter()
+
+        # The frame is just a view onto the canvas to start with
+        frame = self._canvas[:, :, :3]
+
+        # Post-process it, if we have anything to do that. The effects get
+        # their own copy to mess with, since the canvas may be drawn on again.
+        times = []
+        if self._effects:
+            now   = self._clock()
+            frame = frame.copy()
+            for effect in self._effects:
+                if effect.enabled:
+                    effect_start = time.perf_counter()
+                    frame = effect.apply(frame, now)
+                    times.append((effect.name,
+                                  time.perf_counter() - effect_start))
+        self._effect_times = tuple(times)
+
+        # Rotate the whole frame into the display's orientation. This is also
+        # a view so costs nothing until we quantise it, which copies it anyhow.
+        if self._orientation:
+            frame = numpy.rot90(frame, self._orientation // 90, axes=(0, 1))
+
+        # Turn it into bytes, calibrating as we go if need be, and hand it over
+        # in one go
+        calibration = self._display.calibration
+        if calibration is None:
+            frame = (numpy.clip(frame, 0.0, 1.0) * 255).astype(numpy.uint8)
+        else:
+            frame = calibration.apply(frame)
+        self._display.set_frame(frame)
+        rastered = time.perf_counter()
         self._display.show()
+        self._timings = (rastered - start, time.perf_counter() - rastered)
+
+        # Tell anyone who cares
+        for listener in self._show_listeners:
+            listener()
+        self.__end_frame()
+
+
+    def __end_frame(self) -> None:
+        """
+        Called at the end of each frame, whether it was presented or not.
+        """
+        # That's the end of the frame as far as the heatmap is concerned
+        if self._heatmap is not None:
+            (self._last_heatmap, self._heatmap) = (self._heatmap,
+                                                   self._last_heatmap)
+            self._heatmap[:,:,:] = 0
 
 
     def quit(self):
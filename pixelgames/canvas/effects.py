@@ -0,0 +1,240 @@
+"""
+Post-processing effects, which are applied to the whole of the `Canvas` frame
+before it is flushed to the display.
+"""
+
+from   abc    import ABC, abstractmethod
+
+import numpy
+
+# ----------------------------------------------------------------------
+
+class Effect(ABC):
+    """
+    The base class for all post-processing effects.
+
+    Effects are given the frame as a ``(width, height, 3)`` array of RGB values,
+    with ranges from zero to one inclusive, indexed as ``frame[x][y]``. The
+    frame belongs to the effect chain so effects may modify it in place.
+    """
+    def __init__(self):
+        # Whether the effect is applied or not
+        self.enabled = True
+
+
+    @property
+    def name(self) -> str:
+        """
+        The name of the effect, for reporting.
+        """
+        return type(self).__name__
+
+
+    @abstractmethod
+    def apply(self,
+              frame : numpy.ndarray,
+              now   : float) -> numpy.ndarray:
+        """
+        Apply the effect to the frame.
+
+        :param frame: The RGB values of the frame.
+        :param now:   The current time, in seconds.
+
+        :return: The resultant frame, which may be the given one.
+        """
+        return frame
+
+
+class _Transition(Effect):
+    """
+    The base class for effects which run over a period of time, starting from
+    when they are first applied.
+    """
+    def __init__(self, duration: float):
+        """
+        :param duration: How long the transition takes, in seconds.
+        """
+        super().__init__()
+        if duration < 0:
+            raise ValueError("Bad duration: %s" % (duration,))
+        self._duration = float(duration)
+        self._start    = None
+
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether the transition has finished.
+        """
+        return self._start is not None and self._progress(self._start) >= 1.0
+
+
+    def restart(self) -> None:
+        """
+        Run the transition again, from the next time it is applied.
+        """
+        self._start = None
+
+
+    def _progress(self, now: float) -> float:
+        """
+        :return: How far through the transition we are, from zero to one.
+        """
+        if self._start is None:
+            self._start = now
+        if self._duration <= 0.0:
+            return 1.0
+        return min(1.0, max(0.0, (now - self._start) / self._duration))
+
+
+class Fade(_Transition):
+    """
+    Fade the frame in from, or out to, black.
+    """
+    def __init__(self,
+                 duration : float,
+                 fade_in  : bool = True):
+        """
+        :param duration: How long the fade takes, in seconds.
+        :param fade_in:  Whether to fade in, else fade out.
+        """
+        super().__init__(duration)
+        self._fade_in = fade_in
+
+
+    def apply(self,
+              frame : numpy.ndarray,
+              now   : float) -> numpy.ndarray:
+        level = self._progress(now)
+        if not self._fade_in:
+            level = 1.0 - level
+        if level < 1.0:
+            frame *= level
+        return frame
+
+
+class Crossfade(_Transition):
+    """
+    Crossfade from a fixed frame, such as the last one of the previous scene,
+    into whatever is being drawn now.
+    """
+    def __init__(self,
+                 start    : numpy.ndarray,
+                 duration : float):
+        """
+        :param start:    The RGB frame to fade from, e.g. a copy of
+                         ``Canvas.frame``. This should be the same shape as the
+                         canvas frame.
+        :param duration: How long the crossfade takes, in seconds.
+        """
+        super().__init__(duration)
+        self._from = numpy.array(start[:, :, :3], dtype=numpy.float64)
+
+
+    def apply(self,
+              frame : numpy.ndarray,
+              now   : float) -> numpy.ndarray:
+        level = self._progress(now)
+        if level < 1.0:
+            frame *= level
+            frame += (1.0 - level) * self._from
+        return frame
+
+
+class Blur(Effect):
+    """
+    A box blur, with the edge pixels extended outwards.
+    """
+    def __init__(self, radius: int = 1):
+        """
+        :param radius: The blur radius, in display pixels.
+        """
+        super().__init__()
+        if radius < 1:
+            raise ValueError("Bad radius: %s" % (radius,))
+        self._radius = int(radius)
+
+
+    def apply(self,
+              frame : numpy.ndarray,
+              now   : float) -> numpy.ndarray:
+        return _box_blur(frame, self._radius)
+
+
+class Bloom(Effect):
+    """
+    Make the bright parts of the frame glow into their surroundings.
+    """
+    def __init__(self,
+                 threshold : float = 0.7,
+                 radius    : int   = 1,
+                 intensity : float = 1.0):
+        """
+        :param threshold: The level above which pixels glow.
+        :param radius:    The radius of the glow, in display pixels.
+        :param intensity: How strong the glow is.
+        """
+        super().__init__()
+        if radius < 1:
+            raise ValueError("Bad radius: %s" % (radius,))
+        self._threshold = float(threshold)
+        self._radius    = int(radius)
+        self._intensity = float(intensity)
+
+
+    def apply(self,
+              frame : numpy.ndarray,
+              now   : float) -> numpy.ndarray:
+        glow = numpy.maximum(frame - self._threshold, 0.0)
+        glow = _box_blur(glow, self._radius)
+        glow *= self._intensity
+        frame += glow
+        return numpy.minimum(frame, 1.0, out=frame)
+
+
+class Scanlines(Effect):
+    """
+    Darken every so many rows, like an old CRT.
+    """
+    def __init__(self,
+                 strength : float = 0.5,
+                 spacing  : int   = 2):
+        """
+        :param strength: How much to darken the lines by, from zero to one.
+        :param spacing:  Every how many rows to darken.
+        """
+        super().__init__()
+        if spacing < 1:
+            raise ValueError("Bad spacing: %s" % (spacing,))
+        self._level   = 1.0 - min(max(0.0, float(strength)), 1.0)
+        self._spacing = int(spacing)
+
+
+    def apply(self,
+              frame : numpy.ndarray,
+              now   : float) -> numpy.ndarray:
+        frame[:, self._spacing-1::self._spacing] *= self._level
+        return frame
+
+# ----------------------------------------------------------------------
+
+def _box_blur(frame  : numpy.ndarray,
+              radius : int) -> numpy.ndarray:
+    """
+    Box blur the X and Y axes of the given frame, extending its edges.
+
+    :return: A new, blurred, frame.
+    """
+    size = 2 * radius + 1
+    for axis in (0, 1):
+        # Pad the axis out and sum the shifted windows over it
+        pad = [(0, 0)] * frame.ndim
+        pad[axis] = (radius, radius)
+        padded = numpy.moveaxis(numpy.pad(frame, pad, mode='edge'), axis, 0)
+        length = frame.shape[axis]
+        result = padded[0:length].copy()
+        for offset in range(1, size):
+            result += padded[offset:offset + length]
+        result /= size
+        frame = numpy.moveaxis(result, 0, axis)
+    return frame
@@ -0,0 +1,92 @@
+"""
+Stand-ins for the hardware libraries which the displays use, so that the
+displays' whole frame path can be run, and timed, on a machine without the
+hardware.
+
+Each fake implements the parts of its library's API which we call and keeps
+hold of what it was given, so that it may be checked. The time which the real
+hardware would take, for example to push bytes down an SPI bus, is simulated
+by waiting. The costs are in each fake's ``COSTS`` dict, and may be scaled
+all together, or turned off, with `set_cost_scale`.
+
+To use them::
+
+    from pixelgames.canvas import fakes
+    fakes.install()
+
+after which the displays will pick them up in place of the real libraries.
+"""
+
+from   typing import Tuple
+
+import importlib
+import importlib.util
+import sys
+import time
+
+# ----------------------------------------------------------------------
+
+# The libraries which we have fakes for, and the modules which fake them
+MODULES = {
+    'rgbmatrix'    : 'pixelgames.canvas.fakes.rgbmatrix',
+    'unicornhathd' : 'pixelgames.canvas.fakes.unicornhathd',
+    'ST7789'       : 'pixelgames.canvas.fakes.st7789',
+}
+
+# What all the costs are multiplied by
+_SCALE = 1.0
+
+# ----------------------------------------------------------------------
+
+def install(names : Tuple[str] = None,
+            force : bool       = False) -> None:
+    """
+    Put the fakes in place of the real libraries.
+
+    :param names: The names of the libraries to fake, or ``None`` for all of
+                  them.
+    :param force: Whether to replace the real libraries if they are there. If
+                  not then only missing ones are faked.
+    """
+    for name in (MODULES if names is None else names):
+        if name not in MODULES:
+            raise ValueError("Bad library name: %s" % (name,))
+        if not force and name in sys.modules:
+            continue
+        if not force and importlib.util.find_spec(name) is not None:
+            continue
+        sys.modules[name] = importlib.import_module(MODULES[name])
+
+
+def uninstall() -> None:
+    """
+    Take out any fakes which were installed.
+    """
+    for (name, module) in MODULES.items():
+        if getattr(sys.modules.get(name), '__name__', None) == module:
+            del sys.modules[name]
+
+
+def set_cost_scale(scale: float) -> None:
+    """
+    Set what all the simulated costs are multiplied by. Zero turns them off,
+    which is what you want when timing only our side of things.
+
+    :param scale: The multiplier, which may not be negative.
+    """
+    global _SCALE
+    if scale < 0:
+        raise ValueError("Bad scale: %s" % (scale,))
+    _SCALE = float(scale)
+
+
+def _delay(seconds: float) -> None:
+    """
+    Simulate the hardware taking the given time. We spin, rather than sleep,
+    since the times are often too short to sleep for accurately.
+    """
+    seconds *= _SCALE
+    if seconds > 0:
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
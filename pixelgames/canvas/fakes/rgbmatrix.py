@@ -0,0 +1,140 @@
+"""
+A stand-in for the ``rgbmatrix`` library, from the Pi RGB LED Matrix software.
+
+See https://github.com/hzeller/rpi-rgb-led-matrix
+"""
+
+from   . import _delay
+
+import numpy
+import time
+
+# ----------------------------------------------------------------------
+
+# What things cost, in seconds. The matrix is refreshed by a separate thread
+# in the real library so our calls are cheap, apart from the swap, which waits
+# for the next refresh if the rate is limited.
+COSTS = {
+    'set_pixel'       : 0.5e-6, # Per call
+    'set_image_pixel' : 20e-9,  # Per pixel
+    'clear'           : 5e-6,   # Per call
+    'swap'            : 20e-6,  # Per call, on top of any wait for the refresh
+}
+
+# ----------------------------------------------------------------------
+
+class RGBMatrixOptions():
+    """
+    The matrix options which we use.
+    """
+    def __init__(self):
+        self.rows                     = 32
+        self.cols                     = 32
+        self.chain_length             = 1
+        self.parallel                 = 1
+        self.gpio_slowdown            = 1
+        self.disable_hardware_pulsing = False
+        self.limit_refresh_rate_hz    = 0
+
+
+class FrameCanvas():
+    """
+    One of the matrix's frame buffers.
+    """
+    def __init__(self,
+                 width  : int,
+                 height : int):
+        self.width  = width
+        self.height = height
+
+        # Row-major, like an image
+        self.pixels = numpy.zeros((height, width, 3), dtype=numpy.uint8)
+
+
+    def Clear(self) -> None:
+        _delay(COSTS['clear'])
+        self.pixels[:] = 0
+
+
+    def Fill(self, r: int, g: int, b: int) -> None:
+        _delay(COSTS['clear'])
+        self.pixels[:] = (r, g, b)
+
+
+    def SetPixel(self, x: int, y: int, r: int, g: int, b: int) -> None:
+        _delay(COSTS['set_pixel'])
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.pixels[y, x] = (r, g, b)
+
+
+    def SetImage(self,
+                 image,
+                 offset_x : int  = 0,
+                 offset_y : int  = 0,
+                 unsafe   : bool = True) -> None:
+        if image.mode != 'RGB':
+            raise Exception("Currently, only RGB mode is supported for SetImage()")
+        (w, h) = image.size
+        _delay(COSTS['set_image_pixel'] * w * h)
+
+        # Copy in whatever overlaps
+        pixels = numpy.asarray(image)
+        (x0, y0) = (max(0, offset_x), max(0, offset_y))
+        (x1, y1) = (min(self.width,  offset_x + w), min(self.height, offset_y + h))
+        if x0 < x1 and y0 < y1:
+            self.pixels[y0:y1, x0:x1] = pixels[y0 - offset_y:y1 - offset_y,
+                                               x0 - offset_x:x1 - offset_x]
+
+
+class RGBMatrix():
+    """
+    The matrix itself.
+    """
+    def __init__(self, options: RGBMatrixOptions = None):
+        if options is None:
+            options = RGBMatrixOptions()
+        self.options = options
+        self.width   = options.cols * options.chain_length
+        self.height  = options.rows * options.parallel
+
+        # The refresh cadence, if any, and when the last swap was
+        rate = options.limit_refresh_rate_hz
+        self._period    = 1.0 / rate if rate and rate > 0 else 0.0
+        self._last_swap = None
+
+        # The buffer which is on the matrix, and how many frames have been
+        # shown
+        self._front = FrameCanvas(self.width, self.height)
+        self.frames = 0
+
+
+    @property
+    def shown(self) -> numpy.ndarray:
+        """
+        What's on the matrix, as a row-major array of RGB values.
+        """
+        return self._front.pixels
+
+
+    def CreateFrameCanvas(self) -> FrameCanvas:
+        return FrameCanvas(self.width, self.height)
+
+
+    def SwapOnVSync(self,
+                    canvas  : FrameCanvas,
+                    divisor : int = 1) -> FrameCanvas:
+        # Wait for the next refresh, if we have a cadence
+        _delay(COSTS['swap'])
+        if self._period > 0 and self._last_swap is not None:
+            _delay(max(0.0, self._last_swap + self._period * divisor -
+                            time.perf_counter()))
+        self._last_swap = time.perf_counter()
+
+        # Show it, and give back the old one to draw the next frame in
+        (previous, self._front) = (self._front, canvas)
+        self.frames += 1
+        return previous
+
+
+    def Clear(self) -> None:
+        self._front.pixels[:] = 0
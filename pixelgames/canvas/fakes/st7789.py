@@ -0,0 +1,92 @@
+"""
+A stand-in for Pimoroni's ``ST7789`` library, for their TFT displays.
+
+See https://github.com/pimoroni/st7789-python
+"""
+
+from   . import _delay
+
+import numpy
+
+# ----------------------------------------------------------------------
+
+# The chip selects for the Breakout Garden slots
+BG_SPI_CS_BACK  = 0
+BG_SPI_CS_FRONT = 1
+
+# What things cost, in seconds. Displaying an image converts it to 16-bit
+# colour, which we really do, and sends it down the SPI bus at the display's
+# speed, in chunks.
+COSTS = {
+    'chunk' : 10e-6, # Per 4k chunk sent, on top of the transfer
+    'begin' : 0.15,  # Per call, since the real one sleeps while resetting
+}
+
+# The size of the chunks which data are sent in
+_CHUNK = 4096
+
+# ----------------------------------------------------------------------
+
+class ST7789():
+    """
+    The display.
+    """
+    def __init__(self,
+                 port,
+                 cs,
+                 dc,
+                 backlight     = None,
+                 rst           = None,
+                 width         = 240,
+                 height        = 240,
+                 rotation      = 90,
+                 invert        = True,
+                 spi_speed_hz  = 4000000,
+                 offset_left   = 0,
+                 offset_top    = 0):
+        self._width        = width
+        self._height       = height
+        self._rotation     = rotation
+        self._spi_speed_hz = spi_speed_hz
+
+        # What was last shown, as 16-bit colour, and how many frames have been
+        self.shown  = None
+        self.frames = 0
+
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+
+    def begin(self) -> None:
+        _delay(COSTS['begin'])
+
+
+    def reset(self) -> None:
+        pass
+
+
+    def set_backlight(self, value) -> None:
+        pass
+
+
+    def display(self, image) -> None:
+        # Turn it into 16-bit 565 colour, rotated, like the real thing does
+        pixels = numpy.asarray(image.convert('RGB')).astype(numpy.uint16)
+        pixels = numpy.rot90(pixels, self._rotation // 90)
+        rgb565 = (((pixels[..., 0] & 0xF8) << 8) |
+                  ((pixels[..., 1] & 0xFC) << 3) |
+                  ( pixels[..., 2]         >> 3))
+        data   = rgb565.astype('>u2').tobytes()
+
+        # And send it
+        chunks = (len(data) + _CHUNK - 1) // _CHUNK
+        _delay(chunks * COSTS['chunk'] + 8 * len(data) / self._spi_speed_hz)
+        self.shown   = rgb565
+        self.frames += 1
@@ -0,0 +1,84 @@
+"""
+A stand-in for Pimoroni's ``unicornhathd`` library.
+
+See https://github.com/pimoroni/unicorn-hat-hd
+"""
+
+from   . import _delay
+from   typing import Tuple
+
+import numpy
+
+# ----------------------------------------------------------------------
+
+# The size of the HAT
+WIDTH  = 16
+HEIGHT = 16
+
+# What things cost, in seconds. Showing pushes the whole buffer down the SPI
+# bus, at the given speed, along with a start byte.
+COSTS = {
+    'set_pixel' : 1e-6,  # Per call
+    'spi_speed' : 9e6,   # Bits per second, not a time
+    'show'      : 50e-6, # Per call, on top of the transfer
+}
+
+# ----------------------------------------------------------------------
+
+# The buffer which we draw into, indexed [x][y], and what was last shown
+_buffer     = numpy.zeros((WIDTH, HEIGHT, 3), dtype=numpy.uint8)
+shown       = numpy.zeros((WIDTH, HEIGHT, 3), dtype=numpy.uint8)
+frames      = 0
+_rotation   = 0
+_brightness = 0.5
+
+# ----------------------------------------------------------------------
+
+def get_shape() -> Tuple[int,int]:
+    return (WIDTH, HEIGHT)
+
+
+def brightness(b: float) -> None:
+    global _brightness
+    _brightness = float(b)
+
+
+def get_brightness() -> float:
+    return _brightness
+
+
+def rotation(r: int) -> None:
+    global _rotation
+    _rotation = int(r)
+
+
+def get_rotation() -> int:
+    return _rotation
+
+
+def clear() -> None:
+    _buffer[:] = 0
+
+
+def off() -> None:
+    clear()
+    show()
+
+
+def set_pixel(x: int, y: int, r: int, g: int, b: int) -> None:
+    _delay(COSTS['set_pixel'])
+    _buffer[x, y] = (int(r), int(g), int(b))
+
+
+def get_pixel(x: int, y: int) -> Tuple[int,int,int]:
+    return tuple(_buffer[x, y].tolist())
+
+
+def show() -> None:
+    global frames
+
+    # The real thing scales by the brightness and sends it all out in one go
+    data = (_buffer * _brightness).astype(numpy.uint8).tobytes()
+    _delay(COSTS['show'] + 8 * (len(data) + 1) / COSTS['spi_speed'])
+    shown[:] = _buffer
+    frames  += 1
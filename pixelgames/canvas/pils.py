@@ -6,6 +6,8 @@ from   PIL    import Image
 from   typing import Tuple
 from   .      import Display
 
+import numpy
+
 # ----------------------------------------------------------------------
 
 class _PIL(Display):
@@ -26,19 +28,12 @@ class _PIL(Display):
                        self._image.width *
                        self._image.height *
                        3)
-        self._orientation = 0
 
 
     def get_shape(self) -> Tuple[int,int]:
         return self._image.size
 
 
-    def set_orientation(self, orientation: int) -> None:
-        if orientation not in (0, 90, 180, 270):
-            raise ValueError("Bad orientation: %s" % (orientation,))
-        self._orientation = orientation
-
-
     def clear(self):
         self._image.frombytes(self._clear)
 
@@ -49,32 +44,26 @@ class _PIL(Display):
             r: float,
             g: float,
             b: float) -> None:
-        if   self._orientation ==   0:
-            dx = x
-            dy = y
-        elif self._orientation ==  90:
-            dx = y
-            dy = x
-        elif self._orientation == 180:
-            dx = self._image.width  - x
-            dy = self._image.height - y
-        elif self._orientation == 270:
-            dx = self._image.width  - y
-            dy = self._image.height - x
-        else:
-            raise ValueError("Bad orientation: %s" % (self._orientation,))
-
         # Bounds check since the call with throw otherwise
-        if 0 <= dx < self._image.width and 0 <= dy < self._image.height:
+        if 0 <= x < self._image.width and 0 <= y < self._image.height:
             # Okay to set
             self._image.putpixel(
-                (dx, dy),
+                (x, y),
                 (int(255 * min(max(r, 0.0), 1.0)),
                  int(255 * min(max(g, 0.0), 1.0)),
                  int(255 * min(max(b, 0.0), 1.0)))
             )
 
 
+    def set_frame(self, frame: numpy.ndarray) -> None:
+        # The frame is [x][y] whereas the image's bytes are row-major, so we
+        # transpose it on the way in
+        (w, h) = self._image.size
+        self._image.frombytes(
+            numpy.ascontiguousarray(frame[:w, :h].transpose(1, 0, 2)).tobytes()
+        )
+
+
     def show(self):
         # Subclasses must implement this
         raise NotImplementedError()
@@ -5,6 +5,8 @@ Pimoroni displays.
 from   typing import Tuple
 from   .      import Display
 
+import numpy
+
 # ----------------------------------------------------------------------
 
 class UnicornHatHD(Display):
@@ -20,10 +22,6 @@ class UnicornHatHD(Display):
         return self._display.get_shape()
 
 
-    def set_orientation(self, orientation: int) -> None:
-        self._display.rotation(orientation)
-
-
     def clear(self):
         self._display.clear()
 
@@ -48,5 +46,15 @@ class UnicornHatHD(Display):
             )
 
 
+    def set_frame(self, frame: numpy.ndarray) -> None:
+        # The HAT only takes pixels one at a time, but we can at least avoid
+        # the per-pixel quantisation and bounds checks
+        (w, h) = self._display.get_shape()
+        set_pixel = self._display.set_pixel
+        for (x, column) in enumerate(frame[:w, :h].tolist()):
+            for (y, (r, g, b)) in enumerate(column):
+                set_pixel(x, y, r, g, b)
+
+
     def show(self):
         self._display.show()
@@ -0,0 +1,307 @@
+"""
+Displays which wrap other displays.
+"""
+
+from   concurrent.futures import Future, ThreadPoolExecutor
+from   typing             import Dict, Tuple
+from   .                  import Calibration, Display
+
+import numpy
+import time
+
+# ----------------------------------------------------------------------
+
+class DisplayProxy(Display):
+    """
+    A display which passes everything through to another one. Subclasses
+    override whichever methods they are interested in.
+    """
+    def __init__(self, display: Display):
+        """
+        :param display: The display to wrap.
+        """
+        self._display = display
+
+
+    @property
+    def display(self) -> Display:
+        """
+        The wrapped display.
+        """
+        return self._display
+
+
+    @property
+    def calibration(self) -> Calibration:
+        return self._display.calibration
+
+
+    def set_calibration(self, calibration: Calibration) -> None:
+        self._display.set_calibration(calibration)
+
+
+    @property
+    def refresh_rate(self) -> float:
+        return self._display.refresh_rate
+
+
+    @property
+    def vsync(self) -> bool:
+        return self._display.vsync
+
+
+    def get_shape(self) -> Tuple[int,int]:
+        return self._display.get_shape()
+
+
+    def set_orientation(self, orientation: int) -> None:
+        self._display.set_orientation(orientation)
+
+
+    def clear(self) -> None:
+        self._display.clear()
+
+
+    def set(self,
+            x: int,
+            y: int,
+            r: float,
+            g: float,
+            b: float) -> None:
+        self._display.set(x, y, r, g, b)
+
+
+    def set_frame(self, frame: numpy.ndarray) -> None:
+        self._display.set_frame(frame)
+
+
+    def show(self) -> None:
+        self._display.show()
+
+
+    def quit(self) -> None:
+        self._display.quit()
+
+
+    def __getattr__(self, name):
+        # Anything else which the display has, like the curses screen. We only
+        # get here if it's not one of ours.
+        if name == '_display':
+            raise AttributeError(name)
+        return getattr(self._display, name)
+
+
+class InstrumentedDisplay(DisplayProxy):
+    """
+    A display which counts and times the calls made to another one, for
+    comparing the costs of the different backends.
+
+    The numbers are kept per frame, with each call to `show` ending one, as
+    well as in total. For each method we have the number of calls, the total
+    time spent in them and the longest single call, in seconds.
+    """
+    # The methods which we keep track of
+    METHODS = ('set', 'set_frame', 'clear', 'show')
+
+    def __init__(self, display: Display):
+        """
+        :param display: The display to wrap.
+        """
+        super().__init__(display)
+        self._frames = 0
+        self._frame  = self.__empty()
+        self._last   = self.__empty()
+        self._totals = self.__empty()
+
+
+    @property
+    def frames(self) -> int:
+        """
+        How many frames have been shown.
+        """
+        return self._frames
+
+
+    @property
+    def last_frame(self) -> Dict[str,Tuple[int,float,float]]:
+        """
+        The numbers for the last frame shown, as a dict of method name to
+        ``(count, total_time, max_time)``.
+        """
+        return self.__export(self._last)
+
+
+    @property
+    def totals(self) -> Dict[str,Tuple[int,float,float]]:
+        """
+        The numbers for all the frames so far, as a dict of method name to
+        ``(count, total_time, max_time)``.
+        """
+        return self.__export(self._totals)
+
+
+    def reset(self) -> None:
+        """
+        Forget everything so far.
+        """
+        self._frames = 0
+        self._frame  = self.__empty()
+        self._last   = self.__empty()
+        self._totals = self.__empty()
+
+
+    def clear(self) -> None:
+        start = time.perf_counter()
+        self._display.clear()
+        self.__account('clear', time.perf_counter() - start)
+
+
+    def set(self,
+            x: int,
+            y: int,
+            r: float,
+            g: float,
+            b: float) -> None:
+        start = time.perf_counter()
+        self._display.set(x, y, r, g, b)
+        self.__account('set', time.perf_counter() - start)
+
+
+    def set_frame(self, frame: numpy.ndarray) -> None:
+        start = time.perf_counter()
+        self._display.set_frame(frame)
+        self.__account('set_frame', time.perf_counter() - start)
+
+
+    def show(self) -> None:
+        start = time.perf_counter()
+        self._display.show()
+        self.__account('show', time.perf_counter() - start)
+
+        # That's the end of the frame
+        for (name, (count, total, longest)) in self._frame.items():
+            totals = self._totals[name]
+            totals[0] += count
+            totals[1] += total
+            totals[2]  = max(totals[2], longest)
+        self._frames += 1
+        (self._last, self._frame) = (self._frame, self._last)
+        for values in self._frame.values():
+            values[:] = (0, 0.0, 0.0)
+
+
+    def __account(self,
+                  name    : str,
+                  elapsed : float) -> None:
+        """
+        Add a call to the current frame.
+        """
+        values = self._frame[name]
+        values[0] += 1
+        values[1] += elapsed
+        if elapsed > values[2]:
+            values[2] = elapsed
+
+
+    def __empty(self) -> Dict[str,list]:
+        """
+        :return: A fresh set of numbers.
+        """
+        return dict((name, [0, 0.0, 0.0]) for name in self.METHODS)
+
+
+    def __export(self, numbers) -> Dict[str,Tuple[int,float,float]]:
+        """
+        :return: A copy of the given numbers, for handing out.
+        """
+        return dict((name, tuple(values)) for (name, values) in numbers.items())
+
+
+class ExecutorDisplay(DisplayProxy):
+    """
+    A display which shows frames on another one in an executor, so that the
+    caller does not have to wait while the display is busy. This is for event
+    loops, which can wait on the `pending` future instead.
+
+    Only one frame is in flight at a time. Anything which changes what is on
+    the display waits for the last `show` to finish first, so that it doesn't
+    get mixed up with the frame being shown.
+    """
+    def __init__(self,
+                 display : Display,
+                 executor          = None):
+        """
+        :param display:  The display to wrap.
+        :param executor: The ``concurrent.futures.Executor`` to show frames in.
+                         If this is ``None`` then we make one with a single
+                         thread, and shut it down when we're closed.
+        """
+        super().__init__(display)
+        self._owned    = executor is None
+        self._executor = ThreadPoolExecutor(1, 'ExecutorDisplay') \
+                             if executor is None else executor
+        self._pending  = None
+
+
+    @property
+    def pending(self) -> Future:
+        """
+        The future for the last frame being shown, or ``None`` if there isn't
+        one.
+        """
+        return self._pending
+
+
+    def wait(self) -> None:
+        """
+        Wait for the last frame to be shown, raising any error from doing so.
+        A frame which was cancelled before it started is just dropped.
+        """
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            if not pending.cancelled():
+                pending.result()
+
+
+    def clear(self) -> None:
+        self.wait()
+        self._display.clear()
+
+
+    def set(self,
+            x: int,
+            y: int,
+            r: float,
+            g: float,
+            b: float) -> None:
+        self.wait()
+        self._display.set(x, y, r, g, b)
+
+
+    def set_frame(self, frame: numpy.ndarray) -> None:
+        self.wait()
+        self._display.set_frame(frame)
+
+
+    def show(self) -> None:
+        self.wait()
+        self._pending = self._executor.submit(self._display.show)
+
+
+    def quit(self) -> None:
+        self.close()
+        self._display.quit()
+
+
+    def close(self) -> None:
+        """
+        Wait for the last frame and let go of the executor, if it is ours. The
+        display is left alone.
+        """
+        try:
+            self.wait()
+        finally:
+            if self._owned and self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
@@ -0,0 +1,335 @@
+"""
+Recording what is shown on a display to a file, and playing it back.
+
+A recording is an append-only file, written through a memory map, of a short
+header followed by one record for each frame shown. Each record has the time
+at which the frame was shown, relative to the start of the recording, and
+either the whole frame (a keyframe) or just the pixels which changed since the
+last one (a delta). There is a keyframe every so often, and whenever a delta
+would be no smaller, so that playback may start from any of them.
+"""
+
+from   typing import Iterator, Tuple
+from   .      import Display
+from   .proxy import DisplayProxy
+
+import mmap
+import numpy
+import os
+import struct
+import time
+
+# ----------------------------------------------------------------------
+
+# The file header: magic, version, width, height and keyframe interval
+_HEADER       = struct.Struct('<8sIIII')
+_MAGIC        = b'PGFRAMES'
+_VERSION      = 1
+
+# Each record's header: time, kind and payload length. A zero kind marks the
+# end, since it's what any unused space at the end of the file holds.
+_RECORD       = struct.Struct('<dBxxxI')
+_END          = 0
+_KEYFRAME     = 1
+_DELTA        = 2
+
+# A changed pixel in a delta: its index in the flattened frame, and its colour
+_CHANGE_DTYPE = numpy.dtype([('index', '<u4'), ('rgb', 'u1', (3,))])
+
+# ----------------------------------------------------------------------
+
+class RecordingDisplay(DisplayProxy):
+    """
+    A display which records every frame which is shown on another one.
+    """
+    def __init__(self,
+                 display  : Display,
+                 path     : str,
+                 keyframe : int = 60,
+                 clock          = time.perf_counter,
+                 chunk    : int = 4 * 1024 * 1024):
+        """
+        :param display:  The display to wrap.
+        :param path:     The file to record to. This is overwritten.
+        :param keyframe: How often to record a whole frame, in frames.
+        :param clock:    The clock to take the frame times from.
+        :param chunk:    How many bytes to grow the file by when it fills up.
+        """
+        if keyframe < 1:
+            raise ValueError("Bad keyframe interval: %s" % (keyframe,))
+
+        super().__init__(display)
+        (width, height) = display.get_shape()
+
+        self._keyframe = int(keyframe)
+        self._clock    = clock
+        self._chunk    = max(int(chunk),
+                             _HEADER.size + _RECORD.size + width * height * 3)
+
+        # What is on the display now, as given to it, and what we last recorded
+        self._current  = numpy.zeros((width, height, 3), dtype=numpy.uint8)
+        self._previous = None
+        self._since    = 0
+        self._frames   = 0
+        self._start    = None
+
+        # The file, which we map in chunks
+        self._file   = open(path, 'w+b')
+        self._size   = 0
+        self._map    = None
+        self._offset = 0
+        self.__write(_HEADER.pack(_MAGIC,
+                                  _VERSION,
+                                  width,
+                                  height,
+                                  self._keyframe))
+
+
+    @property
+    def frames(self) -> int:
+        """
+        How many frames have been recorded.
+        """
+        return self._frames
+
+
+    @property
+    def size(self) -> int:
+        """
+        How many bytes have been recorded.
+        """
+        return self._offset
+
+
+    def clear(self) -> None:
+        self._current[:] = 0
+        self._display.clear()
+
+
+    def set(self,
+            x: int,
+            y: int,
+            r: float,
+            g: float,
+            b: float) -> None:
+        (w, h, _) = self._current.shape
+        if 0 <= x < w and 0 <= y < h:
+            self._current[x, y] = (int(255 * min(max(r, 0.0), 1.0)),
+                                   int(255 * min(max(g, 0.0), 1.0)),
+                                   int(255 * min(max(b, 0.0), 1.0)))
+        self._display.set(x, y, r, g, b)
+
+
+    def set_frame(self, frame: numpy.ndarray) -> None:
+        (w, h, _) = self._current.shape
+        self._current[:] = frame[:w, :h]
+        self._display.set_frame(frame)
+
+
+    def show(self) -> None:
+        self._display.show()
+        if self._file is not None:
+            self.__record()
+
+
+    def quit(self) -> None:
+        self.close()
+        self._display.quit()
+
+
+    def close(self) -> None:
+        """
+        Finish the recording. The display is left alone.
+        """
+        if self._file is None:
+            return
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+        self._file.truncate(self._offset)
+        self._file.close()
+        self._file = None
+
+
+    def __record(self) -> None:
+        """
+        Record the current frame.
+        """
+        now = self._clock()
+        if self._start is None:
+            self._start = now
+        when = now - self._start
+
+        # See what changed, if we're not due a keyframe anyhow
+        current = self._current
+        payload = None
+        if self._previous is not None and self._since < self._keyframe:
+            changed = numpy.flatnonzero(
+                numpy.any(current != self._previous, axis=2)
+            )
+            if len(changed) * _CHANGE_DTYPE.itemsize < current.size:
+                changes = numpy.empty(len(changed), dtype=_CHANGE_DTYPE)
+                changes['index'] = changed
+                changes['rgb'  ] = current.reshape(-1, 3)[changed]
+                payload = changes.tobytes()
+                kind    = _DELTA
+                self._since += 1
+
+        # Else we write the whole thing
+        if payload is None:
+            payload = current.tobytes()
+            kind    = _KEYFRAME
+            self._since = 1
+
+        self.__write(_RECORD.pack(when, kind, len(payload)) + payload)
+        if self._previous is None:
+            self._previous = current.copy()
+        else:
+            self._previous[:] = current
+        self._frames += 1
+
+
+    def __write(self, data: bytes) -> None:
+        """
+        Append the given bytes to the file, growing it if need be.
+        """
+        end = self._offset + len(data)
+        if end > self._size:
+            if self._map is not None:
+                self._map.flush()
+                self._map.close()
+            self._size = max(end, self._size + self._chunk)
+            self._file.truncate(self._size)
+            self._map = mmap.mmap(self._file.fileno(), self._size)
+        self._map[self._offset:end] = data
+        self._offset = end
+
+
+class Recording():
+    """
+    A recording made by a `RecordingDisplay`, for playing back.
+    """
+    def __init__(self, path: str):
+        """
+        :param path: The file to read.
+        """
+        with open(path, 'rb') as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError("Bad recording: %s" % (path,))
+            self._map = mmap.mmap(fh.fileno(), size, access=mmap.ACCESS_READ)
+
+        (magic, version, width, height, keyframe) = \
+            _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Bad recording: %s" % (path,))
+        self._width    = width
+        self._height   = height
+        self._keyframe = keyframe
+
+        # Find where all the records are, as (time, kind, offset, length)
+        self._records = []
+        offset = _HEADER.size
+        while offset + _RECORD.size <= size:
+            (when, kind, length) = _RECORD.unpack_from(self._map, offset)
+            offset += _RECORD.size
+            if kind == _END or offset + length > size:
+                break
+            self._records.append((when, kind, offset, length))
+            offset += length
+
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+    @property
+    def shape(self) -> Tuple[int,int]:
+        """
+        The ``(width, height)`` of the recorded display.
+        """
+        return (self._width, self._height)
+
+
+    @property
+    def duration(self) -> float:
+        """
+        The time from the first frame to the last, in seconds.
+        """
+        return self._records[-1][0] if self._records else 0.0
+
+
+    def frames(self, start: int = 0) -> Iterator[Tuple[float,numpy.ndarray]]:
+        """
+        Go through the recorded frames.
+
+        :param start: The index of the frame to start from.
+
+        :return: An iterator of ``(time, frame)`` pairs, where the frame is a
+                 ``uint8`` array of shape ``(width, height, 3)``. The same
+                 array is handed back each time, so take a copy to keep it.
+        """
+        # Wind back to the keyframe before the start
+        first = start
+        while first > 0 and self._records[first][1] != _KEYFRAME:
+            first -= 1
+
+        # Each record is copied out of the file, rather than viewed in place,
+        # so that nothing holds on to the map and stops it being closed
+        frame = numpy.zeros((self._width, self._height, 3), dtype=numpy.uint8)
+        flat  = frame.reshape(-1, 3)
+        for i in range(first, len(self._records)):
+            (when, kind, offset, length) = self._records[i]
+            data = self._map[offset:offset + length]
+            if kind == _KEYFRAME:
+                frame[:] = numpy.frombuffer(data,
+                                            dtype=numpy.uint8).reshape(frame.shape)
+            else:
+                changes = numpy.frombuffer(data, dtype=_CHANGE_DTYPE)
+                flat[changes['index']] = changes['rgb']
+            if i >= start:
+                yield (when, frame)
+
+
+    def play(self,
+             display : Display,
+             speed   : float = 1.0,
+             loops   : int   = 1) -> None:
+        """
+        Show the recording on the given display.
+
+        :param display: The display to show it on. If it is a different size to
+                        the recording then the frames are cropped or padded.
+        :param speed:   How fast to play, where one is the original speed. If
+                        this is ``None`` then frames are shown as fast as
+                        possible.
+        :param loops:   How many times to play it, or ``None`` for forever.
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("Bad speed: %s" % (speed,))
+
+        (w, h) = display.get_shape()
+        out    = numpy.zeros((w, h, 3), dtype=numpy.uint8)
+        (cw, ch) = (min(w, self._width), min(h, self._height))
+
+        count = 0
+        while loops is None or count < loops:
+            count += 1
+            start = time.perf_counter()
+            for (when, frame) in self.frames():
+                if speed is not None:
+                    delay = start + when / speed - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                out[:cw, :ch] = frame[:cw, :ch]
+                display.set_frame(out)
+                display.show()
+
+
+    def close(self) -> None:
+        """
+        Let go of the file.
+        """
+        self._records = []
+        self._map.close()
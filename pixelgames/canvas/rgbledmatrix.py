@@ -2,9 +2,12 @@
 LED matrix displays.
 """
 
+from   PIL    import Image
 from   typing import Tuple
 from   .      import Display
 
+import numpy
+
 # ----------------------------------------------------------------------
 
 class RGBLEDMatrix(Display):
@@ -20,7 +23,18 @@ class RGBLEDMatrix(Display):
                  columns      =32,
                  chain_length =1,
                  gpio_slowdown=2,
-                 hw_pulsing   =False):
+                 hw_pulsing   =False,
+                 refresh_limit=None):
+        """
+        :param rows:          The number of rows in each panel.
+        :param columns:       The number of columns in each panel.
+        :param chain_length:  The number of panels chained together.
+        :param gpio_slowdown: How much to slow down the GPIO, for faster Pis.
+        :param hw_pulsing:    Whether to use hardware pulsing.
+        :param refresh_limit: The refresh rate to limit the matrix to, in Hz,
+                              if any. This also gives the matrix a fixed
+                              cadence which we can advertise.
+        """
         from rgbmatrix import RGBMatrix, RGBMatrixOptions
         options = RGBMatrixOptions()
         options.rows                     = int(rows)
@@ -28,16 +42,28 @@ class RGBLEDMatrix(Display):
         options.chain_length             = int(chain_length)
         options.gpio_slowdown            = int(gpio_slowdown)
         options.disable_hardware_pulsing = not hw_pulsing
+        if refresh_limit is not None:
+            options.limit_refresh_rate_hz = int(refresh_limit)
         self._matrix = RGBMatrix(options=options)
         self._canvas = self._matrix.CreateFrameCanvas()
 
+        # Remember this
+        self._refresh_rate = None if refresh_limit is None else int(refresh_limit)
 
-    def get_shape(self) -> Tuple[int,int]:
-        return (self._matrix.width, self._matrix.height)
 
+    @property
+    def refresh_rate(self) -> float:
+        return self._refresh_rate
 
-    def set_orientation(self, orientation: int) -> None:
-        raise NotImplementedError()
+
+    @property
+    def vsync(self) -> bool:
+        # show() swaps on the vertical sync
+        return True
+
+
+    def get_shape(self) -> Tuple[int,int]:
+        return (self._matrix.width, self._matrix.height)
 
 
     def clear(self):
@@ -62,5 +88,18 @@ class RGBLEDMatrix(Display):
             )
 
 
+    def set_frame(self, frame: numpy.ndarray) -> None:
+        # The matrix takes a PIL image in one go, which is row-major
+        self._canvas.SetImage(
+            Image.fromarray(
+                numpy.ascontiguousarray(
+                    frame[:self._matrix.width,
+                          :self._matrix.height].transpose(1, 0, 2)
+                ),
+                'RGB'
+            )
+        )
+
+
     def show(self):
         self._canvas = self._matrix.SwapOnVSync(self._canvas)
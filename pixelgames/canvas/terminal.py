@@ -5,6 +5,8 @@ A display using a terminal.
 from .      import Display
 from typing import Tuple
 
+import numpy
+
 # ----------------------------------------------------------------------
 
 class Curses(Display):
@@ -58,18 +60,34 @@ class Curses(Display):
         self._max_x = max_x
         self._max_y = max_y
 
+        # Lookup tables for turning byte values into the bits of the colour
+        # pair, for use by set_frame()
+        values = numpy.arange(256) / 255
+        self._r_bits = numpy.round(self._max_r * values).astype(numpy.int32) << 5
+        self._g_bits = numpy.round(self._max_g * values).astype(numpy.int32) << 2
+        self._b_bits = numpy.round(self._max_b * values).astype(numpy.int32)
 
-    def get_shape(self) -> Tuple[int,int]:
-        return (self._max_x, self._max_y)
+        # The colour pair of each cell which we last drew, so that we only
+        # redraw the ones which change. Zero is what a cleared screen has.
+        self._pairs = numpy.zeros((max_x, max_y), dtype=numpy.int32)
 
 
-    def set_orientation(self, orientation: int) -> None:
-        # Not supported -- yet
-        pass
+    @property
+    def curses_screen(self):
+        """
+        The curses screen which we draw on, so that the game may read keys
+        from it too.
+        """
+        return self._display
+
+
+    def get_shape(self) -> Tuple[int,int]:
+        return (self._max_x, self._max_y)
 
 
     def clear(self) -> None:
         self._display.clear()
+        self._pairs[:,:] = 0
 
 
     def quit(self) -> None:
@@ -96,12 +114,34 @@ class Curses(Display):
                      (int(round(self._max_b * b))     )) & 255)
             if pair >= self._curses.COLORS:
                 pair = self._curses.COLORS-1
+            self._pairs[x, y] = pair
             try:
                 self._display.addstr(y, x, ' ', self._curses.color_pair(pair))
             except:
                 # Swallow errors for now
                 pass
-        
+
+
+    def set_frame(self, frame: numpy.ndarray) -> None:
+        # Work out all the colour pairs in one go and only draw the cells which
+        # have actually changed, since that's where the time goes
+        frame = frame[:self._max_x, :self._max_y]
+        pairs = (self._r_bits[frame[:,:,0]] |
+                 self._g_bits[frame[:,:,1]] |
+                 self._b_bits[frame[:,:,2]])
+        numpy.minimum(pairs, self._curses.COLORS-1, out=pairs)
+        (xs, ys) = numpy.nonzero(pairs != self._pairs)
+        self._pairs = pairs
+
+        color_pair = self._curses.color_pair
+        for (x, y, pair) in zip(xs.tolist(), ys.tolist(), pairs[xs, ys].tolist()):
+            try:
+                self._display.addstr(y, x, ' ', color_pair(pair))
+            except:
+                # Swallow errors for now
+                pass
+
+
     def show(self):
         self._display.refresh()
 
@@ -115,10 +155,6 @@ class Debug(Display):
         return (32, 32)
 
 
-    def set_orientation(self, orientation: int) -> None:
-        pass
-
-
     def clear(self) -> None:
         print("/" + "-" * 80)
 
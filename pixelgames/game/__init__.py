@@ -4,34 +4,172 @@ Classes and functions for the main game functionality.
 
 # ======================================================================
 
-from   abc    import ABC, abstractmethod
-from   typing import Tuple
+from   abc         import ABC, abstractmethod
+from   collections import deque
+from   typing      import TYPE_CHECKING, Tuple
+from   .clock      import VirtualClock
+from   .idle       import Waiter
+from   .latency    import LatencyStats
+from   .pacing     import Pacer
+from   .scheduler  import Scheduler
+from   .stats      import FrameStats
+from   ..registry  import record_startup_time, timed_import
 
-import curses
+import heapq
+import inspect
 import math
-import pygame
+import os
+import random
+import statistics
+import sys
+import threading
 import time
 
+# Only running asynchronously needs this, and asyncio, which take a while to
+# import, so they are imported where they are used
+if TYPE_CHECKING:
+    from ..canvas.proxy import ExecutorDisplay
+
 # ======================================================================
 
 class Game(ABC):
     """
     The parent class for all games.
+
+    The game clock is monotonic, and the times which the game is given are in
+    seconds on it (they are not relative to the epoch).
     """
+    # Waits shorter than this are spun out rather than slept, since sleeping is
+    # not that accurate
+    _SPIN_TIME = 0.002
+
+    # The most fixed-rate updates which we will run back-to-back in order to
+    # catch up before we give up and drop the backlog
+    _MAX_CATCH_UP = 5
+
+    # How many of the most recent display refresh intervals we keep
+    _REFRESH_SAMPLES = 120
+
+    # How many frames' worth of timing statistics we keep
+    _STATS_SIZE = 1024
+
+    # How many input latencies we keep
+    _LATENCY_SIZE = 1024
+
+    # The PyGame modules which we set up, or None for all of them. Events need
+    # the display module, which is given a dummy video driver unless the
+    # environment says otherwise, and the joystick module is for input.
+    _PYGAME_MODULES = ('display', 'joystick')
+
+    # Whether to set up a curses screen for keyboard input, if we were not
+    # given one
+    _USE_CURSES = True
+
+    # How many ticks a headless game runs between checks when it is started
+    _HEADLESS_BATCH = 1000
+
+    # How far a headless game's clock moves on each tick, in seconds, if it has
+    # no update or frame rate to go by
+    _HEADLESS_TICK = 1.0 / 60.0
+
+    # The scheduler's tick, in seconds, for games with no update or frame rate
+    _SCHEDULER_INTERVAL = 0.001
+
     def __init__(self,
                  canvas,
-                 scr         = None,
-                 fps : float = math.inf) -> None:
+                 scr              = None,
+                 fps      : float = math.inf,
+                 ups      : float = None,
+                 idle     : bool  = False,
+                 headless : bool  = False,
+                 clock            = None,
+                 seed     : int   = None) -> None:
         """
         Set up the game with the given Canvas.
 
-        :param canvas: The Canvas instance.
-        :param scr:    
-        :param fps:    The max number of frames per second
+        :param canvas:   The Canvas instance.
+        :param scr:      The curses screen, if any.
+        :param fps:      The max number of frames per second to render.
+        :param ups:      The number of fixed-rate updates per second, if any.
+                         If this is ``None`` then the game is updated once per
+                         frame instead.
+        :param idle:     Whether the game only does anything when something
+                         happens. If so then, instead of running at a given
+                         rate, it is updated and drawn once each time there is
+                         input, a `wake_at` time is reached, or a
+                         `request_redraw` call is made, and sleeps in between.
+                         The ``fps`` and ``ups`` values are not used.
+        :param headless: Whether to run without curses or PyGame, as fast as
+                         possible. The game is then driven by `step`, or by
+                         `start`, and its clock is a ``VirtualClock`` unless
+                         another one is given. The game's ``_init`` is given
+                         ``None`` for PyGame, and for the screen unless one
+                         was given.
+        :param clock:    The game clock, a function giving the time in
+                         seconds. If this is ``None`` then a monotonic real
+                         time one is used, unless the game is headless.
+        :param seed:     The seed for the game's `random` number generator, for
+                         getting the same game each time.
         """
-        self._canvas = canvas
-        self._tween  = 1.0 / max(0.01, float(fps))
-        self._scr    = scr
+        if clock is None:
+            clock = VirtualClock() if headless else time.perf_counter
+
+        self._canvas   = canvas
+        self._tween    = 1.0 / max(0.01, float(fps))
+        self._step     = None if ups is None else 1.0 / max(0.01, float(ups))
+        self._scr      = scr
+        self._clock    = clock
+        self._headless = headless
+        self._random   = random.Random(seed)
+        self._pygame   = None
+        self._started  = False
+
+        # Effects should be on the same clock as us
+        canvas.set_clock(clock)
+
+        # Where we get PyGame events from, which is nowhere until it's set up
+        self.__get_events = tuple
+
+        # Idle mode state. The wakes are a heap of game clock times.
+        self._idle   = idle
+        self._waiter = None
+        self._wakes  = []
+        self._redraw = False
+
+        # What the game has scheduled, in ticks of the update interval, or the
+        # frame interval if there isn't one
+        self._scheduler = Scheduler(self._step  if self._step  is not None else
+                                    self._tween if self._tween > 0         else
+                                    self._SCHEDULER_INTERVAL)
+
+        # Any governor for trading quality for speed, and any watchdog for
+        # catching slow frames
+        self._governor = None
+        self._watchdog = None
+
+        # Any control of the garbage collector, and any tracking of where
+        # allocations come from
+        self._gc_control  = None
+        self._allocations = None
+
+        # The frame timing statistics. We accumulate the times for each frame
+        # as we go, in the order of the FrameStats fields from 'input' to
+        # 'show', and keep track of how much canvas time there has been so that
+        # we can take it out of the times of whatever called it.
+        self._stats        = FrameStats(self._STATS_SIZE)
+        self.__timing      = [0.0] * 5
+        self.__canvas_time = 0.0
+        self.__last_frame  = None
+
+        # The input latencies, and the (time, source) of the inputs which have
+        # arrived but not yet been shown
+        self._latency = LatencyStats(self._LATENCY_SIZE)
+        self._inputs  = []
+
+        # The measured intervals between frames being shown on the display
+        self._refresh_intervals = deque(maxlen=self._REFRESH_SAMPLES)
+        self._last_shown        = None
+        canvas.add_show_listener(self.__shown)
 
         # State
         self._keys_pressed = set()
@@ -44,12 +182,123 @@ class Game(ABC):
         try:
             # Set up and run
             self.__init_main()
-            self.__run()
+            if self._headless:
+                while not self.step(self._HEADLESS_BATCH):
+                    pass
+            else:
+                self.__run()
         finally:
             # And we're done
             self.__quit_main()
 
 
+    async def start_async(self, executor = None) -> None:
+        """
+        Start the game on the running asyncio event loop, for games which need
+        to do other things alongside, like network I/O. This returns once the
+        game is done.
+
+        Updates and frames are scheduled with the loop's ``call_at``, and the
+        display is shown in the given executor, so that the loop is free to
+        run other tasks while we wait for either. The game's ``_update`` may be
+        a coroutine function, in which case it is awaited; anything which might
+        take a while should be run as a task of its own, rather than awaited
+        there, since the frames wait for it.
+
+        While the game runs the canvas's display is wrapped in an
+        ``ExecutorDisplay``, so the canvas's show timings are only for handing
+        the frame over. Idle games may not be run this way.
+
+        :param executor: The ``concurrent.futures.Executor`` to show frames in.
+                         If this is ``None`` then one with a single thread is
+                         used.
+        """
+        if self._idle:
+            raise ValueError("Idle games may not be run asynchronously")
+        from ..canvas.proxy import ExecutorDisplay
+
+        # Show frames off the loop
+        canvas  = self._canvas
+        display = canvas.display
+        proxy   = ExecutorDisplay(display, executor)
+        canvas.set_display(proxy)
+        try:
+            # Set up and run
+            self.__init_main()
+            self.__start_watchdog()
+            if self._headless:
+                await self.__run_async_headless(proxy)
+            else:
+                await self.__run_async_paced(proxy)
+        finally:
+            # And we're done, once the last frame has gone out
+            try:
+                proxy.close()
+            finally:
+                canvas.set_display(display)
+                self.__quit_main()
+
+
+    def step(self,
+             count  : int  = 1,
+             render : bool = True) -> bool:
+        """
+        Run the given number of ticks of a headless game, as fast as possible.
+        Each tick is one update followed by, optionally, one frame, after which
+        the clock is moved on by the update interval, or the frame interval if
+        the game has no fixed update rate, or a 60th of a second if it has
+        neither. The game is set up on the first call, and should be shut down
+        with `quit` once done with.
+
+        :param count:  How many ticks to run.
+        :param render: Whether to draw a frame for each tick.
+
+        :return: Whether the game is done.
+        """
+        if not self._headless:
+            raise ValueError("Only headless games may be stepped")
+        if not self._started:
+            self.__init_main()
+
+        clock   = self._clock
+        advance = getattr(clock, 'advance', None)
+        tick    = self.__headless_tick()
+        for i in range(count):
+            now = clock()
+            if self.__timed(1, self.__update, now, self.__poll()):
+                # We're done
+                return True
+            if render:
+                self.__timed(2, self._render, now, 1.0)
+            self.__end_frame(now, None)
+            if advance is not None:
+                advance(tick)
+        return False
+
+
+    def render(self) -> None:
+        """
+        Draw a frame of a headless game as it is now, without updating it or
+        moving the clock on, so that there's something to look at before the
+        first `step`. The game is set up first if it hasn't been already. Games
+        which only draw as part of `_update` draw nothing here.
+        """
+        if not self._headless:
+            raise ValueError("Only headless games may be rendered directly")
+        if not self._started:
+            self.__init_main()
+        self._render(self._clock(), 1.0)
+
+
+    def quit(self) -> None:
+        """
+        Shut down a game which was run with `step`. Games run with `start` do
+        this themselves.
+        """
+        if self._started:
+            self.__quit_main()
+
+
     @property
     def canvas(self):
         """
@@ -57,11 +306,205 @@ class Game(ABC):
         """
         return self._canvas
 
+
+    @property
+    def score(self) -> float:
+        """
+        The game's score so far. Games which keep score should override this;
+        it is what bots are rewarded by.
+        """
+        return 0
+
+
+    def act(self, action: int) -> None:
+        """
+        Take an action, as a bot would, which applies to the updates from now
+        on. What the actions mean is up to the game; by default they are
+        ignored.
+
+        :param action: The action to take.
+        """
+        pass
+
+
+    @property
+    def clock(self):
+        """
+        The game clock, a function giving the time in seconds.
+        """
+        return self._clock
+
+
+    @property
+    def random(self) -> random.Random:
+        """
+        The game's random number generator. Games should use this, rather than
+        the ``random`` module, so that seeded games play out the same way each
+        time.
+        """
+        return self._random
+
+
+    @property
+    def scheduler(self) -> Scheduler:
+        """
+        The game's scheduler, for things which should happen every so many
+        ticks, or after so many. Everything which is due is called just before
+        each `_update`, with the same time. Idle games wake up for it.
+        """
+        return self._scheduler
+
+
+    def set_governor(self, governor) -> None:
+        """
+        Set the governor which watches the frame times and trades quality for
+        speed if need be.
+
+        :param governor: The ``pixelgames.game.governor.Governor`` to use, or
+                         ``None`` for none.
+        """
+        if governor is self._governor:
+            return
+        if governor is not None:
+            governor.attach(self._canvas, self._tween)
+        if self._governor is not None:
+            self._governor.detach()
+        self._governor = governor
+
+
+    def set_watchdog(self, watchdog) -> None:
+        """
+        Set the watchdog which samples what the game is doing during each frame
+        and logs the frames which take too long.
+
+        :param watchdog: The ``pixelgames.game.watchdog.Watchdog`` to use, or
+                         ``None`` for none.
+        """
+        if self._watchdog is not None:
+            self._watchdog.close()
+        self._watchdog = watchdog
+        if watchdog is not None:
+            watchdog.attach(self._tween)
+
+
+    def set_gc_control(self, control) -> None:
+        """
+        Set what takes over the garbage collector, so that it runs between
+        frames instead of during them. This should be called before the game
+        is started.
+
+        :param control: The ``pixelgames.game.memory.GCControl`` to use, or
+                        ``None`` for none.
+        """
+        if self._gc_control is not None:
+            self._gc_control.detach()
+        self._gc_control = control
+
+
+    def set_allocation_tracker(self, tracker) -> None:
+        """
+        Set what tracks where memory is allocated from during each frame. This
+        should be called before the game is started.
+
+        :param tracker: The ``pixelgames.game.memory.AllocationTracker`` to
+                        use, or ``None`` for none.
+        """
+        if self._allocations is not None:
+            self._allocations.stop()
+        self._allocations = tracker
+
+
+    def request_redraw(self) -> None:
+        """
+        Ask for the game to be updated and drawn as soon as possible, when it
+        is idle. This may be called from any thread.
+        """
+        self._redraw = True
+        waiter = self._waiter
+        if waiter is not None:
+            waiter.wake()
+
+
+    def wake_at(self, when: float) -> None:
+        """
+        Ask for the game to be updated and drawn at the given time, when it is
+        idle. This should be called from the game's own thread; use
+        `request_redraw` from others.
+
+        :param when: The game clock time at which to wake.
+        """
+        heapq.heappush(self._wakes, when)
+
+
+    @property
+    def stats(self) -> FrameStats:
+        """
+        The per-frame timing statistics.
+        """
+        return self._stats
+
+
+    @property
+    def latency(self) -> LatencyStats:
+        """
+        The input-to-display latency statistics.
+        """
+        return self._latency
+
+
+    def track_input(self, source) -> None:
+        """
+        Measure how long the input from the given source takes to show up on
+        the display.
+
+        :param source: The ``pixelgames.inputs.InputSource`` to track.
+        """
+        source.set_input_clock(self._clock)
+        source.add_input_listener(self.input_arrived)
+
+
+    def input_arrived(self,
+                      when   : float,
+                      source        = None) -> None:
+        """
+        Say that input arrived at the given time. The next frame shown on the
+        display is taken to be the first one which reflects it, and the time
+        until then is recorded as its latency. Tracked input sources call this
+        themselves.
+
+        :param when:   The game clock time at which the input arrived.
+        :param source: Where the input came from, if known.
+        """
+        self._inputs.append(
+            (when, 'unknown' if source is None else type(source).__name__)
+        )
+
+
+    @property
+    def refresh_intervals(self) -> Tuple[float]:
+        """
+        The most recent measured intervals between frames being shown on the
+        display, in seconds, oldest first.
+        """
+        return tuple(self._refresh_intervals)
+
+
+    @property
+    def refresh_rate(self) -> float:
+        """
+        The measured rate at which frames are being shown on the display, in
+        frames per second, or ``None`` if we don't know yet.
+        """
+        if not self._refresh_intervals:
+            return None
+        interval = statistics.median(self._refresh_intervals)
+        return 1.0 / interval if interval > 0 else None
+
     # ----------------------------------------------------------------------
 
     @abstractmethod
     def _init(self,
-              game : pygame,
+              game,
               scr) -> None:
         """
         Set up.
@@ -78,10 +521,36 @@ class Game(ABC):
         """
         Another iteration.
 
-        :param now   : The current time, in seconds since epoch.
+        If the game has a fixed update rate then this is called at exactly that
+        rate, as far as the game clock is concerned, with ``now`` being when
+        the update was due.
+
+        :param now   : The game clock time, in seconds.
         :param events: PyGame events since the last update.
 
-        :return: Whether the game is done
+        :return: Whether the game is done. Games run with `start_async` may
+                 make this a coroutine, and so return an awaitable of it.
+        """
+        pass
+
+
+    def _render(self,
+                now:   float,
+                alpha: float) -> None:
+        """
+        Draw a frame. This is called at up to the frame rate, after any updates
+        which were due. By default it does nothing, for games which draw as
+        part of `_update`.
+
+        When the game has a fixed update rate, the frame will usually fall
+        somewhere between two updates. The ``alpha`` value says how far it is
+        from the last one towards the next, so that things may be drawn at
+        interpolated positions for smooth motion.
+
+        :param now:   The game clock time, in seconds.
+        :param alpha: How far between the last update and the next one we are,
+                      from ``0.0`` up to ``1.0``. This is always ``1.0`` if the
+                      game is updated once per frame.
         """
         pass
 
@@ -99,16 +568,55 @@ class Game(ABC):
         """
         Set everything up.
         """
-        if self._scr is None:
+        self._started = True
+
+        # Headless games have nothing to set up
+        if self._headless:
+            self._init(None, self._scr)
+            self.__after_init()
+            return
+
+        # Only set up what we need, since it all takes time on a small Pi
+        if self._scr is None and self._USE_CURSES:
+            curses = timed_import('curses')
+            start  = time.perf_counter()
             self._scr = curses.initscr()
-        pygame.init()
+            record_startup_time('curses.initscr', time.perf_counter() - start)
+
+        self._pygame = pygame = timed_import('pygame')
+        start = time.perf_counter()
+        if self._PYGAME_MODULES is None:
+            pygame.init()
+        else:
+            if 'display' in self._PYGAME_MODULES:
+                os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            for name in self._PYGAME_MODULES:
+                getattr(pygame, name).init()
+        record_startup_time('pygame.init', time.perf_counter() - start)
+        if pygame.display.get_init():
+            self.__get_events = pygame.event.get
+
         self._init(pygame, self._scr)
+        self.__after_init()
+
+
+    def __after_init(self) -> None:
+        """
+        Called once the game has set itself up.
+        """
+        # Everything which the game has set up is now here to stay
+        if self._gc_control is not None:
+            self._gc_control.attach()
+        if self._allocations is not None:
+            self._allocations.start()
 
  
     def __quit_main(self) -> None:
         """
         Shut down the game.
         """
+        self._started = False
+
         try:
             self._quit()
         except:
@@ -120,37 +628,447 @@ class Game(ABC):
             pass
 
         try:
-            pygame.quit()
+            if self._governor is not None:
+                self._governor.detach()
+        except:
+            pass
+
+        try:
+            self._stats.close()
+        except:
+            pass
+
+        try:
+            if self._watchdog is not None:
+                self._watchdog.close()
+        except:
+            pass
+
+        try:
+            if self._allocations is not None:
+                self._allocations.log_report()
+                self._allocations.stop()
+        except:
+            pass
+
+        try:
+            if self._gc_control is not None:
+                self._gc_control.detach()
+        except:
+            pass
+
+        try:
+            if self._waiter is not None:
+                self._waiter.close()
+                self._waiter = None
+        except:
+            pass
+
+        try:
+            if self._pygame is not None:
+                self._pygame.quit()
         except:
             pass
 
         try:
-            curses.endwin()
+            if self._scr is not None:
+                import curses
+                curses.endwin()
         except:
             pass
         
 
 
+    def __start_watchdog(self) -> None:
+        """
+        Have any watchdog start watching this thread.
+        """
+        if self._watchdog is not None:
+            self._watchdog.start(threading.get_ident())
+            self._watchdog.busy()
+
+
     def __run(self) -> None:
         """
         Set the game running.
         """
-        # State
-        last_time = 0
-        events    = []
+        self.__start_watchdog()
+        if self._idle:
+            self.__run_idle()
+        else:
+            self.__run_paced()
 
-        # Update forever (ish)!
+
+    def __run_idle(self) -> None:
+        """
+        Run the game only when something happens.
+        """
+        # What we wait on. We watch the terminal if we have one, since that's
+        # where key presses come from.
+        if self._scr is None:
+            (stdin, flush) = (None, None)
+        else:
+            import curses
+            (stdin, flush) = (sys.stdin.fileno(), curses.flushinp)
+        self._waiter = Waiter(pygame=self._pygame, stdin=stdin, flush=flush)
+
+        clock   = self._clock
+        wakes   = self._wakes
+        pending = ()
         while True:
-            # Don't update too fast
-            since = time.time() - last_time
-            if since < self._tween:
-                time.sleep(max(0, self._tween - since))
-                continue
-
-            # Update the game
-            if self._update(time.time(), tuple(pygame.event.get())):
+            # Any wakes which are now due are handled by this update
+            now = clock()
+            while wakes and wakes[0] <= now:
+                heapq.heappop(wakes)
+            self._redraw = False
+
+            # Update and draw. There's no deadline here.
+            if self.__timed(1, self.__update, now, pending + self.__poll()):
                 # We're done
-                break
+                return
+            self.__timed(2, self._render, now, 1.0)
+            self.__end_frame(now, None)
+
+            # Wait for something to happen, unless it already has
+            if self._redraw:
+                pending = ()
+            else:
+                wake = wakes[0] if wakes else math.inf
+                due  = self._scheduler.next_time
+                if due is not None and due < wake:
+                    wake = due
+                self.__before_wait(wake)
+                timeout = None if wake == math.inf else max(0.0, wake - clock())
+                pending = self._waiter.wait(timeout)
+                self.__after_wait()
+
+
+    def __run_paced(self) -> None:
+        """
+        Run the game at its given rates.
+        """
+        clock = self._clock
+        now   = clock()
+        pacer = Pacer(now, self._step, self._tween, self._canvas.display,
+                      self._MAX_CATCH_UP)
 
-            # We iterated
-            last_time = time.time()
+        # Update forever (ish)!
+        while True:
+            # Run any fixed-rate updates which are due. Any events go to the
+            # first one.
+            updates = pacer.updates(now)
+            if updates:
+                events = self.__poll()
+                for when in updates:
+                    if self.__timed(1, self.__update, when, events):
+                        # We're done
+                        return
+                    events = ()
+
+            # And draw a frame, if one is due
+            if pacer.frame_due(now):
+                # Without a fixed rate we update once per frame
+                if self._step is None:
+                    if self.__timed(1, self.__update, now, self.__poll()):
+                        # We're done
+                        return
+                self.__timed(2, self._render, now, pacer.alpha(now))
+
+                # On to the next one, as often as the governor wants us to
+                # draw, and account for the frame. It was due by the time the
+                # next one is.
+                self.__end_frame(now, pacer.frame_drawn(now, self.__divisor()))
+
+            # Wait until whatever is due next
+            deadline = pacer.deadline
+            self.__before_wait(deadline)
+            self._wait_until(deadline)
+            self.__after_wait()
+            now = clock()
+
+
+    def __divisor(self) -> int:
+        """
+        How many frame intervals the governor wants between frames.
+        """
+        if self._governor is None:
+            return 1
+        else:
+            return self._governor.render_divisor
+
+
+    def __headless_tick(self) -> float:
+        """
+        How far to move the clock on for each tick of a headless game.
+        """
+        if self._step is not None:
+            return self._step
+        elif self._tween > 0:
+            return self._tween
+        else:
+            return self._HEADLESS_TICK
+
+
+    async def __run_async_headless(self, display: 'ExecutorDisplay') -> None:
+        """
+        Run a headless game as fast as possible, as `step` does, letting the
+        event loop in between batches of ticks.
+        """
+        import asyncio
+        clock   = self._clock
+        advance = getattr(clock, 'advance', None)
+        tick    = self.__headless_tick()
+        while True:
+            for i in range(self._HEADLESS_BATCH):
+                await self.__shown_async(display)
+                now = clock()
+                if await self.__timed_async(1, self.__update, now, self.__poll()):
+                    # We're done
+                    return
+                await self.__timed_async(2, self._render, now, 1.0)
+                self.__end_frame(now, None)
+                if advance is not None:
+                    advance(tick)
+            await asyncio.sleep(0)
+
+
+    async def __run_async_paced(self, display: 'ExecutorDisplay') -> None:
+        """
+        Run the game at its given rates, as `__run_paced` does, but on the
+        event loop.
+        """
+        import asyncio
+        loop  = asyncio.get_running_loop()
+        clock = self._clock
+        pacer = Pacer(clock(), self._step, self._tween, display,
+                      self._MAX_CATCH_UP)
+
+        while True:
+            # Anything which we do may draw, so let the display finish with the
+            # last frame first
+            await self.__shown_async(display)
+            now = clock()
+
+            # Run any fixed-rate updates which are due
+            updates = pacer.updates(now)
+            if updates:
+                events = self.__poll()
+                for when in updates:
+                    if await self.__timed_async(1, self.__update, when, events):
+                        # We're done
+                        return
+                    events = ()
+
+            # And draw a frame, if one is due
+            if pacer.frame_due(now):
+                if self._step is None:
+                    if await self.__timed_async(1, self.__update, now, self.__poll()):
+                        # We're done
+                        return
+                await self.__timed_async(2, self._render, now, pacer.alpha(now))
+                self.__end_frame(now, pacer.frame_drawn(now, self.__divisor()))
+
+            # Wait until whatever is due next, letting everything else run
+            deadline = pacer.deadline
+            self.__before_wait(deadline)
+            await self.__sleep_until(loop, deadline)
+            self.__after_wait()
+
+
+    async def __timed_async(self, index: int, method, *args):
+        """
+        As `__timed`, but awaiting the result if it is awaitable.
+        """
+        canvas_time = self.__canvas_time
+        start       = time.perf_counter()
+        result      = method(*args)
+        if inspect.isawaitable(result):
+            result = await result
+        self.__timing[index] += (time.perf_counter() - start -
+                                 (self.__canvas_time - canvas_time))
+        return result
+
+
+    async def __shown_async(self, display: 'ExecutorDisplay') -> None:
+        """
+        Wait for the display to finish showing the last frame, if it hasn't,
+        adding the time to the show timing.
+        """
+        import asyncio
+        pending = display.pending
+        if pending is not None and not pending.done():
+            start = time.perf_counter()
+            await asyncio.wrap_future(pending)
+            self.__timing[4] += time.perf_counter() - start
+        display.wait()
+
+
+    async def __sleep_until(self,
+                            loop,
+                            deadline : float) -> None:
+        """
+        Wait on the event loop until the given game clock time. We always let
+        the loop run, even if the time has already passed.
+
+        :param loop:     The running event loop.
+        :param deadline: The time to wait until.
+        """
+        import asyncio
+        remaining = deadline - self._clock()
+        if remaining <= 0:
+            await asyncio.sleep(0)
+            return
+
+        # The loop has its own clock, so we go by how long there is to go
+        future = loop.create_future()
+        handle = loop.call_at(loop.time() + remaining,
+                              _set_result, future, None)
+        try:
+            await future
+        finally:
+            handle.cancel()
+
+
+    def __update(self,
+                 now    : float,
+                 events : Tuple[object]):
+        """
+        Run whatever is scheduled and then update the game.
+        """
+        self._scheduler.run(now)
+        return self._update(now, events)
+
+
+    def __poll(self) -> Tuple[object]:
+        """
+        Get the PyGame events, timing how long that takes.
+        """
+        start  = time.perf_counter()
+        events = tuple(self.__get_events())
+        self.__timing[0] += time.perf_counter() - start
+        return events
+
+
+    def __timed(self, index: int, method, *args):
+        """
+        Call the given method, adding how long it took to the given timing, not
+        counting any time which the canvas spent showing a frame.
+        """
+        canvas_time = self.__canvas_time
+        start       = time.perf_counter()
+        result      = method(*args)
+        self.__timing[index] += (time.perf_counter() - start -
+                                 (self.__canvas_time - canvas_time))
+        return result
+
+
+    def __end_frame(self,
+                    start    : float,
+                    deadline : float) -> None:
+        """
+        Account for a frame which has just finished.
+
+        :param start:    The game clock time at which the frame started.
+        :param deadline: The game clock time by which the frame should have
+                         finished, if any.
+        """
+        timing = self.__timing
+        total  = sum(timing)
+        late   = 0.0 if deadline is None else self._clock() - deadline
+        since  = 0.0 if self.__last_frame is None else start - self.__last_frame
+        values = (since,
+                  timing[0],
+                  timing[1],
+                  timing[2],
+                  timing[3],
+                  timing[4],
+                  total,
+                  late)
+        self._stats.record(start, values)
+        self.__last_frame = start
+        timing[:] = (0.0, 0.0, 0.0, 0.0, 0.0)
+
+        # Let the watchdog see whether it was slow
+        if self._watchdog is not None:
+            self._watchdog.frame(start, values)
+
+        # And account for what memory it used
+        if self._gc_control is not None:
+            self._gc_control.frame()
+        if self._allocations is not None:
+            self._allocations.frame()
+
+        # Let the governor know how long that all took
+        if self._governor is not None:
+            self._governor.frame(start, total)
+
+
+    def __before_wait(self, deadline: float) -> None:
+        """
+        Called before we wait, making use of the time if we can.
+
+        :param deadline: The game clock time which we will wait until, which
+                         may be infinite.
+        """
+        if self._watchdog is not None:
+            self._watchdog.idle()
+        if self._gc_control is not None:
+            self._gc_control.slack(deadline - self._clock())
+
+
+    def __after_wait(self) -> None:
+        """
+        Called after we have waited.
+        """
+        if self._watchdog is not None:
+            self._watchdog.busy()
+
+
+    def __shown(self) -> None:
+        """
+        Called when the canvas has shown a frame.
+        """
+        now = self._clock()
+        if self._last_shown is not None:
+            self._refresh_intervals.append(now - self._last_shown)
+        self._last_shown = now
+
+        # Any input so far is reflected in what's just been shown
+        if self._inputs:
+            for (when, source) in self._inputs:
+                self._latency.record(source, now - when)
+            self._inputs.clear()
+
+        # Account for the time it took
+        (raster, show) = self._canvas.timings
+        self.__timing[3]   += raster
+        self.__timing[4]   += show
+        self.__canvas_time += raster + show
+
+
+    def _wait_until(self, deadline: float) -> None:
+        """
+        Wait until the given game clock time. We sleep for most of the wait and
+        then spin for the last little bit, to hit the deadline accurately.
+
+        :param deadline: The time to wait until.
+        """
+        clock = self._clock
+        while True:
+            remaining = deadline - clock()
+            if remaining <= 0:
+                return
+            elif remaining > self._SPIN_TIME:
+                time.sleep(remaining - self._SPIN_TIME)
+            else:
+                time.sleep(0)
+
+# ======================================================================
+
+def _set_result(future, result) -> None:
+    """
+    Complete the given future, unless it already was, such as by being
+    cancelled.
+    """
+    if not future.done():
+        future.set_result(result)
@@ -0,0 +1,53 @@
+"""
+Clocks for the game to run against.
+"""
+
+# ----------------------------------------------------------------------
+
+class VirtualClock():
+    """
+    A clock which only moves when it is told to, for running games faster than
+    real time and getting the same results each time.
+
+    Calling it gives the current time, like ``time.perf_counter``.
+    """
+    def __init__(self, start: float = 0.0):
+        """
+        :param start: The time to start at, in seconds.
+        """
+        self._now = float(start)
+
+
+    def __call__(self) -> float:
+        return self._now
+
+
+    @property
+    def now(self) -> float:
+        """
+        The current time, in seconds.
+        """
+        return self._now
+
+
+    def advance(self, seconds: float) -> None:
+        """
+        Move the clock on.
+
+        :param seconds: How far to move it, which may not be negative.
+        """
+        if seconds < 0:
+            raise ValueError("Bad seconds: %s" % (seconds,))
+        self._now += seconds
+
+
+    def set(self, now: float) -> None:
+        """
+        Move the clock to the given time.
+
+        :param now: The time to move to, which may not be before the current
+                    one.
+        """
+        if now < self._now:
+            raise ValueError("Bad time: %s < %s" % (now, self._now))
+        self._now = float(now)
@@ -0,0 +1,220 @@
+"""
+Pixel-perfect collision tests between sprites.
+"""
+
+from   PIL    import Image
+from   typing import List, Tuple
+
+import numpy
+
+# ----------------------------------------------------------------------
+
+class CollisionMask():
+    """
+    Which pixels of a sprite are solid, for testing whether it touches
+    another.
+
+    The mask is kept as a bitset per row, with bit ``x`` of row ``y`` being
+    pixel ``(x, y)``, so that two rows can be tested against each other with a
+    shift and a bitwise AND, whatever their widths. Before that we check
+    whether the bounding boxes of the solid pixels overlap at all, which is
+    usually enough to say that they don't.
+
+    Sprites drawn at fractional positions are tested at the nearest whole
+    pixel, and ones drawn scaled should use a mask from `scaled`.
+    """
+    def __init__(self, bitmap):
+        """
+        :param bitmap: The ``(width, height)`` array of whether each pixel is
+                       solid, indexed as ``bitmap[x][y]``.
+        """
+        bitmap = numpy.asarray(bitmap, dtype=numpy.bool_)
+        if bitmap.ndim != 2:
+            raise ValueError("Bad bitmap shape: %s" % (bitmap.shape,))
+        (self._width, self._height) = bitmap.shape
+        self._bitmap = bitmap
+        self._scaled = dict()
+
+        # Each row, as an int, by packing the bits little-endian so that the
+        # first byte holds x from 0 to 7
+        packed = numpy.packbits(bitmap.T, axis=1, bitorder='little')
+        self._rows = tuple(int.from_bytes(row.tobytes(), 'little')
+                           for row in packed)
+
+        # The bounds of the solid pixels, as (left, top, right, bottom), with
+        # the right and bottom being exclusive
+        xs = numpy.flatnonzero(bitmap.any(axis=1))
+        ys = numpy.flatnonzero(bitmap.any(axis=0))
+        if len(xs):
+            self._bounds = (int(xs[0]),      int(ys[0]),
+                            int(xs[-1]) + 1, int(ys[-1]) + 1)
+        else:
+            self._bounds = None
+        self._count = int(bitmap.sum())
+
+
+    @classmethod
+    def from_image(cls,
+                   image     : Image,
+                   threshold : float = 0.5) -> 'CollisionMask':
+        """
+        Make a mask from a sprite image. Pixels are solid if their alpha, or
+        their brightness if the image has no alpha, is over the threshold.
+
+        :param image:     The image.
+        :param threshold: The level over which a pixel is solid, ``[0,1]``.
+        """
+        if 'A' in image.getbands():
+            levels = image.getchannel('A')
+        else:
+            levels = image.convert('L')
+        return cls(numpy.asarray(levels).T > threshold * 255)
+
+
+    @property
+    def width(self) -> int:
+        """
+        The width of the mask.
+        """
+        return self._width
+
+
+    @property
+    def height(self) -> int:
+        """
+        The height of the mask.
+        """
+        return self._height
+
+
+    @property
+    def bounds(self) -> Tuple[int,int,int,int]:
+        """
+        The bounding box of the solid pixels, as ``(left, top, right,
+        bottom)`` with the right and bottom being exclusive, or ``None`` if
+        there aren't any.
+        """
+        return self._bounds
+
+
+    @property
+    def count(self) -> int:
+        """
+        How many pixels are solid.
+        """
+        return self._count
+
+
+    def scaled(self, scale: float) -> 'CollisionMask':
+        """
+        Get the mask for the sprite drawn at the given scale, where each of its
+        pixels is ``scale`` pixels across. These are kept, so asking for the
+        same scale again costs nothing.
+
+        :param scale: The scale, as given to ``Canvas.set``.
+        """
+        if scale <= 0:
+            raise ValueError("Bad scale: %s" % (scale,))
+        if scale == 1:
+            return self
+        result = self._scaled.get(scale)
+        if result is None:
+            # Nearest neighbour, sampling at the middle of each new pixel
+            width  = max(1, int(round(self._width  * scale)))
+            height = max(1, int(round(self._height * scale)))
+            xs = numpy.minimum(((numpy.arange(width)  + 0.5) / scale).astype(int),
+                               self._width  - 1)
+            ys = numpy.minimum(((numpy.arange(height) + 0.5) / scale).astype(int),
+                               self._height - 1)
+            result = CollisionMask(self._bitmap[numpy.ix_(xs, ys)])
+            self._scaled[scale] = result
+        return result
+
+
+    def overlaps(self,
+                 x       : float,
+                 y       : float,
+                 other   : 'CollisionMask',
+                 other_x : float,
+                 other_y : float) -> bool:
+        """
+        Whether any solid pixels of this mask and another one are in the same
+        place. Each origin is rounded to the nearest pixel before they are
+        compared, just as `collisions` does, so that the two always agree.
+
+        :param x:       Where our origin is, in x.
+        :param y:       Where our origin is, in y.
+        :param other:   The other mask.
+        :param other_x: Where the other mask's origin is, in x.
+        :param other_y: Where the other mask's origin is, in y.
+        """
+        # Where the solid pixels of both are, in our coordinates. If their
+        # bounding boxes don't overlap then that's all we need to know.
+        a = self._bounds
+        b = other._bounds
+        if a is None or b is None:
+            return False
+        dx = int(round(other_x)) - int(round(x))
+        dy = int(round(other_y)) - int(round(y))
+        if (b[0] + dx >= a[2] or a[0] >= b[2] + dx or
+            b[1] + dy >= a[3] or a[1] >= b[3] + dy):
+            return False
+
+        # Now check each row which they share
+        ours   = self ._rows
+        theirs = other._rows
+        for y in range(max(a[1], b[1] + dy), min(a[3], b[3] + dy)):
+            row = theirs[y - dy]
+            if dx >= 0:
+                row <<= dx
+            else:
+                row >>= -dx
+            if ours[y] & row:
+                return True
+        return False
+
+# ----------------------------------------------------------------------
+
+def collisions(masks     : List[CollisionMask],
+               positions) -> List[Tuple[int,int]]:
+    """
+    Find which of a number of sprites are touching each other.
+
+    The bounding boxes are all checked against each other at once, and only
+    the sprites whose boxes overlap have their masks tested.
+
+    :param masks:     The mask of each sprite.
+    :param positions: The ``(x, y)`` of each sprite's origin, which are
+                      rounded to the nearest pixel.
+
+    :return: The ``(i, j)`` indices of each pair which touch, with ``i < j``.
+    """
+    count = len(masks)
+    if count < 2:
+        return []
+
+    # The bounding box of each, where it is
+    positions = numpy.round(numpy.asarray(positions, dtype=numpy.float64))
+    boxes     = numpy.array([mask.bounds or (0, 0, 0, 0) for mask in masks],
+                            dtype=numpy.float64)
+    boxes[:, 0:2] += positions
+    boxes[:, 2:4] += positions
+
+    # Which of those overlap, each pair once. Empty ones are zero sized and so
+    # never overlap anything.
+    (left, top, right, bottom) = boxes.T
+    close = ((left  [:, numpy.newaxis] < right [numpy.newaxis, :]) &
+             (left  [numpy.newaxis, :] < right [:, numpy.newaxis]) &
+             (top   [:, numpy.newaxis] < bottom[numpy.newaxis, :]) &
+             (top   [numpy.newaxis, :] < bottom[:, numpy.newaxis]))
+    close = numpy.triu(close, 1)
+
+    # And test those properly
+    result = []
+    for (i, j) in zip(*numpy.nonzero(close)):
+        (i, j) = (int(i), int(j))
+        if masks[i].overlaps(positions[i, 0], positions[i, 1],
+                             masks[j],
+                             positions[j, 0], positions[j, 1]):
+            result.append((i, j))
+    return result
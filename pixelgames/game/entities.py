@@ -0,0 +1,406 @@
+"""
+Keeping lots of game entities in arrays, so that they can be moved, searched
+and drawn all at once.
+"""
+
+from   typing import Tuple
+
+import numpy
+
+# ----------------------------------------------------------------------
+
+class Entities():
+    """
+    A store of entities, each with a position, a velocity, a colour and a
+    size, kept as columns of NumPy arrays rather than as an object each.
+
+    Each entity is known by its index, which stays the same for as long as it
+    is alive. The indices of removed entities are reused by later ones. The
+    arrays cover every index which has been used, dead or alive, so use
+    `alive` or `indices` to pick out the live ones; dead entities are not
+    moved or drawn.
+    """
+    def __init__(self, capacity: int = 16):
+        """
+        :param capacity: How many entities to make room for up front. The
+                         store grows as needed.
+        """
+        capacity = max(1, int(capacity))
+        self._positions  = numpy.zeros((capacity, 2), dtype=numpy.float64)
+        self._velocities = numpy.zeros((capacity, 2), dtype=numpy.float64)
+        self._colours    = numpy.zeros((capacity, 3), dtype=numpy.float64)
+        self._sizes      = numpy.zeros( capacity,     dtype=numpy.float64)
+        self._alive      = numpy.zeros( capacity,     dtype=numpy.bool_)
+
+        # How many indices have been used, and the ones which are free again
+        self._used  = 0
+        self._free  = []
+        self._count = 0
+
+
+    def __len__(self) -> int:
+        return self._count
+
+
+    @property
+    def positions(self) -> numpy.ndarray:
+        """
+        The ``(n, 2)`` array of ``(x, y)`` positions, in canvas pixels.
+        """
+        return self._positions[:self._used]
+
+
+    @property
+    def velocities(self) -> numpy.ndarray:
+        """
+        The ``(n, 2)`` array of ``(x, y)`` velocities, in canvas pixels per
+        second.
+        """
+        return self._velocities[:self._used]
+
+
+    @property
+    def colours(self) -> numpy.ndarray:
+        """
+        The ``(n, 3)`` array of RGB colours, ``[0,1]``.
+        """
+        return self._colours[:self._used]
+
+
+    @property
+    def sizes(self) -> numpy.ndarray:
+        """
+        The array of sizes, as the pixel scale values given to `Canvas.set`.
+        """
+        return self._sizes[:self._used]
+
+
+    @property
+    def alive(self) -> numpy.ndarray:
+        """
+        The array of whether each index is in use.
+        """
+        return self._alive[:self._used]
+
+
+    @property
+    def indices(self) -> numpy.ndarray:
+        """
+        The indices of the live entities.
+        """
+        return numpy.flatnonzero(self._alive[:self._used])
+
+
+    def add(self,
+            x      : float,
+            y      : float,
+            vx     : float                    = 0.0,
+            vy     : float                    = 0.0,
+            colour : Tuple[float,float,float] = (1.0, 1.0, 1.0),
+            size   : float                    = 1.0) -> int:
+        """
+        Add an entity.
+
+        :param x:      The x position.
+        :param y:      The y position.
+        :param vx:     The x velocity, in pixels per second.
+        :param vy:     The y velocity, in pixels per second.
+        :param colour: The RGB colour.
+        :param size:   The pixel scale value.
+
+        :return: The entity's index.
+        """
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self._used == len(self._alive):
+                self.__grow()
+            index = self._used
+            self._used += 1
+
+        self._positions [index] = (x,  y )
+        self._velocities[index] = (vx, vy)
+        self._colours   [index] = colour
+        self._sizes     [index] = size
+        self._alive     [index] = True
+        self._count += 1
+        return index
+
+
+    def remove(self, index: int) -> None:
+        """
+        Remove an entity.
+
+        :param index: The entity's index.
+        """
+        if not (0 <= index < self._used and self._alive[index]):
+            raise ValueError("Bad entity index: %s" % (index,))
+        self._alive     [index] = False
+        self._velocities[index] = 0.0
+        self._free.append(index)
+        self._count -= 1
+
+
+    def clear(self) -> None:
+        """
+        Remove all the entities.
+        """
+        self._alive[:] = False
+        self._used  = 0
+        self._free  = []
+        self._count = 0
+
+
+    def integrate(self,
+                  dt     : float,
+                  bounds : Tuple[float,float] = None,
+                  wrap   : bool               = False) -> None:
+        """
+        Move every entity on by its velocity.
+
+        :param dt:     How much time has passed, in seconds.
+        :param bounds: The ``(width, height)`` to keep the entities within, if
+                       any.
+        :param wrap:   Whether entities which leave the bounds come back in on
+                       the other side. If not then they bounce off the edges.
+        """
+        used      = self._used
+        positions = self._positions [:used]
+        velocity  = self._velocities[:used]
+        positions += velocity * dt
+        if bounds is None:
+            return
+
+        # The far edges are just off the canvas, so the furthest in we may be
+        # is just short of them
+        limits = numpy.asarray(bounds, dtype=numpy.float64)
+        top    = numpy.nextafter(limits, 0.0)
+        if wrap:
+            # This may round up to the limit for tiny negative positions
+            numpy.mod(positions, limits, out=positions)
+        else:
+            # Reflect anything which went over an edge, or reached the far
+            # one, back in, and turn it around
+            low  = positions <  0.0
+            high = positions >= limits
+            positions[low]  = -positions[low]
+            numpy.subtract(2 * limits, positions, out=positions, where=high)
+            velocity[low | high] *= -1
+        numpy.clip(positions, 0.0, top, out=positions)
+
+
+    def draw(self, canvas) -> None:
+        """
+        Draw all the live entities onto the given canvas, in one batch. They
+        are drawn in index order, so later ones go on top of earlier ones.
+
+        :param canvas: The ``Canvas`` to draw on.
+        """
+        alive = self._alive[:self._used]
+        if self._count == self._used:
+            # Nothing's dead so there's nothing to pick out
+            (positions, colours, sizes) = (self._positions[:self._used],
+                                           self._colours  [:self._used],
+                                           self._sizes    [:self._used])
+        else:
+            (positions, colours, sizes) = (self._positions[:self._used][alive],
+                                           self._colours  [:self._used][alive],
+                                           self._sizes    [:self._used][alive])
+        canvas.set_points(positions[:, 0], positions[:, 1], colours, sizes)
+
+
+    def spatial_hash(self, cell: float) -> 'SpatialHash':
+        """
+        Build a spatial hash of where the live entities are now.
+
+        :param cell: The size of the hash's cells, which is best about the
+                     size of the distances which will be searched for.
+        """
+        result = SpatialHash(cell)
+        result.build(self._positions[:self._used], self.indices)
+        return result
+
+
+    def __grow(self) -> None:
+        """
+        Double the room in all the arrays.
+        """
+        for name in ('_positions', '_velocities', '_colours', '_sizes', '_alive'):
+            old = getattr(self, name)
+            new = numpy.zeros((len(old) * 2,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+
+class SpatialHash():
+    """
+    A uniform grid of cells, each holding the indices of the points which are
+    in it, for finding the points near a place, or near each other, without
+    looking at all of them.
+
+    Rather than a table of cells, the points are kept sorted by cell, so that
+    the points in any cell can be found with a binary search, and all of the
+    neighbours of all of the points can be found at once.
+    """
+    # The cells which we look in, relative to a point's own, when finding
+    # pairs. This is half of the neighbours, so that each pair of cells is
+    # only looked at once.
+    _HALF_NEIGHBOURS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+    def __init__(self, cell: float):
+        """
+        :param cell: The size of each cell.
+        """
+        if cell <= 0:
+            raise ValueError("Bad cell size: %s" % (cell,))
+        self._cell      = float(cell)
+        self._positions = numpy.zeros((0, 2), dtype=numpy.float64)
+
+        # The indices of the points, sorted by the key of the cell which they
+        # are in, and those keys. The cell coordinates are kept as offsets
+        # from the lowest, with room for a neighbour all around.
+        self._indices = numpy.zeros(0, dtype=numpy.intp)
+        self._cells   = numpy.zeros((0, 2), dtype=numpy.int64)
+        self._keys    = numpy.zeros(0, dtype=numpy.int64)
+        self._origin  = numpy.zeros(2, dtype=numpy.int64)
+        self._span    = 0
+
+
+    @property
+    def cell(self) -> float:
+        """
+        The size of each cell.
+        """
+        return self._cell
+
+
+    def build(self,
+              positions : numpy.ndarray,
+              indices   : numpy.ndarray = None) -> None:
+        """
+        Put the given points into the grid, replacing any which were there.
+
+        :param positions: The ``(n, 2)`` array of ``(x, y)`` positions.
+        :param indices:   The indices of the positions to use, if not all of
+                          them.
+        """
+        self._positions = positions = numpy.asarray(positions,
+                                                    dtype=numpy.float64)
+        if indices is None:
+            indices = numpy.arange(len(positions))
+        else:
+            indices = numpy.asarray(indices, dtype=numpy.intp)
+
+        cells = numpy.floor(positions[indices] / self._cell).astype(numpy.int64)
+        if len(cells):
+            self._origin = cells.min(axis=0) - 1
+            self._span   = int(cells[:, 1].max() - self._origin[1]) + 2
+        cells -= self._origin
+
+        keys  = self.__key(cells[:, 0], cells[:, 1])
+        order = numpy.argsort(keys, kind='stable')
+        self._indices = indices[order]
+        self._cells   = cells  [order]
+        self._keys    = keys   [order]
+
+
+    def query(self,
+              x      : float,
+              y      : float,
+              radius : float) -> numpy.ndarray:
+        """
+        Find the points within the given distance of a place.
+
+        :param x:      The x position.
+        :param y:      The y position.
+        :param radius: How far away to look.
+
+        :return: The indices of the points, in no particular order.
+        """
+        if not len(self._keys):
+            return numpy.zeros(0, dtype=numpy.intp)
+
+        # The range of cells to look in, clipped to those we have
+        (ox, oy) = self._origin
+        cell = self._cell
+        lx   = int(numpy.floor((x - radius) / cell)) - ox
+        hx   = int(numpy.floor((x + radius) / cell)) - ox
+        ly   = int(numpy.floor((y - radius) / cell)) - oy
+        hy   = int(numpy.floor((y + radius) / cell)) - oy
+        (lx, ly, hy) = (max(0, lx), max(0, ly), min(self._span, hy))
+        if lx > hx or ly > hy:
+            return numpy.zeros(0, dtype=numpy.intp)
+
+        # Each column of cells is one run of keys
+        found = []
+        for cx in range(lx, hx + 1):
+            lo = int(numpy.searchsorted(self._keys, self.__key(cx, ly), 'left'))
+            hi = int(numpy.searchsorted(self._keys, self.__key(cx, hy), 'right'))
+            if lo < hi:
+                found.append(self._indices[lo:hi])
+        if not found:
+            return numpy.zeros(0, dtype=numpy.intp)
+        candidates = numpy.concatenate(found)
+        offsets    = self._positions[candidates] - (x, y)
+        return candidates[numpy.einsum('ij,ij->i', offsets, offsets) <=
+                          radius * radius]
+
+
+    def pairs(self, radius: float) -> numpy.ndarray:
+        """
+        Find all the pairs of points within the given distance of each other.
+        This only looks in neighbouring cells, so the radius should be no more
+        than the cell size.
+
+        :param radius: How close they need to be.
+
+        :return: The ``(m, 2)`` array of the index pairs, each once.
+        """
+        if radius > self._cell:
+            raise ValueError("Bad radius: %s > %s" % (radius, self._cell))
+
+        keys  = self._keys
+        cells = self._cells
+        count = len(keys)
+        found = []
+        for (ox, oy) in self._HALF_NEIGHBOURS:
+            # Where each point's neighbouring cell's points are in the sorted
+            # order
+            neighbours = self.__key(cells[:, 0] + ox, cells[:, 1] + oy)
+            lo = numpy.searchsorted(keys, neighbours, 'left')
+            hi = numpy.searchsorted(keys, neighbours, 'right')
+
+            # Every point against each of those, as (first, second) positions
+            # in the sorted order
+            counts = hi - lo
+            total  = int(counts.sum())
+            if total == 0:
+                continue
+            first  = numpy.repeat(numpy.arange(count), counts)
+            second = (numpy.arange(total) -
+                      numpy.repeat(numpy.cumsum(counts) - counts, counts) +
+                      numpy.repeat(lo, counts))
+
+            # Within the same cell each pair turns up both ways round, and
+            # each point against itself
+            if ox == 0 and oy == 0:
+                keep   = first < second
+                first  = first [keep]
+                second = second[keep]
+
+            # And see which are close enough
+            (first, second) = (self._indices[first], self._indices[second])
+            offsets = self._positions[first] - self._positions[second]
+            close   = numpy.einsum('ij,ij->i', offsets, offsets) <= radius * radius
+            found.append(numpy.stack((first[close], second[close]), axis=1))
+
+        if not found:
+            return numpy.zeros((0, 2), dtype=numpy.intp)
+        return numpy.concatenate(found)
+
+
+    def __key(self, cx, cy):
+        """
+        Get the sort key of the given cell, or cells.
+        """
+        return cx * (self._span + 1) + cy
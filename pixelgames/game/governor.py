@@ -0,0 +1,255 @@
+"""
+Trading quality for speed when frames take too long.
+"""
+
+from   collections import deque, namedtuple
+
+import logging
+
+# ----------------------------------------------------------------------
+
+LOG = logging.getLogger(__name__)
+
+# ----------------------------------------------------------------------
+
+GovernorEvent = namedtuple(
+    'GovernorEvent',
+    ('time', 'action', 'level', 'frame_time', 'budget')
+)
+"""
+A decision made by the `Governor`: when it was made, what was done (``degrade``
+or ``restore``), the level which resulted, and the average frame time and
+budget which prompted it.
+"""
+
+# ----------------------------------------------------------------------
+
+class Governor():
+    """
+    Watches how long frames take against a budget, dropping the quality when
+    they go over it and raising it again when there is room to spare.
+
+    The quality levels are, from best to cheapest:
+     0. Everything on.
+     1. Post-processing effects off.
+     2. Antialiasing off, so the canvas draws snapped pixels.
+     3. Only present every other frame to the display.
+     4. Also render at half the frame rate.
+     5. Render at a quarter of the frame rate.
+    """
+    # What each level does, as (effects, antialias, present_interval,
+    # render_divisor)
+    _LEVELS = (
+        (True,  True,  1, 1),
+        (False, True,  1, 1),
+        (False, False, 1, 1),
+        (False, False, 2, 1),
+        (False, False, 2, 2),
+        (False, False, 2, 4),
+    )
+
+    # How many events we remember
+    _MAX_EVENTS = 100
+
+    def __init__(self,
+                 budget    : float = None,
+                 smoothing : float = 0.1,
+                 headroom  : float = 0.7,
+                 degrade   : int   = 10,
+                 restore   : int   = 120):
+        """
+        :param budget:    How long a frame may take, in seconds. If this is
+                          ``None`` then the game's frame interval is used or,
+                          if the game has no frame rate, the display's refresh
+                          period.
+        :param smoothing: How much weight each new frame time gets in the
+                          running average, from zero to one.
+        :param headroom:  The fraction of the budget which the average must be
+                          under before we consider raising the quality.
+        :param degrade:   How many frames in a row must be over budget before
+                          we drop the quality.
+        :param restore:   How many frames in a row must be within the headroom
+                          before we raise the quality.
+        """
+        if budget is not None and budget <= 0:
+            raise ValueError("Bad budget: %s" % (budget,))
+        if not 0 < smoothing <= 1:
+            raise ValueError("Bad smoothing: %s" % (smoothing,))
+
+        self._budget    = budget
+        self._smoothing = float(smoothing)
+        self._headroom  = float(headroom)
+        self._degrade   = max(1, int(degrade))
+        self._restore   = max(1, int(restore))
+
+        # State
+        self._canvas    = None
+        self._level     = 0
+        self._average   = None
+        self._over      = 0
+        self._under     = 0
+        self._disabled  = []
+        self._events    = deque(maxlen=self._MAX_EVENTS)
+        self._listeners = []
+
+
+    @property
+    def level(self) -> int:
+        """
+        The current quality level, where zero is the best.
+        """
+        return self._level
+
+
+    @property
+    def budget(self) -> float:
+        """
+        The frame time budget, in seconds, or ``None`` if we don't have one
+        yet.
+        """
+        return self._budget
+
+
+    @property
+    def render_divisor(self) -> int:
+        """
+        What the game should divide its frame rate by.
+        """
+        return self._LEVELS[self._level][3]
+
+
+    @property
+    def events(self) -> tuple:
+        """
+        The most recent `GovernorEvent`s, oldest first.
+        """
+        return tuple(self._events)
+
+
+    def add_listener(self, listener) -> None:
+        """
+        Add a function to be called with each `GovernorEvent` as it happens.
+
+        :param listener: The function to call.
+        """
+        self._listeners.append(listener)
+
+
+    def attach(self,
+               canvas,
+               frame_interval : float) -> None:
+        """
+        Set up the governor for the given game's canvas and frame interval.
+        This is called by the game.
+
+        :param canvas:         The canvas which the game draws on.
+        :param frame_interval: The game's target time between frames, which
+                               is zero if it has no frame rate.
+        """
+        # Without a budget we'd never do anything, so make sure that we have
+        # one
+        if self._budget is None:
+            if frame_interval > 0:
+                self._budget = frame_interval
+            elif canvas.display.refresh_rate:
+                self._budget = 1.0 / canvas.display.refresh_rate
+            else:
+                raise ValueError(
+                    "No budget given, and no frame or refresh rate to use"
+                )
+        self._canvas = canvas
+
+
+    def detach(self) -> None:
+        """
+        Put everything back to full quality and let go of the canvas.
+        """
+        if self._canvas is not None:
+            self._level = 0
+            self.__apply()
+            self._canvas = None
+
+
+    def frame(self,
+              now        : float,
+              frame_time : float) -> None:
+        """
+        Account for a frame. This is called by the game after each one.
+
+        :param now:        The game clock time.
+        :param frame_time: How long the frame took to update and draw, not
+                           counting any time spent waiting.
+        """
+        # Nothing to go on?
+        if self._budget is None:
+            return
+
+        # Keep a running average, to smooth out the odd blip
+        if self._average is None:
+            self._average = frame_time
+        else:
+            self._average += self._smoothing * (frame_time - self._average)
+
+        # See how we're doing
+        if self._average > self._budget:
+            self._over += 1
+            self._under = 0
+        elif self._average < self._budget * self._headroom:
+            self._under += 1
+            self._over  = 0
+        else:
+            self._over  = 0
+            self._under = 0
+
+        # And act on it
+        if self._over >= self._degrade and self._level < len(self._LEVELS) - 1:
+            self.__change(now, 'degrade', self._level + 1)
+        elif self._under >= self._restore and self._level > 0:
+            self.__change(now, 'restore', self._level - 1)
+
+
+    def __change(self,
+                 now    : float,
+                 action : str,
+                 level  : int) -> None:
+        """
+        Move to the given level, and tell everyone about it.
+        """
+        self._level = level
+        self._over  = 0
+        self._under = 0
+        self.__apply()
+
+        event = GovernorEvent(now, action, level, self._average, self._budget)
+        self._events.append(event)
+        LOG.info("Governor %s to level %d: average frame time %0.4fs, "
+                 "budget %0.4fs",
+                 action, level, self._average, self._budget)
+        for listener in self._listeners:
+            listener(event)
+
+
+    def __apply(self) -> None:
+        """
+        Set up the canvas for the current level.
+        """
+        canvas = self._canvas
+        if canvas is None:
+            return
+        (effects, antialias, present_interval, _) = self._LEVELS[self._level]
+
+        # We only turn back on the effects which we turned off
+        if effects:
+            for effect in self._disabled:
+                effect.enabled = True
+            self._disabled = []
+        else:
+            for effect in canvas.effects:
+                if effect.enabled:
+                    effect.enabled = False
+                    self._disabled.append(effect)
+
+        if canvas.antialias != antialias:
+            canvas.set_antialias(antialias)
+        if canvas.present_interval != present_interval:
+            canvas.set_present_interval(present_interval)
@@ -0,0 +1,186 @@
+"""
+Blocking until something happens, for games which are idle when there's no
+input to handle.
+"""
+
+from   select import select
+
+import os
+import threading
+
+# ----------------------------------------------------------------------
+
+class Waiter():
+    """
+    Waits until there is input, a timeout expires, or someone calls `wake`.
+
+    Terminal input is waited on directly. PyGame's events have no file
+    descriptor to wait on so, once any joysticks are attached, we block in
+    PyGame instead and a helper thread watches the terminal on our behalf,
+    posting a PyGame event when it has something.
+    """
+    def __init__(self,
+                 pygame      = None,
+                 stdin : int = None,
+                 flush       = None):
+        """
+        :param pygame: The PyGame instance, if it is being used.
+        :param stdin:  The file descriptor of the terminal input, if it is
+                       being used.
+        :param flush:  The function to call to throw away terminal input which
+                       nobody is reading, so that it doesn't keep waking us.
+        """
+        self._pygame = pygame
+        self._stdin  = stdin
+        self._flush  = flush
+
+        # The pipe which we use to wake ourselves up
+        (self._wake_r, self._wake_w) = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._fds = [self._wake_r]
+        if stdin is not None:
+            self._fds.append(stdin)
+
+        # Whether the terminal had unread input last time we looked
+        self._unread = False
+
+        # The watcher thread, which is only created if we need it
+        self._thread    = None
+        self._watch     = threading.Event()
+        self._closed    = False
+        self._wake_type = None
+
+
+    def wake(self) -> None:
+        """
+        Wake up any `wait` call. This may be called from any thread.
+        """
+        try:
+            os.write(self._wake_w, b'\0')
+        except BlockingIOError:
+            # The pipe is full, so it'll wake anyhow
+            pass
+
+
+    def wait(self, timeout: float = None) -> tuple:
+        """
+        Wait for something to happen.
+
+        :param timeout: The most seconds to wait for, or ``None`` for forever.
+
+        :return: Any PyGame events which we took from its queue while waiting.
+                 These should be handled along with any others in it.
+        """
+        # If there's terminal input which we woke for before and it's still not
+        # been read then nobody cares about it; throw it away. If it's new then
+        # we don't wait at all.
+        if self._stdin is not None and select([self._stdin], [], [], 0)[0]:
+            if self._unread:
+                if self._flush is not None:
+                    self._flush()
+                self._unread = False
+            else:
+                self._unread = True
+                return ()
+        else:
+            self._unread = False
+
+        if self.__use_pygame():
+            return self.__wait_pygame(timeout)
+        else:
+            return self.__wait_select(timeout)
+
+
+    def close(self) -> None:
+        """
+        Tidy up.
+        """
+        self._closed = True
+        self._watch.set()
+        self.wake()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+
+    def __use_pygame(self) -> bool:
+        """
+        Whether we need to block in PyGame in order to see its events.
+        """
+        joystick = getattr(self._pygame, 'joystick', None)
+        return (joystick is not None and
+                joystick.get_init()  and
+                joystick.get_count() > 0)
+
+
+    def __wait_select(self, timeout: float) -> tuple:
+        """
+        Wait on the file descriptors.
+        """
+        (readable, _, _) = select(self._fds, [], [], timeout)
+        if self._wake_r in readable:
+            self.__drain()
+        return ()
+
+
+    def __wait_pygame(self, timeout: float) -> tuple:
+        """
+        Wait on PyGame's event queue.
+        """
+        pygame = self._pygame
+
+        # Set up the watcher, if we've not done so already
+        if self._thread is None:
+            self._wake_type = pygame.event.custom_type()
+            self._thread = threading.Thread(target=self.__watcher,
+                                            name="Waiter",
+                                            daemon=True)
+            self._thread.start()
+
+        # Let the watcher look for something and then wait. PyGame wants the
+        # timeout in millis, with zero meaning forever.
+        self._watch.set()
+        if timeout is None:
+            event = pygame.event.wait()
+        else:
+            event = pygame.event.wait(max(1, int(timeout * 1000)))
+        pygame.event.clear(self._wake_type)
+        if event.type in (pygame.NOEVENT, self._wake_type):
+            return ()
+        else:
+            return (event,)
+
+
+    def __watcher(self) -> None:
+        """
+        Watch the file descriptors on behalf of the PyGame wait.
+        """
+        pygame = self._pygame
+        while True:
+            # Wait until we're asked to look
+            self._watch.wait()
+            self._watch.clear()
+            if self._closed:
+                return
+
+            # And post an event when there's something to see
+            (readable, _, _) = select(self._fds, [], [])
+            if self._closed:
+                return
+            if self._wake_r in readable:
+                self.__drain()
+            pygame.event.post(pygame.event.Event(self._wake_type))
+
+
+    def __drain(self) -> None:
+        """
+        Empty the wake-up pipe.
+        """
+        try:
+            while os.read(self._wake_r, 1024):
+                pass
+        except BlockingIOError:
+            pass
@@ -0,0 +1,154 @@
+"""
+Input-to-display latency statistics.
+"""
+
+from   typing import Dict, Tuple
+
+import numpy
+
+# ----------------------------------------------------------------------
+
+class LatencyStats():
+    """
+    Keeps the most recent input latencies in a fixed-size ring buffer and works
+    out statistics from them.
+
+    A latency is the time from an input arriving to the first frame which could
+    reflect it having been shown on the display. Each one is recorded against
+    the name of the kind of input source which it came from, so that, say, the
+    keyboard and the joystick can be compared. All times are in seconds.
+
+    How good these are depends on the source knowing when its input really
+    arrived. Sources which can only be polled, like the joystick, say that it
+    arrived when they were polled, and so their latencies leave out the wait
+    for the poll.
+    """
+    def __init__(self, size: int = 1024):
+        """
+        :param size: How many latencies to keep.
+        """
+        if size < 1:
+            raise ValueError("Bad size: %s" % (size,))
+
+        # The ring buffer of latencies, and the index of the source name of
+        # each one
+        self._data    = numpy.zeros(int(size), dtype=numpy.float64)
+        self._sources = numpy.zeros(int(size), dtype=numpy.int32)
+        self._names   = []
+        self._next    = 0
+        self._count   = 0
+        self._total   = 0
+
+
+    def __len__(self) -> int:
+        return self._count
+
+
+    @property
+    def total(self) -> int:
+        """
+        The total number of latencies recorded.
+        """
+        return self._total
+
+
+    @property
+    def sources(self) -> Tuple[str]:
+        """
+        The names of the sources which we have seen.
+        """
+        return tuple(self._names)
+
+
+    def record(self,
+               source  : str,
+               latency : float) -> None:
+        """
+        Record a latency. This is called by the game.
+
+        :param source:  The name of the kind of source of the input.
+        :param latency: How long the input took to be shown, in seconds.
+        """
+        try:
+            index = self._names.index(source)
+        except ValueError:
+            index = len(self._names)
+            self._names.append(source)
+
+        i = self._next
+        self._data   [i] = latency
+        self._sources[i] = index
+        self._next       = (i + 1) % len(self._data)
+        self._count      = min(self._count + 1, len(self._data))
+        self._total     += 1
+
+
+    def values(self, source: str = None) -> numpy.ndarray:
+        """
+        Get the recorded latencies, in no particular order.
+
+        :param source: The name of the source to get them for, or ``None`` for
+                       all of them.
+
+        :return: A new array of the values.
+        """
+        values = self._data[:self._count]
+        if source is None:
+            return values.copy()
+        elif source not in self._names:
+            return numpy.zeros(0, dtype=numpy.float64)
+        else:
+            index = self._names.index(source)
+            return values[self._sources[:self._count] == index]
+
+
+    def percentiles(self,
+                    percentiles : Tuple[float] = (50, 90, 99),
+                    source      : str          = None) -> Tuple[float]:
+        """
+        Get percentiles of the recorded latencies.
+
+        :param percentiles: The percentiles to get, from zero to 100.
+        :param source:      The name of the source to get them for, or
+                            ``None`` for all of them.
+
+        :return: The values at those percentiles, or ``None`` if there are no
+                 latencies yet.
+        """
+        values = self.values(source)
+        if len(values) == 0:
+            return None
+        return tuple(numpy.percentile(values, percentiles).tolist())
+
+
+    def histogram(self,
+                  bins   : int = 20,
+                  source : str = None) -> Tuple[numpy.ndarray,numpy.ndarray]:
+        """
+        Get a histogram of the recorded latencies.
+
+        :param bins:   The number of bins, or a sequence of their edges.
+        :param source: The name of the source to get it for, or ``None`` for
+                       all of them.
+
+        :return: The counts in each bin and the edges of the bins, as with
+                 ``numpy.histogram``.
+        """
+        return numpy.histogram(self.values(source), bins=bins)
+
+
+    def summary(self) -> Dict[str,object]:
+        """
+        Get a summary of the recorded latencies.
+
+        :return: A dict of the counts and the 50th, 90th and 99th percentiles,
+                 overall and for each source.
+        """
+        result = {
+            'total'  : self._total,
+            'recent' : self._count,
+            'all'    : self.percentiles(),
+        }
+        for source in self._names:
+            result[source] = self.percentiles(source=source)
+        return result
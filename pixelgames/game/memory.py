@@ -0,0 +1,325 @@
+"""
+Keeping the garbage collector out of the way of frames, and finding out where
+frames allocate memory.
+"""
+
+from   collections import Counter
+from   typing      import Dict, Tuple
+
+import gc
+import logging
+import time
+import tracemalloc
+
+# ----------------------------------------------------------------------
+
+LOG = logging.getLogger(__name__)
+
+# ----------------------------------------------------------------------
+
+class GCControl():
+    """
+    Takes over from Python's automatic garbage collection so that collections
+    happen while the game is waiting for its next frame, instead of whenever
+    the allocation count happens to tip over in the middle of one.
+
+    Once the game is set up, everything which it has created so far can be
+    frozen, so that the collector never has to look at it again. Automatic
+    collection may then be turned off, in which case we collect whatever
+    generations are due when there is enough slack time before the next frame.
+    If there's never any slack then we collect anyway once far too much has
+    built up, since running out of memory is worse than a slow frame.
+
+    We keep track of how long collecting each generation takes, and if an
+    older generation is due but wouldn't fit in the slack then we collect a
+    younger one instead, leaving the older one until there is room.
+    """
+    def __init__(self,
+                 freeze    : bool  = True,
+                 manual    : bool  = True,
+                 min_slack : float = 0.002,
+                 overdue   : int   = 10):
+        """
+        :param freeze:    Whether to freeze everything which exists after the
+                          game is set up.
+        :param manual:    Whether to turn off automatic collection and collect
+                          in the slack time between frames instead.
+        :param min_slack: The least time before the next frame, in seconds,
+                          which we will collect in.
+        :param overdue:   How many times over its threshold the youngest
+                          generation may get before we collect at the end of
+                          a frame regardless.
+        """
+        if min_slack < 0:
+            raise ValueError("Bad min_slack: %s" % (min_slack,))
+        if overdue < 1:
+            raise ValueError("Bad overdue: %s" % (overdue,))
+
+        self._freeze    = bool(freeze)
+        self._manual    = bool(manual)
+        self._min_slack = float(min_slack)
+        self._overdue   = int(overdue)
+
+        # State
+        self._attached    = False
+        self._was_enabled = None
+        self._collections = [0, 0, 0]
+        self._forced      = 0
+        self._time        = 0.0
+
+        # Roughly how long collecting each generation takes, in seconds, going
+        # by the recent ones
+        self._costs = [0.0, 0.0, 0.0]
+
+
+    @property
+    def collections(self) -> Tuple[int,int,int]:
+        """
+        How many collections we have done of each generation.
+        """
+        return tuple(self._collections)
+
+
+    @property
+    def forced(self) -> int:
+        """
+        How many collections we had to do at the end of a frame, since there
+        was no slack.
+        """
+        return self._forced
+
+
+    @property
+    def collection_time(self) -> float:
+        """
+        The total time we have spent collecting, in seconds.
+        """
+        return self._time
+
+
+    def attach(self) -> None:
+        """
+        Take over the collector. This is called by the game once it is set up.
+        """
+        if self._attached:
+            return
+        self._attached = True
+        if self._freeze or self._manual:
+            # Clear out any garbage from setting up before we freeze, so that
+            # it doesn't get kept forever. This also tells us how long a full
+            # collection takes.
+            self.__collect(2)
+        if self._freeze:
+            gc.freeze()
+        if self._manual:
+            self._was_enabled = gc.isenabled()
+            gc.disable()
+
+
+    def detach(self) -> None:
+        """
+        Put the collector back the way it was.
+        """
+        if not self._attached:
+            return
+        self._attached = False
+        if self._manual and self._was_enabled:
+            gc.enable()
+        if self._freeze:
+            gc.unfreeze()
+
+
+    def slack(self, available: float) -> None:
+        """
+        Collect, if anything is due and there is time. This is called by the
+        game before it waits.
+
+        :param available: How long until the next frame is due, in seconds.
+                          This may be infinite.
+        """
+        if self._manual and self._attached and available >= self._min_slack:
+            generation = self.__due(1)
+            if generation is not None:
+                # Don't go over the time we have
+                while generation > 0 and self._costs[generation] > available:
+                    generation -= 1
+                self.__collect(generation)
+
+
+    def frame(self) -> None:
+        """
+        Collect the youngest generation if it is well overdue. This is called
+        by the game at the end of each frame.
+        """
+        if self._manual and self._attached and self.__due(self._overdue) == 0:
+            self._forced += 1
+            self.__collect(0)
+
+
+    def __due(self, factor: int) -> int:
+        """
+        Work out which generation, if any, should be collected, in the same way
+        as the automatic collector would.
+
+        :param factor: How many times over its threshold the youngest
+                       generation must be.
+        """
+        (count0, count1, count2) = gc.get_count()
+        (limit0, limit1, limit2) = gc.get_threshold()
+        if limit0 == 0 or count0 < limit0 * factor:
+            return None
+        elif count1 >= limit1 and count2 >= limit2:
+            return 2
+        elif count1 >= limit1:
+            return 1
+        else:
+            return 0
+
+
+    def __collect(self, generation: int) -> None:
+        """
+        Collect the given generation, and account for it.
+        """
+        start = time.perf_counter()
+        gc.collect(generation)
+        elapsed = time.perf_counter() - start
+        self._time += elapsed
+        self._collections[generation] += 1
+
+        # Remember the worst of the recent ones, slowly forgetting it
+        self._costs[generation] = max(elapsed, 0.75 * self._costs[generation])
+
+
+class AllocationTracker():
+    """
+    Finds out where memory is being allocated from during each frame, using
+    ``tracemalloc``. This slows everything down a lot, so it's only something
+    to turn on while looking for what's making the garbage.
+
+    For each frame we look at which call sites have more memory blocks at its
+    end than at its start, and at the peak amount of memory which was in use
+    during it. Only the first of these are attributed to call sites, so those
+    are where the memory which frames keep hold of comes from. Allocations
+    which are freed again within the frame, like temporary tuples, are only
+    seen in the peak, since ``tracemalloc`` forgets where they came from as
+    soon as they are freed.
+    """
+    def __init__(self,
+                 frames : int = 1,
+                 top    : int = 10):
+        """
+        :param frames: How many stack frames to record for each allocation.
+        :param top:    How many call sites to report.
+        """
+        if frames < 1:
+            raise ValueError("Bad frames: %s" % (frames,))
+
+        self._frames = int(frames)
+        self._top    = int(top)
+
+        # State
+        self._started  = False
+        self._owns     = False
+        self._snapshot = None
+        self._count    = 0
+        self._blocks   = Counter()
+        self._sizes    = Counter()
+        self._peaks    = 0
+
+
+    @property
+    def frames(self) -> int:
+        """
+        How many frames have been tracked.
+        """
+        return self._count
+
+
+    def start(self) -> None:
+        """
+        Start tracking. This is called by the game once it is set up.
+        """
+        if not self._started:
+            # Someone else may be tracing already, in which case it's theirs
+            # to stop
+            self._started = True
+            self._owns    = not tracemalloc.is_tracing()
+            if self._owns:
+                tracemalloc.start(self._frames)
+            self._snapshot = self.__take()
+
+
+    def stop(self) -> None:
+        """
+        Stop tracking.
+        """
+        if self._started:
+            self._started  = False
+            self._snapshot = None
+            if self._owns:
+                self._owns = False
+                tracemalloc.stop()
+
+
+    def frame(self) -> None:
+        """
+        Account for a frame. This is called by the game at the end of each one.
+        """
+        if not self._started:
+            return
+
+        # How much went on during the frame, above what there was at its start
+        (current, peak) = tracemalloc.get_traced_memory()
+        self._peaks += peak - current
+        tracemalloc.reset_peak()
+
+        # And what's new since last time, by where it came from
+        snapshot = self.__take()
+        for stat in snapshot.compare_to(self._snapshot, 'traceback'):
+            if stat.count_diff > 0:
+                site = str(stat.traceback)
+                self._blocks[site] += stat.count_diff
+                self._sizes [site] += stat.size_diff
+        self._snapshot = snapshot
+        self._count   += 1
+
+
+    def report(self) -> Dict[str,object]:
+        """
+        Get what we have found so far.
+
+        :return: A dict of the number of frames, the average transient peak
+                 memory use per frame in bytes, and the top call sites of the
+                 memory retained by frames, as a list of ``(site,
+                 blocks_per_frame, bytes_per_frame)``.
+        """
+        count = max(1, self._count)
+        sites = [(site, blocks / count, self._sizes[site] / count)
+                 for (site, blocks) in self._blocks.most_common(self._top)]
+        return {
+            'frames' : self._count,
+            'peak'   : self._peaks / count,
+            'sites'  : sites,
+        }
+
+
+    def log_report(self) -> None:
+        """
+        Write what we have found so far to the log.
+        """
+        report = self.report()
+        LOG.info("Allocations over %d frames, average peak %d bytes per frame",
+                 report['frames'], report['peak'])
+        for (site, blocks, size) in report['sites']:
+            LOG.info("  %8.1f blocks %10.1f bytes retained per frame: %s",
+                     blocks, size, site)
+
+
+    def __take(self) -> tracemalloc.Snapshot:
+        """
+        Take a snapshot, not counting our own allocations.
+        """
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
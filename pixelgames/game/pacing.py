@@ -0,0 +1,126 @@
+"""
+Working out when a game's updates and frames are due.
+"""
+
+from   typing import List
+
+# ----------------------------------------------------------------------
+
+class Pacer():
+    """
+    Keeps track of when the next fixed-rate update and the next frame are due,
+    for running a game at its given rates. The game loop asks this what to do
+    and when to wake up, and does the updating, drawing and waiting itself.
+
+    Updates and frames are scheduled from when they were due, not from when
+    they were got around to, so that they don't drift.
+
+    There's no point in drawing faster than the display refreshes and, if
+    showing a frame waits for the refresh, we leave the last refresh period of
+    the wait to it instead of waiting twice. If showing waits but we don't
+    know for how long then we at least don't add to it, since frames are
+    scheduled from when they were due.
+    """
+    def __init__(self,
+                 now          : float,
+                 step         : float,
+                 tween        : float,
+                 display,
+                 max_catch_up : int):
+        """
+        :param now:          The game clock time to start from.
+        :param step:         The time between fixed-rate updates, or ``None``
+                             if the game is updated once per frame.
+        :param tween:        The least time between frames.
+        :param display:      The display which the frames are shown on.
+        :param max_catch_up: The most updates to run back-to-back in order to
+                             catch up before we give up and drop the backlog.
+        """
+        period = 1.0 / display.refresh_rate if display.refresh_rate else 0.0
+
+        self._step         = step
+        self._tween        = max(tween, period)
+        self._early        = period if display.vsync else 0.0
+        self._max_catch_up = int(max_catch_up)
+
+        # When the next update and frame are due
+        self._next_update = now
+        self._next_frame  = now
+
+
+    @property
+    def deadline(self) -> float:
+        """
+        The game clock time at which whatever is next due should be done, and
+        so until when the game may wait.
+        """
+        frame_due = self._next_frame - self._early
+        if self._step is None:
+            return frame_due
+        else:
+            return min(frame_due, self._next_update)
+
+
+    def updates(self, now: float) -> List[float]:
+        """
+        Get the times of the fixed-rate updates which are due, catching up if
+        we have fallen behind, but not forever. These are taken as done.
+
+        :param now: The game clock time.
+
+        :return: The game clock times to run the updates for, oldest first.
+                 This is empty if the game is updated once per frame.
+        """
+        result = []
+        if self._step is None:
+            return result
+        while self._next_update <= now:
+            if len(result) == self._max_catch_up:
+                # Too far behind to catch up, drop what we missed
+                self._next_update = now + self._step
+                break
+            result.append(self._next_update)
+            self._next_update += self._step
+        return result
+
+
+    def frame_due(self, now: float) -> bool:
+        """
+        Whether a frame should be drawn. That's when we woke up for it, with
+        the display's own wait making up the rest.
+
+        :param now: The game clock time.
+        """
+        return now >= self._next_frame - self._early
+
+
+    def alpha(self, now: float) -> float:
+        """
+        How far between the last update and the next one we are, as given to
+        the game's ``_render``.
+
+        :param now: The game clock time.
+        """
+        if self._step is None:
+            return 1.0
+        else:
+            return min(1.0, max(0.0, 1.0 - (self._next_update - now) / self._step))
+
+
+    def frame_drawn(self,
+                    now     : float,
+                    divisor : int = 1) -> float:
+        """
+        Move on to the next frame, once one has been drawn. If we missed it
+        entirely then we skip it and start afresh.
+
+        :param now:     The game clock time at which the frame was started.
+        :param divisor: How many frame intervals to leave until the next one.
+
+        :return: The game clock time by which the frame should have been
+                 finished, which is when the next one is due.
+        """
+        interval = self._tween * divisor
+        due      = self._next_frame + interval
+        self._next_frame = due if due > now else now + interval
+        return due
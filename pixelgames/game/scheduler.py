@@ -0,0 +1,256 @@
+"""
+Scheduling things to happen a number of game ticks from now.
+"""
+
+import heapq
+
+# ----------------------------------------------------------------------
+
+class Timer():
+    """
+    Something which has been scheduled with a `Scheduler`.
+    """
+    def __init__(self,
+                 scheduler,
+                 due      : int,
+                 period   : int,
+                 callback,
+                 args     : tuple):
+        self._scheduler = scheduler
+        self._due       = due
+        self._period    = period
+        self._callback  = callback
+        self._args      = args
+        self._cancelled = False
+
+
+    @property
+    def due(self) -> int:
+        """
+        The tick at which this is next due.
+        """
+        return self._due
+
+
+    @property
+    def period(self) -> int:
+        """
+        How many ticks apart the calls are, or ``None`` if this is a one-off.
+        """
+        return self._period
+
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        Whether this has been cancelled, or was a one-off which has been run.
+        """
+        return self._cancelled
+
+
+    def cancel(self) -> None:
+        """
+        Stop this from being called again.
+        """
+        if not self._cancelled:
+            self._cancelled = True
+            self._scheduler._cancelled(self)
+
+
+class Scheduler():
+    """
+    Calls things after a number of ticks, either once or periodically, so that
+    a game with lots of things happening at their own rates only has to look
+    at the ones which are due, rather than checking each one every update.
+
+    Times are kept in whole ticks, counted from the first call to `run`, so
+    that periods don't drift with rounding. Things which are due at the same
+    tick are called in the order in which they were scheduled.
+
+    The `Game` has one of these, which it runs before each update.
+    """
+    def __init__(self, interval: float):
+        """
+        :param interval: How long a tick is, in seconds.
+        """
+        if interval <= 0:
+            raise ValueError("Bad interval: %s" % (interval,))
+
+        self._interval = float(interval)
+        self._origin   = None
+        self._tick     = 0
+        self._count    = 0
+
+        # The heap of (due, sequence, timer). Cancelled timers are left in it
+        # until they get to the top, and the sequence keeps the order stable.
+        self._heap     = []
+        self._sequence = 0
+
+
+    def __len__(self) -> int:
+        return self._count
+
+
+    @property
+    def interval(self) -> float:
+        """
+        How long a tick is, in seconds.
+        """
+        return self._interval
+
+
+    @property
+    def tick(self) -> int:
+        """
+        The tick which was last run.
+        """
+        return self._tick
+
+
+    @property
+    def next_due(self) -> int:
+        """
+        The tick at which something is next due, or ``None`` if nothing is
+        scheduled.
+        """
+        self.__prune()
+        return self._heap[0][0] if self._heap else None
+
+
+    @property
+    def next_time(self) -> float:
+        """
+        The game clock time at which something is next due, or ``None`` if
+        nothing is scheduled or we have not been run yet.
+        """
+        due = self.next_due
+        if due is None or self._origin is None:
+            return None
+        return self._origin + due * self._interval
+
+
+    def ticks(self, seconds: float) -> int:
+        """
+        Get the number of ticks closest to the given time, but at least one.
+
+        :param seconds: The time, in seconds.
+        """
+        return max(1, int(round(seconds / self._interval)))
+
+
+    def call_later(self,
+                   delay    : int,
+                   callback,
+                   *args) -> Timer:
+        """
+        Call something once, after the given number of ticks.
+
+        :param delay:    How many ticks from now to call it. Zero means the
+                         next time that we are run.
+        :param callback: The function to call. It is given the game clock time
+                         of the run, followed by the given arguments.
+
+        :return: The timer, for cancelling.
+        """
+        if delay < 0:
+            raise ValueError("Bad delay: %s" % (delay,))
+        return self.__push(Timer(self, self._tick + int(delay), None,
+                                 callback, args))
+
+
+    def call_every(self,
+                   period   : int,
+                   callback,
+                   *args,
+                   delay    : int = None) -> Timer:
+        """
+        Call something every so many ticks. If we fall behind, and so miss
+        some calls, then it is only called once to catch up.
+
+        :param period:   How many ticks apart to call it.
+        :param callback: The function to call. It is given the game clock time
+                         of the run, followed by the given arguments.
+        :param delay:    How many ticks from now to first call it, which
+                         defaults to the period.
+
+        :return: The timer, for cancelling.
+        """
+        if period < 1:
+            raise ValueError("Bad period: %s" % (period,))
+        if delay is None:
+            delay = period
+        if delay < 0:
+            raise ValueError("Bad delay: %s" % (delay,))
+        return self.__push(Timer(self, self._tick + int(delay), int(period),
+                                 callback, args))
+
+
+    def run(self, now: float) -> None:
+        """
+        Call everything which is due by the given time.
+
+        :param now: The game clock time.
+        """
+        if self._origin is None:
+            self._origin = now
+
+        # A little slack for rounding, so that we don't miss a tick which we
+        # were woken up for
+        tick = int((now - self._origin) / self._interval + 1e-6)
+        if tick > self._tick:
+            self._tick = tick
+
+        heap = self._heap
+        while heap and heap[0][0] <= tick:
+            (due, sequence, timer) = heapq.heappop(heap)
+            if timer._cancelled:
+                continue
+
+            # Put it back if it's periodic, else it's done with, before calling
+            # it in case it wants to cancel itself
+            if timer._period is None:
+                timer._cancelled = True
+                self._count     -= 1
+            else:
+                timer._due = max(due + timer._period, tick + 1)
+                self.__push(timer, count=False)
+            timer._callback(now, *timer._args)
+
+
+    def clear(self) -> None:
+        """
+        Cancel everything.
+        """
+        for (due, sequence, timer) in self._heap:
+            timer._cancelled = True
+        self._heap  = []
+        self._count = 0
+
+
+    def _cancelled(self, timer: Timer) -> None:
+        """
+        Called when a timer has been cancelled.
+        """
+        self._count -= 1
+
+
+    def __push(self,
+               timer : Timer,
+               count : bool = True) -> Timer:
+        """
+        Put a timer on the heap.
+        """
+        self._sequence += 1
+        heapq.heappush(self._heap, (timer._due, self._sequence, timer))
+        if count:
+            self._count += 1
+        return timer
+
+
+    def __prune(self) -> None:
+        """
+        Drop any cancelled timers from the top of the heap.
+        """
+        heap = self._heap
+        while heap and heap[0][2]._cancelled:
+            heapq.heappop(heap)
@@ -0,0 +1,237 @@
+"""
+Per-frame timing statistics.
+"""
+
+from   typing import Dict, Tuple
+
+import json
+import numpy
+
+# ----------------------------------------------------------------------
+
+class FrameStats():
+    """
+    Keeps the timings of the most recent frames in a fixed-size ring buffer
+    and works out statistics from them.
+
+    For each frame we have:
+     - ``interval``: The time since the previous frame started.
+     - ``input``:    The time spent polling for input.
+     - ``update``:   The time spent in the game's ``_update``.
+     - ``render``:   The time spent in the game's ``_render``.
+     - ``raster``:   The time the canvas spent preparing the frame for the
+                     display.
+     - ``show``:     The time spent in the display's ``show``.
+     - ``total``:    The time spent working on the frame, being the sum of
+                     the ``input`` to ``show`` times. Time spent waiting
+                     between them is not counted.
+     - ``late``:     How long after its deadline the frame finished, which is
+                     when the next one was due. Negative values mean it was
+                     early, positive ones that it missed.
+
+    The ``update`` and ``render`` times do not include any canvas time spent
+    within them. All times are in seconds.
+    """
+    FIELDS = ('interval',
+              'input',
+              'update',
+              'render',
+              'raster',
+              'show',
+              'total',
+              'late')
+
+    def __init__(self, size: int = 1024):
+        """
+        :param size: How many frames to keep.
+        """
+        if size < 1:
+            raise ValueError("Bad size: %s" % (size,))
+
+        # The ring buffer of frames, and when each one was
+        self._data  = numpy.zeros((int(size), len(self.FIELDS)),
+                                  dtype=numpy.float64)
+        self._times = numpy.zeros(int(size), dtype=numpy.float64)
+        self._next  = 0
+        self._count = 0
+
+        # How many frames we have seen, and missed, in all
+        self._frames = 0
+        self._missed = 0
+
+        # Exporting
+        self._export_file     = None
+        self._export_interval = None
+        self._export_last     = None
+        self._export_from     = 0
+
+
+    def __len__(self) -> int:
+        return self._count
+
+
+    @property
+    def frames(self) -> int:
+        """
+        The total number of frames recorded.
+        """
+        return self._frames
+
+
+    @property
+    def missed(self) -> int:
+        """
+        The total number of frames which missed their deadline.
+        """
+        return self._missed
+
+
+    def record(self,
+               when   : float,
+               values : Tuple[float]) -> None:
+        """
+        Record a frame. This is called by the game.
+
+        :param when:   The game clock time at which the frame started.
+        :param values: The frame's values, in the order of `FIELDS`.
+        """
+        i = self._next
+        self._data [i] = values
+        self._times[i] = when
+        self._next     = (i + 1) % len(self._data)
+        self._count    = min(self._count + 1, len(self._data))
+        self._frames  += 1
+        if values[-1] > 0:
+            self._missed += 1
+
+        # Time to write out?
+        if self._export_file is not None:
+            if self._export_last is None:
+                self._export_last = when
+            elif when - self._export_last >= self._export_interval:
+                self.flush()
+                self._export_last = when
+
+
+    def values(self, field: str) -> numpy.ndarray:
+        """
+        Get the recorded values of the given field, oldest first.
+
+        :param field: One of the `FIELDS`.
+
+        :return: A new array of the values.
+        """
+        column = self.FIELDS.index(field)
+        if self._count < len(self._data):
+            return self._data[:self._count, column].copy()
+        else:
+            return numpy.roll(self._data[:, column], -self._next)
+
+
+    def percentiles(self,
+                    field       : str,
+                    percentiles : Tuple[float] = (50, 90, 99)) -> Tuple[float]:
+        """
+        Get the percentiles of the given field over the recorded frames.
+
+        :param field:       One of the `FIELDS`.
+        :param percentiles: The percentiles to get, from zero to 100.
+
+        :return: The values at those percentiles, or ``None`` if there are no
+                 frames yet.
+        """
+        if self._count == 0:
+            return None
+        values = self._data[:self._count, self.FIELDS.index(field)]
+        return tuple(numpy.percentile(values, percentiles).tolist())
+
+
+    @property
+    def jitter(self) -> float:
+        """
+        The standard deviation of the intervals between the recorded frames,
+        or ``None`` if there are too few of them.
+        """
+        if self._count < 2:
+            return None
+        # The oldest interval is from before the window, so ignore it
+        return float(numpy.std(self.values('interval')[1:]))
+
+
+    @property
+    def recent_missed(self) -> int:
+        """
+        How many of the recorded frames missed their deadline.
+        """
+        late = self._data[:self._count, self.FIELDS.index('late')]
+        return int(numpy.count_nonzero(late > 0))
+
+
+    def summary(self) -> Dict[str,object]:
+        """
+        Get a summary of the recorded frames.
+
+        :return: A dict of the frame counts, the jitter, and the 50th, 90th and
+                 99th percentiles of each field.
+        """
+        result = {
+            'frames'        : self._frames,
+            'missed'        : self._missed,
+            'recent_frames' : self._count,
+            'recent_missed' : self.recent_missed,
+            'jitter'        : self.jitter,
+        }
+        for field in self.FIELDS:
+            result[field] = self.percentiles(field)
+        return result
+
+
+    def export_to(self,
+                  path     : str,
+                  interval : float = 10.0) -> None:
+        """
+        Periodically append the recorded frames to the given JSON-lines file,
+        one line per frame. Any frames which are overwritten in the ring
+        buffer before they are written out are lost, so the interval should
+        be comfortably shorter than the buffer's length in time.
+
+        :param path:     The file to write to, or ``None`` to stop.
+        :param interval: How often to write, in seconds of game time.
+        """
+        self.close()
+        if path is not None:
+            self._export_file     = open(path, 'a')
+            self._export_interval = float(interval)
+            self._export_last     = None
+            self._export_from     = self._frames
+
+
+    def flush(self) -> None:
+        """
+        Write out any frames recorded since the last time we did so.
+        """
+        out = self._export_file
+        if out is None:
+            return
+
+        # Only what's still in the buffer is available
+        size  = len(self._data)
+        start = max(self._export_from, self._frames - self._count)
+        for frame in range(start, self._frames):
+            i = frame % size
+            record = {'frame': frame, 'time': float(self._times[i])}
+            record.update(zip(self.FIELDS, self._data[i].tolist()))
+            out.write(json.dumps(record))
+            out.write('\n')
+        out.flush()
+        self._export_from = self._frames
+
+
+    def close(self) -> None:
+        """
+        Write out anything outstanding and stop exporting.
+        """
+        if self._export_file is not None:
+            self.flush()
+            self._export_file.close()
+            self._export_file = None
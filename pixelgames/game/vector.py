@@ -0,0 +1,283 @@
+"""
+Running many headless games at once, across processes, for bots.
+"""
+
+from   typing import Tuple
+
+import multiprocessing
+import numpy
+import traceback
+
+# ----------------------------------------------------------------------
+
+class VectorGame():
+    """
+    Runs a number of instances of a headless game across a pool of processes,
+    stepping them all together. This is for training and evaluating bots.
+
+    Each step, every game is given an action, via its ``act`` method, and is
+    then run for a number of ticks. What comes back is the canvas frame of each
+    game, stacked into one array, along with the change in each game's score
+    and whether it finished. Games which finish are replaced by new ones
+    straight away, so the frame given for them is from the start of the new
+    game.
+
+    The frames, actions, rewards and done flags are all kept in memory which
+    is shared with the worker processes, so that nothing big is copied between
+    them. The arrays which are given back are views onto that memory, and so
+    are overwritten by the next step; take a copy to keep them.
+
+    Actions are integers, with their meaning being up to the game.
+    """
+    def __init__(self,
+                 factory,
+                 count     : int,
+                 processes : int  = None,
+                 ticks     : int  = 1,
+                 seed      : int  = None,
+                 dtype            = numpy.float32):
+        """
+        :param factory:   The function to create a game, given a ``seed``
+                          keyword argument. The game must be headless. This is
+                          called in the worker processes, and so must be
+                          something which can be pickled, like a class or a
+                          ``functools.partial``.
+        :param count:     How many games to run.
+        :param processes: How many worker processes to use. If this is
+                          ``None`` then one per CPU is used.
+        :param ticks:     How many ticks to run each game for per step.
+        :param seed:      The seed to derive each game's seed from, if any.
+        :param dtype:     The type of the values in the frames.
+        """
+        if count < 1:
+            raise ValueError("Bad count: %s" % (count,))
+        if ticks < 1:
+            raise ValueError("Bad ticks: %s" % (ticks,))
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        processes = max(1, min(int(processes), count))
+
+        self._count = int(count)
+        self._ticks = int(ticks)
+        self._dtype = numpy.dtype(dtype)
+
+        # See how big the frames are from an instance which we never start
+        probe       = factory(seed=seed)
+        self._shape = tuple(probe.canvas.frame.shape)
+        del probe
+
+        # The shared memory, and our views onto it
+        context = multiprocessing.get_context()
+        self._buffers = (
+            context.RawArray('b', self._count * int(numpy.prod(self._shape)) *
+                                  self._dtype.itemsize),
+            context.RawArray('b', self._count * 8),
+            context.RawArray('b', self._count * 8),
+            context.RawArray('b', self._count),
+        )
+        (self._frames,
+         self._actions,
+         self._rewards,
+         self._dones) = _views(self._buffers,
+                               self._count,
+                               self._shape,
+                               self._dtype)
+
+        # Hand out the games to the workers as evenly as we can
+        self._workers = []
+        self._pipes   = []
+        for i in range(processes):
+            start = (i       * self._count) // processes
+            end   = ((i + 1) * self._count) // processes
+            (ours, theirs) = context.Pipe()
+            worker = context.Process(
+                target=_worker,
+                name  ="VectorGame-%d" % (i,),
+                args  =(factory,
+                        start,
+                        end,
+                        self._count,
+                        self._ticks,
+                        seed,
+                        self._buffers,
+                        self._shape,
+                        self._dtype,
+                        theirs),
+                daemon=True
+            )
+            worker.start()
+            theirs.close()
+            self._workers.append(worker)
+            self._pipes  .append(ours)
+        self._closed = False
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+    def __len__(self) -> int:
+        return self._count
+
+
+    @property
+    def frame_shape(self) -> Tuple[int,int,int]:
+        """
+        The shape of each game's frame.
+        """
+        return self._shape
+
+
+    def reset(self) -> numpy.ndarray:
+        """
+        Start all the games afresh.
+
+        :return: The ``(count, width, height, 3)`` array of frames.
+        """
+        self.__command('reset')
+        return self._frames
+
+
+    def step(self,
+             actions) -> Tuple[numpy.ndarray,numpy.ndarray,numpy.ndarray]:
+        """
+        Give each game an action and run them all on.
+
+        :param actions: The action for each game, one per game.
+
+        :return: The ``(count, width, height, 3)`` array of frames, the array
+                 of rewards, and the array of whether each game finished
+                 during the step.
+        """
+        self._actions[:] = actions
+        self.__command('step')
+        return (self._frames, self._rewards, self._dones)
+
+
+    def close(self) -> None:
+        """
+        Shut down all the games and the worker processes.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for pipe in self._pipes:
+            try:
+                pipe.send('close')
+            except (BrokenPipeError, OSError):
+                pass
+        for worker in self._workers:
+            worker.join()
+        for pipe in self._pipes:
+            pipe.close()
+
+
+    def __command(self, command: str) -> None:
+        """
+        Have all the workers do something, and wait for them to be done.
+        """
+        if self._closed:
+            raise ValueError("Already closed")
+
+        # Send them all off first so that they work at the same time
+        for pipe in self._pipes:
+            pipe.send(command)
+        errors = []
+        for pipe in self._pipes:
+            error = pipe.recv()
+            if error is not None:
+                errors.append(error)
+        if errors:
+            raise RuntimeError("Worker failed:\n%s" % (errors[0],))
+
+# ----------------------------------------------------------------------
+
+def _views(buffers, count, shape, dtype):
+    """
+    Get numpy arrays onto the shared memory.
+    """
+    (frames, actions, rewards, dones) = buffers
+    return (numpy.frombuffer(frames,  dtype=dtype).reshape((count,) + shape),
+            numpy.frombuffer(actions, dtype=numpy.int64),
+            numpy.frombuffer(rewards, dtype=numpy.float64),
+            numpy.frombuffer(dones,   dtype=numpy.bool_))
+
+
+def _worker(factory,
+            start   : int,
+            end     : int,
+            count   : int,
+            ticks   : int,
+            seed    : int,
+            buffers,
+            shape,
+            dtype,
+            pipe) -> None:
+    """
+    Run the games from ``start`` up to ``end``, doing as we're told.
+    """
+    (frames, actions, rewards, dones) = _views(buffers, count, shape, dtype)
+
+    # The games, and how many of each we've had so far, which goes into the
+    # seed so that every game is different
+    games    = [None] * count
+    episodes = [0]    * count
+
+    def new_game(i):
+        if games[i] is not None:
+            games[i].quit()
+        game = factory(seed=None if seed is None else
+                            seed + i + episodes[i] * count)
+        game.render()
+        games[i]     = game
+        episodes[i] += 1
+        frames[i]    = game.canvas.frame
+
+    try:
+        while True:
+            command = pipe.recv()
+            try:
+                if command == 'close':
+                    break
+
+                elif command == 'reset':
+                    for i in range(start, end):
+                        new_game(i)
+                        rewards[i] = 0.0
+                        dones  [i] = False
+
+                elif command == 'step':
+                    for i in range(start, end):
+                        if games[i] is None:
+                            new_game(i)
+                        game   = games[i]
+                        before = game.score
+                        game.act(int(actions[i]))
+                        done   = game.step(ticks)
+                        rewards[i] = game.score - before
+                        dones  [i] = done
+                        if done:
+                            new_game(i)
+                        else:
+                            frames[i] = game.canvas.frame
+
+                else:
+                    raise ValueError("Bad command: %s" % (command,))
+
+                pipe.send(None)
+
+            except Exception:
+                pipe.send(traceback.format_exc())
+
+    finally:
+        for game in games:
+            if game is not None:
+                try:
+                    game.quit()
+                except Exception:
+                    pass
+        pipe.close()
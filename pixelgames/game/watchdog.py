@@ -0,0 +1,246 @@
+"""
+Catching slow frames in the act.
+"""
+
+from   collections      import Counter, deque, namedtuple
+from   logging.handlers import RotatingFileHandler
+from   .stats           import FrameStats
+
+import logging
+import sys
+import threading
+import time
+
+# ----------------------------------------------------------------------
+
+SlowFrame = namedtuple(
+    'SlowFrame',
+    ('time', 'timings', 'samples')
+)
+"""
+A frame which the `Watchdog` caught taking too long: when it started, a dict of
+its timings keyed by the ``FrameStats`` fields, and the stacks sampled from the
+game thread during it. Each stack is a tuple of ``(filename, line, function)``
+tuples, outermost first.
+"""
+
+# ----------------------------------------------------------------------
+
+class Watchdog():
+    """
+    Samples the game thread's Python stack while it is busy with a frame and,
+    if the frame turns out to have taken longer than a threshold, writes the
+    samples out to a rotating log along with the frame's timings. That lets us
+    see what a slow frame was doing after the fact.
+
+    Sampling is done by a helper thread, so there is some cost to having a
+    watchdog, but nothing happens if there isn't one.
+    """
+    # The most stacks we keep for any one frame
+    _MAX_SAMPLES = 1000
+
+    # How many distinct stacks we write out for a slow frame
+    _MAX_STACKS = 10
+
+    # How many slow frames we remember
+    _MAX_CAPTURES = 20
+
+    def __init__(self,
+                 threshold    : float = None,
+                 path         : str   = 'slow_frames.log',
+                 interval     : float = 0.001,
+                 max_bytes    : int   = 1024 * 1024,
+                 backup_count : int   = 5):
+        """
+        :param threshold:    How long a frame may take before it's considered
+                             slow, in seconds. If this is ``None`` then twice
+                             the game's frame interval is used.
+        :param path:         The log file to write slow frames to, or ``None``
+                             to only keep them in memory.
+        :param interval:     How often to sample the stack, in seconds.
+        :param max_bytes:    How big the log file may get before it's rolled
+                             over.
+        :param backup_count: How many rolled-over log files to keep.
+        """
+        if threshold is not None and threshold <= 0:
+            raise ValueError("Bad threshold: %s" % (threshold,))
+        if interval <= 0:
+            raise ValueError("Bad interval: %s" % (interval,))
+
+        self._threshold = threshold
+        self._interval  = float(interval)
+
+        # Where slow frames go. We use our own logger so that they don't end up
+        # in with everything else.
+        if path is None:
+            self._log = None
+        else:
+            # The file is only made once there is something to put in it
+            handler = RotatingFileHandler(path,
+                                          maxBytes   =max_bytes,
+                                          backupCount=backup_count,
+                                          delay      =True)
+            handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            self._log = logging.Logger(__name__)
+            self._log.addHandler(handler)
+
+        # The sampler thread and what it's watching
+        self._thread   = None
+        self._ident    = None
+        self._busy     = threading.Event()
+        self._closed   = False
+        self._lock     = threading.Lock()
+        self._samples  = []
+        self._captures = deque(maxlen=self._MAX_CAPTURES)
+
+
+    @property
+    def threshold(self) -> float:
+        """
+        The time after which a frame is considered slow, in seconds, or
+        ``None`` if we don't have one yet.
+        """
+        return self._threshold
+
+
+    @property
+    def captures(self) -> tuple:
+        """
+        The most recent `SlowFrame`s, oldest first.
+        """
+        return tuple(self._captures)
+
+
+    def attach(self, frame_interval: float) -> None:
+        """
+        Set up the watchdog for the given game's frame interval. This is called
+        by the game.
+
+        :param frame_interval: The game's target time between frames.
+        """
+        if self._threshold is None and 0 < frame_interval < float('inf'):
+            self._threshold = 2 * frame_interval
+
+
+    def start(self, ident: int) -> None:
+        """
+        Start watching the given thread. This is called by the game when it
+        starts running.
+
+        :param ident: The identifier of the game's thread.
+        """
+        self._ident = ident
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.__sampler,
+                                            name="Watchdog",
+                                            daemon=True)
+            self._thread.start()
+
+
+    def busy(self) -> None:
+        """
+        Say that the game thread is working on a frame, so we should sample it.
+        """
+        self._busy.set()
+
+
+    def idle(self) -> None:
+        """
+        Say that the game thread is waiting, so there's nothing to sample.
+        """
+        self._busy.clear()
+
+
+    def frame(self,
+              start  : float,
+              values : tuple) -> None:
+        """
+        Account for a frame. This is called by the game after each one.
+
+        :param start:  The game clock time at which the frame started.
+        :param values: The frame's timings, in the order of the ``FrameStats``
+                       fields.
+        """
+        # Take what we have, ready for the next frame
+        with self._lock:
+            (samples, self._samples) = (self._samples, [])
+
+        # Was it slow?
+        timings = dict(zip(FrameStats.FIELDS, values))
+        if self._threshold is None or timings['total'] <= self._threshold:
+            return
+
+        capture = SlowFrame(start, timings, tuple(samples))
+        self._captures.append(capture)
+        if self._log is not None:
+            self._log.warning(self.__format(capture))
+
+
+    def close(self) -> None:
+        """
+        Stop sampling and close the log.
+        """
+        self._closed = True
+        self._busy.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._log is not None:
+            for handler in self._log.handlers:
+                handler.close()
+            self._log = None
+
+
+    def __sampler(self) -> None:
+        """
+        Sample the game thread's stack while it's busy.
+        """
+        while True:
+            # Wait until there's something to look at
+            self._busy.wait()
+            if self._closed:
+                return
+            time.sleep(self._interval)
+            if not self._busy.is_set():
+                continue
+
+            # Walk the stack, innermost first
+            frame = sys._current_frames().get(self._ident)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, frame.f_lineno, code.co_name))
+                frame = frame.f_back
+            if not stack:
+                continue
+            stack.reverse()
+
+            with self._lock:
+                if len(self._samples) < self._MAX_SAMPLES:
+                    self._samples.append(tuple(stack))
+
+
+    def __format(self, capture: SlowFrame) -> str:
+        """
+        Turn a slow frame into something for the log.
+        """
+        timings = capture.timings
+        parts   = ('input', 'update', 'render', 'raster', 'show')
+        slowest = max(parts, key=lambda part: timings[part])
+        lines   = [
+            "Slow frame at %0.3f: took %0.4fs against %0.4fs, mostly in %s" %
+            (capture.time, timings['total'], self._threshold, slowest),
+            "  " + "  ".join("%s=%0.4fs" % (field, timings[field])
+                             for field in FrameStats.FIELDS),
+        ]
+
+        # The most common stacks, innermost call last
+        samples = capture.samples
+        lines.append("  %d stack samples" % (len(samples),))
+        for (stack, count) in Counter(samples).most_common(self._MAX_STACKS):
+            lines.append("  %d sample(s) (%0.0f%%):" %
+                         (count, 100.0 * count / len(samples)))
+            for (filename, line, function) in stack:
+                lines.append('    File "%s", line %d, in %s' %
+                             (filename, line, function))
+        return '\n'.join(lines)
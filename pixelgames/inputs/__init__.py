@@ -7,9 +7,67 @@ Classes and functions for handling inputs.
 from abc    import ABC, abstractmethod
 from typing import Tuple
 
+import time
+
 # ======================================================================
 
-class SimpleJoystick(ABC):
+class InputSource():
+    """
+    Something which input comes from. Anyone interested in when input arrives,
+    for example in order to measure how long it takes to show up on the
+    display, may add a listener to be told about it.
+    """
+    # Nobody is listening by default, so it costs nothing
+    _input_listeners = ()
+
+    # The clock which arrival times are on
+    _input_clock = time.perf_counter
+
+    def add_input_listener(self, listener) -> None:
+        """
+        Add a function to be called whenever input arrives. It is given the
+        clock time at which it arrived and this source.
+
+        :param listener: The function to call.
+        """
+        if not self._input_listeners:
+            self._input_listeners = []
+        self._input_listeners.append(listener)
+
+
+    def remove_input_listener(self, listener) -> None:
+        """
+        Remove a listener added by `add_input_listener`.
+
+        :param listener: The function to remove.
+        """
+        if listener in self._input_listeners:
+            self._input_listeners.remove(listener)
+
+
+    def set_input_clock(self, clock) -> None:
+        """
+        Set the clock which arrival times are taken from. This should be the
+        same one as the game's.
+
+        :param clock: The function which gives the time, in seconds.
+        """
+        self._input_clock = clock
+
+
+    def _input_arrived(self, when: float = None) -> None:
+        """
+        Tell any listeners that input has arrived.
+
+        :param when: When it arrived, or ``None`` for now.
+        """
+        if when is None:
+            when = self._input_clock()
+        for listener in self._input_listeners:
+            listener(when, self)
+
+
+class SimpleJoystick(InputSource, ABC):
     """
     Base class for handling basic joystick inputs.
     """
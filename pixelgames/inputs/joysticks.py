@@ -12,6 +12,11 @@ class AtariJoystick(SimpleJoystick):
     """
     A joystick which looks like the standard Atari one. Simple axes and one
     button.
+
+    The joystick can only be polled, so changes are said to have arrived when
+    they are seen by a poll. Their latencies therefore leave out the time
+    until the poll, up to a whole update interval, and are poll-to-display
+    rather than input-to-display.
     """
     def __init__(self, pygame):
         self._pygame = pygame
@@ -45,6 +50,10 @@ class AtariJoystick(SimpleJoystick):
         if self._joystick is None:
             raise ValueError("No good joysticks found")
 
+        # What we last saw, so that we can tell when it changes
+        self._last_button    = False
+        self._last_direction = (0, 0)
+
 
     def get_num_buttons(self) -> int:
         return 1
@@ -56,10 +65,18 @@ class AtariJoystick(SimpleJoystick):
             return False
 
         # We say yes for any button pressed
+        pressed = False
         for i in range(self._joystick.get_numbuttons()):
             if self._joystick.get_button(i):
-                return True
-        return False
+                pressed = True
+                break
+
+        # Say if that was a change, for anyone who cares
+        if pressed != self._last_button:
+            self._last_button = pressed
+            if self._input_listeners:
+                self._input_arrived()
+        return pressed
 
 
     def get_direction(self) -> Tuple[int,int]:
@@ -86,9 +103,18 @@ class AtariJoystick(SimpleJoystick):
                 # The Y-axis is inverted
                 y -= value
 
-        # And give back the values, capped at -1 and +1
-        return (max(-1, min(1, x)),
-                max(-1, min(1, y)))
+        # Cap the values at -1 and +1
+        direction = (max(-1, min(1, x)),
+                     max(-1, min(1, y)))
+
+        # Say if that was a change, for anyone who cares
+        if direction != self._last_direction:
+            self._last_direction = direction
+            if self._input_listeners:
+                self._input_arrived()
+
+        # And give it back
+        return direction
 
 
     def quit(self) -> None:
@@ -0,0 +1,166 @@
+"""
+Inputs from the keyboard.
+"""
+
+from   .      import InputSource
+from   abc    import ABC, abstractmethod
+from   select import select
+from   typing import Tuple
+
+import os
+import sys
+import threading
+
+# ----------------------------------------------------------------------
+
+class Keyboard(InputSource, ABC):
+    """
+    Base class for keyboards, which give back the keys pressed since they were
+    last read.
+    """
+    @abstractmethod
+    def read(self) -> Tuple[int]:
+        """
+        Get the keys which have been pressed since the last read, oldest first.
+        The values are the same as those which curses gives back.
+        """
+        return ()
+
+
+class CursesKeyboard(Keyboard):
+    """
+    Key presses read from a curses screen.
+
+    Keys are only read when the game polls for them, which may be a while
+    after they were pressed. So that the latency of a key covers that wait
+    too, once anyone is listening for input we watch the terminal from a
+    helper thread and note when it first has something to read. Keys which
+    curses had already buffered, and so never showed up on the terminal, are
+    said to have arrived when they were read.
+    """
+    def __init__(self,
+                 scr,
+                 fd  : int = None):
+        """
+        :param scr: The curses screen to read from. This should be in no-delay
+                    mode, else reads will block.
+        :param fd:  The file descriptor of the terminal, if not standard
+                    input.
+        """
+        self._scr = scr
+        self._fd  = fd
+
+        # The watcher, and when it saw input which we have not yet read. The
+        # lock keeps it from noting input which we are busy reading.
+        self._watcher  = None
+        self._wake     = None
+        self._arrival  = None
+        self._lock     = threading.Lock()
+        self._consumed = threading.Event()
+        self._closed   = False
+
+
+    def add_input_listener(self, listener) -> None:
+        super().add_input_listener(listener)
+        if self._watcher is None and not self._closed:
+            self._wake    = os.pipe()
+            self._watcher = threading.Thread(target=self.__watch,
+                                             name  ="CursesKeyboard",
+                                             daemon=True)
+            self._watcher.start()
+
+
+    def read(self) -> Tuple[int]:
+        keys = []
+        with self._lock:
+            while True:
+                key = self._scr.getch()
+                if key == -1:
+                    break
+                keys.append(key)
+                if self._input_listeners:
+                    self._input_arrived(self._arrival)
+
+            # Let the watcher look for the next lot
+            if keys:
+                self._arrival = None
+                self._consumed.set()
+        return tuple(keys)
+
+
+    def close(self) -> None:
+        """
+        Stop watching the terminal.
+        """
+        self._closed = True
+        if self._watcher is not None:
+            os.write(self._wake[1], b'x')
+            self._consumed.set()
+            self._watcher.join()
+            for fd in self._wake:
+                os.close(fd)
+            self._watcher = None
+
+
+    def __watch(self) -> None:
+        """
+        Note when the terminal has input, until we're closed.
+        """
+        fd   = sys.stdin.fileno() if self._fd is None else self._fd
+        wake = self._wake[0]
+        while not self._closed:
+            (readable, _, _) = select((fd, wake), (), ())
+            if wake in readable or self._closed:
+                break
+
+            # Note when it came in, unless it's been read already, and wait
+            # for it to be read, since it will stay readable until then
+            with self._lock:
+                if not select((fd,), (), (), 0)[0]:
+                    continue
+                if self._arrival is None:
+                    self._arrival = self._input_clock()
+            self._consumed.wait()
+            self._consumed.clear()
+
+
+class ScriptedKeyboard(Keyboard):
+    """
+    Key presses from a script, for testing. Each key is given back once the
+    clock has reached the time at which it is due, and it is said to have
+    arrived at that time.
+    """
+    def __init__(self,
+                 script : Tuple[Tuple[float,int]],
+                 clock         = None):
+        """
+        :param script: The ``(time, key)`` pairs to play back.
+        :param clock:  The clock to check the time against. If this is
+                       ``None`` then the one given to `set_input_clock` is
+                       used.
+        """
+        self._script = sorted(script, key=lambda pair: pair[0])
+        self._next   = 0
+        if clock is not None:
+            self.set_input_clock(clock)
+
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether everything in the script has been read.
+        """
+        return self._next >= len(self._script)
+
+
+    def read(self) -> Tuple[int]:
+        now    = self._input_clock()
+        script = self._script
+        keys   = []
+        while self._next < len(script) and script[self._next][0] <= now:
+            (when, key) = script[self._next]
+            self._next += 1
+            keys.append(key)
+            if self._input_listeners:
+                self._input_arrived(when)
+        return tuple(keys)
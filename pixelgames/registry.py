@@ -0,0 +1,182 @@
+"""
+Displays and inputs, looked up by name.
+
+The modules which things come from are only imported when they are first
+asked for, so that nobody pays for importing backends which they never use. We
+keep track of how long each import took, so that the startup cost of a
+backend can be seen.
+"""
+
+from   typing import Dict, Tuple
+
+import importlib
+import logging
+import time
+
+# ----------------------------------------------------------------------
+
+LOG = logging.getLogger(__name__)
+
+# ----------------------------------------------------------------------
+
+class Registry():
+    """
+    A set of classes, looked up by name, which are only imported on first use.
+    """
+    def __init__(self, kind: str):
+        """
+        :param kind: What sort of thing this is a registry of, for messages.
+        """
+        self._kind    = kind
+        self._entries = dict()
+        self._classes = dict()
+
+
+    @property
+    def names(self) -> Tuple[str]:
+        """
+        The names of everything which has been registered.
+        """
+        return tuple(sorted(self._entries))
+
+
+    def register(self,
+                 name       : str,
+                 module     : str,
+                 class_name : str) -> None:
+        """
+        Add a class to the registry. Nothing is imported until it is asked for.
+
+        :param name:       The name to look the class up by.
+        :param module:     The full name of the module which it lives in.
+        :param class_name: The name of the class in that module.
+        """
+        self._entries[name] = (module, class_name)
+        self._classes.pop(name, None)
+
+
+    def get(self, name: str) -> type:
+        """
+        Get the class with the given name, importing it if need be.
+
+        :param name: The name which it was registered with.
+
+        :return: The class.
+        """
+        cls = self._classes.get(name)
+        if cls is None:
+            if name not in self._entries:
+                raise ValueError("Bad %s name: %s" % (self._kind, name))
+            (module, class_name) = self._entries[name]
+            cls = getattr(timed_import(module), class_name)
+            self._classes[name] = cls
+        return cls
+
+
+    def create(self, name: str, *args, **kwargs):
+        """
+        Create an instance of the class with the given name.
+
+        :param name: The name which it was registered with.
+
+        All other arguments are passed to the class's constructor.
+        """
+        cls      = self.get(name)
+        start    = time.perf_counter()
+        instance = cls(*args, **kwargs)
+        record_startup_time('%s:%s' % (self._kind, name),
+                            time.perf_counter() - start)
+        return instance
+
+# ----------------------------------------------------------------------
+
+def timed_import(module: str):
+    """
+    Import the given module, recording how long it took the first time.
+
+    :param module: The full name of the module.
+
+    :return: The module.
+    """
+    if module in _TIMES:
+        return importlib.import_module(module)
+    start  = time.perf_counter()
+    result = importlib.import_module(module)
+    record_startup_time(module, time.perf_counter() - start)
+    return result
+
+
+def record_startup_time(name    : str,
+                        elapsed : float) -> None:
+    """
+    Record how long something took to start up, for the `startup_report`.
+
+    :param name:    What it was.
+    :param elapsed: How long it took, in seconds.
+    """
+    _TIMES[name] = elapsed
+    LOG.debug("Started %s in %0.3fs", name, elapsed)
+
+
+def startup_times() -> Dict[str,float]:
+    """
+    Get how long things took to start up, in seconds. Keys are either a module
+    name, for how long it took to import, a ``kind:name`` pair, for how long
+    it took to create an instance of that thing, or whatever else was given
+    to `record_startup_time`.
+
+    Importing a module which was already imported, by something else, will
+    show up as taking next to no time.
+    """
+    return dict(_TIMES)
+
+
+def startup_report() -> str:
+    """
+    Get a human-readable report of the `startup_times`, slowest first.
+    """
+    lines = ["%8.3fs  %s" % (elapsed, name)
+             for (name, elapsed) in sorted(_TIMES.items(),
+                                           key=lambda item: -item[1])]
+    lines.append("%8.3fs  total" % (sum(_TIMES.values()),))
+    return '\n'.join(lines)
+
+# ----------------------------------------------------------------------
+
+# How long things took, by name
+_TIMES = dict()
+
+DISPLAYS = Registry('display')
+DISPLAYS.register('null',         'pixelgames.canvas',              'NullDisplay' )
+DISPLAYS.register('curses',       'pixelgames.canvas.terminal',     'Curses'      )
+DISPLAYS.register('debug',        'pixelgames.canvas.terminal',     'Debug'       )
+DISPLAYS.register('rgbledmatrix', 'pixelgames.canvas.rgbledmatrix', 'RGBLEDMatrix')
+DISPLAYS.register('unicornhathd', 'pixelgames.canvas.pimoroni',     'UnicornHatHD')
+DISPLAYS.register('st7789',       'pixelgames.canvas.pils',         'ST7789TFT'   )
+
+INPUTS = Registry('input')
+INPUTS.register('atari',    'pixelgames.inputs.joysticks', 'AtariJoystick'   )
+INPUTS.register('curses',   'pixelgames.inputs.keyboard',  'CursesKeyboard'  )
+INPUTS.register('scripted', 'pixelgames.inputs.keyboard',  'ScriptedKeyboard')
+
+
+def create_display(name: str, *args, **kwargs):
+    """
+    Create the display with the given name, importing it if need be.
+
+    :param name: One of the names in ``DISPLAYS``.
+
+    All other arguments are passed to the display's constructor.
+    """
+    return DISPLAYS.create(name, *args, **kwargs)
+
+
+def create_input(name: str, *args, **kwargs):
+    """
+    Create the input with the given name, importing it if need be.
+
+    :param name: One of the names in ``INPUTS``.
+
+    All other arguments are passed to the input's constructor.
+    """
+    return INPUTS.create(name, *args, **kwargs)